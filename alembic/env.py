@@ -4,11 +4,12 @@ from sqlalchemy import pool
 from alembic import context
 
 # This import is needed to load the models for autogenerate
-from api.models import Base
-from api.database import SQLALCHEMY_DATABASE_URL
+import api.models  # noqa: F401
+from api.database import Base, SQLALCHEMY_DATABASE_URL
 
 # this is the Alembic Config object
 config = context.config
+config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -18,6 +19,14 @@ if config.config_file_name is not None:
 # Set the target metadata for autogenerate support
 target_metadata = Base.metadata
 
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Postgres-only full-text search objects are managed by hand in migrations
+    if name in ("search_vector", "ix_search_documents_search_vector"):
+        return False
+    return True
+
 # Other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -40,6 +49,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -63,7 +73,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
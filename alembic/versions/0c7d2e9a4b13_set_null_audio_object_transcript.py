@@ -0,0 +1,34 @@
+"""set null audio object transcript
+
+Revision ID: 0c7d2e9a4b13
+Revises: f3b5d8a2c614
+Create Date: 2026-10-18 18:40:27.183054
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c7d2e9a4b13'
+down_revision: Union[str, None] = 'f3b5d8a2c614'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The constraint was created unnamed; this is the name PostgreSQL gave it, and
+# the convention lets batch mode find the same constraint on SQLite
+FK_NAME = 'audio_objects_transcript_id_fkey'
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('audio_objects', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(FK_NAME, type_='foreignkey')
+        batch_op.create_foreign_key(FK_NAME, 'transcripts', ['transcript_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('audio_objects', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(FK_NAME, type_='foreignkey')
+        batch_op.create_foreign_key(FK_NAME, 'transcripts', ['transcript_id'], ['id'])
@@ -0,0 +1,68 @@
+"""add upload sessions
+
+Revision ID: 4b9d2f8a1c37
+Revises: 7e62a634ce8e
+Create Date: 2026-10-17 10:03:47.203118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b9d2f8a1c37'
+down_revision: Union[str, None] = '7e62a634ce8e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'upload_sessions',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('original_filename', sa.String(), nullable=False),
+        sa.Column('content_type', sa.String(), nullable=False),
+        sa.Column('storage_key', sa.String(), nullable=False),
+        sa.Column('total_size', sa.BigInteger(), nullable=False),
+        sa.Column('chunk_size', sa.Integer(), nullable=False),
+        sa.Column('total_parts', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('episode_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('generate_blog', sa.Boolean(), nullable=True),
+        sa.Column('generate_social', sa.Boolean(), nullable=True),
+        sa.Column('generate_newsletter', sa.Boolean(), nullable=True),
+        sa.Column('generate_show_notes', sa.Boolean(), nullable=True),
+        sa.Column('generate_quote_graphics', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['episode_id'], ['episodes.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_upload_sessions_user_id'), 'upload_sessions', ['user_id'], unique=False)
+
+    op.create_table(
+        'upload_parts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('upload_id', sa.String(), nullable=False),
+        sa.Column('part_number', sa.Integer(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('sha256', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['upload_id'], ['upload_sessions.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('upload_id', 'part_number', name='uq_upload_parts_upload_part')
+    )
+    op.create_index(op.f('ix_upload_parts_id'), 'upload_parts', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_upload_parts_id'), table_name='upload_parts')
+    op.drop_table('upload_parts')
+    op.drop_index(op.f('ix_upload_sessions_user_id'), table_name='upload_sessions')
+    op.drop_table('upload_sessions')
@@ -0,0 +1,25 @@
+"""add transcript segment position index
+
+Revision ID: 5a8e1c3f7d92
+Revises: 0c7d2e9a4b13
+Create Date: 2026-10-18 21:05:12.648310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a8e1c3f7d92'
+down_revision: Union[str, None] = '0c7d2e9a4b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_transcript_segments_transcript_position', 'transcript_segments', ['transcript_id', 'position'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transcript_segments_transcript_position', table_name='transcript_segments')
@@ -0,0 +1,165 @@
+"""initial schema
+
+Revision ID: 7e62a634ce8e
+Revises: 
+Create Date: 2026-10-17 09:12:04.511802
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e62a634ce8e'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('subscription_tier', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('brand_config', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+
+    op.create_table(
+        'episodes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('audio_url', sa.String(), nullable=False),
+        sa.Column('duration', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('file_size', sa.Integer(), nullable=True),
+        sa.Column('file_format', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('generate_blog', sa.Boolean(), nullable=True),
+        sa.Column('generate_social', sa.Boolean(), nullable=True),
+        sa.Column('generate_newsletter', sa.Boolean(), nullable=True),
+        sa.Column('generate_show_notes', sa.Boolean(), nullable=True),
+        sa.Column('generate_quote_graphics', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_episodes_id'), 'episodes', ['id'], unique=False)
+
+    op.create_table(
+        'transcripts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('episode_id', sa.Integer(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('segments_json', sa.String(), nullable=True),
+        sa.Column('speakers_json', sa.String(), nullable=True),
+        sa.Column('word_count', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['episode_id'], ['episodes.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transcripts_id'), 'transcripts', ['id'], unique=False)
+
+    op.create_table(
+        'blog_posts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('episode_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('slug', sa.String(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('excerpt', sa.Text(), nullable=True),
+        sa.Column('word_count', sa.Integer(), nullable=True),
+        sa.Column('seo_title', sa.String(), nullable=True),
+        sa.Column('seo_description', sa.String(), nullable=True),
+        sa.Column('seo_keywords', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['episode_id'], ['episodes.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_blog_posts_id'), 'blog_posts', ['id'], unique=False)
+
+    op.create_table(
+        'social_threads',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('episode_id', sa.Integer(), nullable=False),
+        sa.Column('platform', sa.String(), nullable=False),
+        sa.Column('thread_json', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('scheduled_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['episode_id'], ['episodes.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_social_threads_id'), 'social_threads', ['id'], unique=False)
+
+    op.create_table(
+        'newsletters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('episode_id', sa.Integer(), nullable=False),
+        sa.Column('subject', sa.String(), nullable=False),
+        sa.Column('html_content', sa.Text(), nullable=False),
+        sa.Column('plain_text', sa.Text(), nullable=False),
+        sa.Column('variant', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('scheduled_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['episode_id'], ['episodes.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_newsletters_id'), 'newsletters', ['id'], unique=False)
+
+    op.create_table(
+        'processing_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('episode_id', sa.Integer(), nullable=False),
+        sa.Column('job_type', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('progress', sa.Integer(), nullable=True),
+        sa.Column('error_log', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['episode_id'], ['episodes.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_processing_jobs_id'), 'processing_jobs', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_processing_jobs_id'), table_name='processing_jobs')
+    op.drop_table('processing_jobs')
+    op.drop_index(op.f('ix_newsletters_id'), table_name='newsletters')
+    op.drop_table('newsletters')
+    op.drop_index(op.f('ix_social_threads_id'), table_name='social_threads')
+    op.drop_table('social_threads')
+    op.drop_index(op.f('ix_blog_posts_id'), table_name='blog_posts')
+    op.drop_table('blog_posts')
+    op.drop_index(op.f('ix_transcripts_id'), table_name='transcripts')
+    op.drop_table('transcripts')
+    op.drop_index(op.f('ix_episodes_id'), table_name='episodes')
+    op.drop_table('episodes')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
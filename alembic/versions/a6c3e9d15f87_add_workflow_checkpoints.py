@@ -0,0 +1,43 @@
+"""add workflow checkpoints
+
+Revision ID: a6c3e9d15f87
+Revises: d4f19a6b2e70
+Create Date: 2026-10-18 09:41:27.118034
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c3e9d15f87'
+down_revision: Union[str, None] = 'd4f19a6b2e70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'workflow_checkpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('episode_id', sa.Integer(), nullable=False),
+        sa.Column('workflow', sa.String(), nullable=False),
+        sa.Column('stage', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('output_json', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['episode_id'], ['episodes.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('episode_id', 'workflow', 'stage', name='uq_workflow_checkpoints_episode_stage')
+    )
+    op.create_index(op.f('ix_workflow_checkpoints_id'), 'workflow_checkpoints', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_workflow_checkpoints_id'), table_name='workflow_checkpoints')
+    op.drop_table('workflow_checkpoints')
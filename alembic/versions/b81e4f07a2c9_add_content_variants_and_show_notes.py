@@ -0,0 +1,67 @@
+"""add content variants and show notes
+
+Revision ID: b81e4f07a2c9
+Revises: 9f3c6d2e5b41
+Create Date: 2026-10-17 16:41:55.019283
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81e4f07a2c9'
+down_revision: Union[str, None] = '9f3c6d2e5b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'show_notes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('episode_id', sa.Integer(), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('key_topics_json', sa.String(), nullable=True),
+        sa.Column('time_stamps_json', sa.String(), nullable=True),
+        sa.Column('resources_json', sa.String(), nullable=True),
+        sa.Column('variant', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['episode_id'], ['episodes.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('episode_id', 'variant', name='uq_show_notes_episode_variant')
+    )
+    op.create_index(op.f('ix_show_notes_id'), 'show_notes', ['id'], unique=False)
+
+    with op.batch_alter_table('blog_posts') as batch_op:
+        batch_op.add_column(sa.Column('variant', sa.String(), nullable=False, server_default='default'))
+        batch_op.create_unique_constraint('uq_blog_posts_episode_variant', ['episode_id', 'variant'])
+
+    with op.batch_alter_table('social_threads') as batch_op:
+        batch_op.add_column(sa.Column('variant', sa.String(), nullable=False, server_default='default'))
+        batch_op.create_unique_constraint('uq_social_threads_episode_platform_variant', ['episode_id', 'platform', 'variant'])
+
+    op.execute("UPDATE newsletters SET variant = 'default' WHERE variant IS NULL")
+    with op.batch_alter_table('newsletters') as batch_op:
+        batch_op.alter_column('variant', existing_type=sa.String(), nullable=False)
+        batch_op.create_unique_constraint('uq_newsletters_episode_variant', ['episode_id', 'variant'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('newsletters') as batch_op:
+        batch_op.drop_constraint('uq_newsletters_episode_variant', type_='unique')
+        batch_op.alter_column('variant', existing_type=sa.String(), nullable=True)
+
+    with op.batch_alter_table('social_threads') as batch_op:
+        batch_op.drop_constraint('uq_social_threads_episode_platform_variant', type_='unique')
+        batch_op.drop_column('variant')
+
+    with op.batch_alter_table('blog_posts') as batch_op:
+        batch_op.drop_constraint('uq_blog_posts_episode_variant', type_='unique')
+        batch_op.drop_column('variant')
+
+    op.drop_index(op.f('ix_show_notes_id'), table_name='show_notes')
+    op.drop_table('show_notes')
@@ -0,0 +1,47 @@
+"""add audio objects
+
+Revision ID: c5e81a0d93f2
+Revises: 4b9d2f8a1c37
+Create Date: 2026-10-17 11:26:15.842907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e81a0d93f2'
+down_revision: Union[str, None] = '4b9d2f8a1c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'audio_objects',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(), nullable=False),
+        sa.Column('storage_key', sa.String(), nullable=False),
+        sa.Column('audio_url', sa.String(), nullable=False),
+        sa.Column('file_size', sa.BigInteger(), nullable=False),
+        sa.Column('transcript_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['transcript_id'], ['transcripts.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_audio_objects_content_hash'), 'audio_objects', ['content_hash'], unique=True)
+    op.create_index(op.f('ix_audio_objects_id'), 'audio_objects', ['id'], unique=False)
+
+    op.add_column('episodes', sa.Column('content_hash', sa.String(), nullable=True))
+    op.create_index(op.f('ix_episodes_content_hash'), 'episodes', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_episodes_content_hash'), table_name='episodes')
+    op.drop_column('episodes', 'content_hash')
+    op.drop_index(op.f('ix_audio_objects_id'), table_name='audio_objects')
+    op.drop_index(op.f('ix_audio_objects_content_hash'), table_name='audio_objects')
+    op.drop_table('audio_objects')
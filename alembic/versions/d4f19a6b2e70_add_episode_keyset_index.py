@@ -0,0 +1,26 @@
+"""add episode keyset index
+
+Revision ID: d4f19a6b2e70
+Revises: b81e4f07a2c9
+Create Date: 2026-10-17 18:12:40.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f19a6b2e70'
+down_revision: Union[str, None] = 'b81e4f07a2c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_episodes_user_id_created_at_id', 'episodes', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_episodes_user_id_created_at_id', table_name='episodes')
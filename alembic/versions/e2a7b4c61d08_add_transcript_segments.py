@@ -0,0 +1,68 @@
+"""add transcript segments
+
+Revision ID: e2a7b4c61d08
+Revises: c5e81a0d93f2
+Create Date: 2026-10-17 13:48:22.107653
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7b4c61d08'
+down_revision: Union[str, None] = 'c5e81a0d93f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    segments_table = op.create_table(
+        'transcript_segments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('transcript_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('start', sa.Float(), nullable=False),
+        sa.Column('end', sa.Float(), nullable=False),
+        sa.Column('speaker', sa.String(), nullable=True),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(['transcript_id'], ['transcripts.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transcript_segments_id'), 'transcript_segments', ['id'], unique=False)
+    op.create_index('ix_transcript_segments_transcript_start', 'transcript_segments', ['transcript_id', 'start'], unique=False)
+    op.create_index('ix_transcript_segments_transcript_speaker', 'transcript_segments', ['transcript_id', 'speaker'], unique=False)
+
+    # Backfill rows from the existing segments_json blobs, one transcript at a time
+    connection = op.get_bind()
+    transcripts = sa.table('transcripts', sa.column('id', sa.Integer), sa.column('segments_json', sa.String))
+    transcript_ids = connection.execute(
+        sa.select(transcripts.c.id).where(transcripts.c.segments_json.isnot(None))
+    ).scalars().all()
+    for transcript_id in transcript_ids:
+        segments_json = connection.execute(
+            sa.select(transcripts.c.segments_json).where(transcripts.c.id == transcript_id)
+        ).scalar()
+        rows = [
+            {
+                'transcript_id': transcript_id,
+                'position': position,
+                'start': segment.get('start', 0),
+                'end': segment.get('end', segment.get('start', 0)),
+                'speaker': segment.get('speaker'),
+                'text': segment.get('text', '')
+            }
+            for position, segment in enumerate(json.loads(segments_json or '[]'))
+        ]
+        if rows:
+            op.bulk_insert(segments_table, rows)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transcript_segments_transcript_speaker', table_name='transcript_segments')
+    op.drop_index('ix_transcript_segments_transcript_start', table_name='transcript_segments')
+    op.drop_index(op.f('ix_transcript_segments_id'), table_name='transcript_segments')
+    op.drop_table('transcript_segments')
@@ -1,21 +1,98 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+from typing import Any, Dict, Optional
 from config import settings
 
+SQLALCHEMY_DATABASE_URL = settings.database_url
+
+# Async drivers for the sync URLs used elsewhere (alembic, Celery workers)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Rewrite a database URL to use the async driver of its backend
+    """
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)).render_as_string(hide_password=False)
+
+
+def get_engine_options(url: str) -> Dict[str, Any]:
+    """
+    Connection pool settings for an engine on the given URL
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite uses its own file-based pooling and rejects the sizing arguments
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
 # Create engine
-engine = create_engine(settings.database_url)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **get_engine_options(SQLALCHEMY_DATABASE_URL))
 
 # Create session local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async sessions are bound to the async engine when it is first created.
+# expire_on_commit=False keeps loaded attributes usable after commit, since
+# lazy loads are not possible outside of an awaited call.
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+_async_engine: Optional[AsyncEngine] = None
+
 # Create base class for models
 Base = declarative_base()
 
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the shared async engine, created on first use so that processes which
+    only use the sync engine do not need the async driver installed
+    """
+    global _async_engine
+    if _async_engine is None:
+        url = get_async_database_url(SQLALCHEMY_DATABASE_URL)
+        _async_engine = create_async_engine(url, **get_engine_options(url))
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+def begin_savepoint(db: Session) -> SessionTransaction:
+    """
+    db.begin_nested() that also holds on SQLite. pysqlite only opens its own
+    transaction before DML, and a SAVEPOINT issued outside of one is committed
+    by its RELEASE, taking the caller's transaction with it; open the
+    transaction first if the driver has not.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        dbapi_connection = db.connection().connection.dbapi_connection
+        if not dbapi_connection.in_transaction:
+            dbapi_connection.execute("BEGIN")
+    return db.begin_nested()
+
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Dependency to get an async database session
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
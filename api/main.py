@@ -1,15 +1,20 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.ext.asyncio import AsyncSession
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 # Import routers
-from api.routers import auth, episodes
+from api.routers import auth, episodes, uploads, search, progress
 
 # Import settings
 from config import settings
+from api.database import get_async_db
+from api.utils import shutdown_password_pool
+from api.utils.auth import oauth2_scheme, get_current_user_async
+from api.services import close_http_clients, get_episode_scheduler, get_generation_cache
 
 # Create FastAPI app
 app = FastAPI(
@@ -31,6 +36,17 @@ app.add_middleware(
 # Include routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(episodes.router, prefix="/api/v1/episodes", tags=["Episodes"])
+app.include_router(progress.router, prefix="/api/v1/episodes", tags=["Progress"])
+app.include_router(uploads.router, prefix="/api/v1/uploads", tags=["Uploads"])
+app.include_router(search.router, prefix="/api/v1/search", tags=["Search"])
+
+@app.on_event("shutdown")
+def stop_password_pool():
+    shutdown_password_pool()
+
+@app.on_event("shutdown")
+async def stop_http_clients():
+    await close_http_clients()
 
 @app.get("/")
 async def root():
@@ -40,4 +56,26 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "api"}
 
+async def require_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)):
+    """
+    Reject requests without a valid access token
+    """
+    await get_current_user_async(token=token, db=db)
+
+# Metrics are for signed-in users only; the handlers stay sync so that a
+# Redis-backed scheduler or cache does not block the event loop
+@app.get("/metrics/scheduler", dependencies=[Depends(require_user)])
+def scheduler_metrics():
+    """
+    Queue depth, running episodes and oldest wait per subscription tier
+    """
+    return get_episode_scheduler().metrics()
+
+@app.get("/metrics/generation-cache", dependencies=[Depends(require_user)])
+def generation_cache_metrics():
+    """
+    Hit rate and size of the generated content cache
+    """
+    return get_generation_cache().metrics()
+
 # Additional endpoints can be added here
\ No newline at end of file
@@ -1,17 +1,32 @@
 from .user import User
 from .episode import Episode
 from .transcript import Transcript
+from .transcript_segment import TranscriptSegment
 from .blog_post import BlogPost
 from .social_thread import SocialThread
 from .newsletter import Newsletter
+from .show_notes import ShowNotes
 from .processing_job import ProcessingJob
+from .upload_session import UploadSession, UploadPart
+from .audio_object import AudioObject
+from .search_document import SearchDocument
+from .workflow_checkpoint import WorkflowCheckpoint
+from .content_draft import ContentDraft
 
 __all__ = [
     "User",
     "Episode", 
     "Transcript",
+    "TranscriptSegment",
     "BlogPost",
     "SocialThread",
     "Newsletter",
-    "ProcessingJob"
+    "ShowNotes",
+    "ProcessingJob",
+    "UploadSession",
+    "UploadPart",
+    "AudioObject",
+    "SearchDocument",
+    "WorkflowCheckpoint",
+    "ContentDraft"
 ]
\ No newline at end of file
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from api.database import Base
+
+
+class AudioObject(Base):
+    """
+    Content-addressed index of stored audio: one row per distinct file content
+    """
+    __tablename__ = "audio_objects"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String, unique=True, index=True, nullable=False)  # SHA-256 of the file content
+    storage_key = Column(String, nullable=False)
+    audio_url = Column(String, nullable=False)
+    file_size = Column(BigInteger, nullable=False)  # Size in bytes
+    transcript_id = Column(Integer, ForeignKey("transcripts.id", ondelete="SET NULL"), nullable=True)  # First transcript of this audio
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from api.database import Base
 
 
 class BlogPost(Base):
     __tablename__ = "blog_posts"
+    __table_args__ = (
+        UniqueConstraint("episode_id", "variant", name="uq_blog_posts_episode_variant"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     episode_id = Column(Integer, ForeignKey("episodes.id"), nullable=False)
@@ -17,6 +21,9 @@ class BlogPost(Base):
     seo_description = Column(String)  # Meta description for SEO
     seo_keywords = Column(String)  # Comma-separated keywords
     status = Column(String, default="draft")  # draft, published, scheduled
+    variant = Column(String, nullable=False, default="default")  # For A/B testing
     published_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    episode = relationship("Episode", back_populates="blog_posts")
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from api.database import Base
+
+
+class ContentDraft(Base):
+    """
+    Text of a content format as the model writes it. Saved at intervals while
+    the generator streams, so editors can follow along before the finished
+    content is persisted.
+    """
+    __tablename__ = "content_drafts"
+    __table_args__ = (
+        UniqueConstraint("episode_id", "content_type", name="uq_content_drafts_episode_content_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    episode_id = Column(Integer, ForeignKey("episodes.id"), nullable=False)
+    content_type = Column(String, nullable=False)  # blog_post, social_media, newsletter, show_notes
+    status = Column(String, nullable=False)  # streaming, completed, failed
+    text = Column(Text, nullable=False, default="")
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
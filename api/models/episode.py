@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Index
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from api.database import Base
 
 
 class Episode(Base):
     __tablename__ = "episodes"
+    __table_args__ = (
+        # Serves the per-user, newest-first keyset pagination of the episode list
+        Index("ix_episodes_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -14,6 +19,7 @@ class Episode(Base):
     status = Column(String, default="uploaded")  # uploaded, processing, completed, failed
     file_size = Column(Integer)  # Size in bytes
     file_format = Column(String)  # MP3, WAV, etc.
+    content_hash = Column(String, index=True, nullable=True)  # SHA-256 of the audio, see AudioObject
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     processed_at = Column(DateTime(timezone=True), nullable=True)
@@ -23,4 +29,14 @@ class Episode(Base):
     generate_social = Column(Boolean, default=True)
     generate_newsletter = Column(Boolean, default=True)
     generate_show_notes = Column(Boolean, default=True)
-    generate_quote_graphics = Column(Boolean, default=True)
\ No newline at end of file
+    generate_quote_graphics = Column(Boolean, default=True)
+
+    # Generated artifacts and jobs. passive_deletes="all" leaves deleting them
+    # to the database, as before these relationships existed, rather than having
+    # the ORM null out their non-nullable episode_id.
+    transcripts = relationship("Transcript", back_populates="episode", order_by="Transcript.id", passive_deletes="all")
+    blog_posts = relationship("BlogPost", back_populates="episode", order_by="BlogPost.id", passive_deletes="all")
+    social_threads = relationship("SocialThread", back_populates="episode", order_by="SocialThread.id", passive_deletes="all")
+    newsletters = relationship("Newsletter", back_populates="episode", order_by="Newsletter.id", passive_deletes="all")
+    show_notes = relationship("ShowNotes", back_populates="episode", order_by="ShowNotes.id", passive_deletes="all")
+    processing_jobs = relationship("ProcessingJob", back_populates="episode", order_by="ProcessingJob.id", passive_deletes="all")
@@ -1,19 +1,25 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from api.database import Base
 
 
 class Newsletter(Base):
     __tablename__ = "newsletters"
+    __table_args__ = (
+        UniqueConstraint("episode_id", "variant", name="uq_newsletters_episode_variant"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     episode_id = Column(Integer, ForeignKey("episodes.id"), nullable=False)
     subject = Column(String, nullable=False)  # Email subject line
     html_content = Column(Text, nullable=False)  # HTML email content
     plain_text = Column(Text, nullable=False)  # Plain text version
-    variant = Column(String, default="default")  # For A/B testing
+    variant = Column(String, nullable=False, default="default")  # For A/B testing
     status = Column(String, default="draft")  # draft, sent, scheduled, failed
     scheduled_at = Column(DateTime(timezone=True), nullable=True)
     sent_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    episode = relationship("Episode", back_populates="newsletters")
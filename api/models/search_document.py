@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from api.database import Base
+
+
+class SearchDocument(Base):
+    """
+    One searchable text (a transcript or a piece of generated content).
+
+    On PostgreSQL the migration adds a generated search_vector tsvector column
+    with a GIN index; it is not mapped here so the model also works on SQLite.
+    """
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        UniqueConstraint("source_type", "source_id", name="uq_search_documents_source"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    episode_id = Column(Integer, ForeignKey("episodes.id"), nullable=False)
+    source_type = Column(String, nullable=False)  # transcript, blog_post, newsletter, social_thread, show_notes
+    source_id = Column(Integer, nullable=False)  # ID of the row in the source table
+    title = Column(String, nullable=True)
+    body = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from api.database import Base
+
+
+class ShowNotes(Base):
+    __tablename__ = "show_notes"
+    __table_args__ = (
+        UniqueConstraint("episode_id", "variant", name="uq_show_notes_episode_variant"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    episode_id = Column(Integer, ForeignKey("episodes.id"), nullable=False)
+    summary = Column(Text, nullable=False)
+    key_topics_json = Column(String, nullable=True)  # JSON list of topics
+    time_stamps_json = Column(String, nullable=True)  # JSON list of {"time", "topic"}
+    resources_json = Column(String, nullable=True)  # JSON list of resources mentioned
+    variant = Column(String, nullable=False, default="default")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    episode = relationship("Episode", back_populates="show_notes")
@@ -1,17 +1,24 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from api.database import Base
 
 
 class SocialThread(Base):
     __tablename__ = "social_threads"
+    __table_args__ = (
+        UniqueConstraint("episode_id", "platform", "variant", name="uq_social_threads_episode_platform_variant"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     episode_id = Column(Integer, ForeignKey("episodes.id"), nullable=False)
     platform = Column(String, nullable=False)  # twitter, linkedin, instagram, facebook
     thread_json = Column(String, nullable=False)  # JSON string containing the thread structure
     status = Column(String, default="draft")  # draft, published, scheduled, failed
+    variant = Column(String, nullable=False, default="default")  # For A/B testing
     scheduled_at = Column(DateTime(timezone=True), nullable=True)
     published_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    episode = relationship("Episode", back_populates="social_threads")
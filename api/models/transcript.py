@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from api.database import Base
 
@@ -9,8 +10,10 @@ class Transcript(Base):
     id = Column(Integer, primary_key=True, index=True)
     episode_id = Column(Integer, ForeignKey("episodes.id"), nullable=False)
     text = Column(Text, nullable=False)  # Full transcript text
-    segments_json = Column(String, nullable=True)  # JSON string of segments with timestamps
+    segments_json = Column(String, nullable=True)  # Legacy JSON string of segments; see TranscriptSegment
     speakers_json = Column(String, nullable=True)  # JSON string of speaker identification
     word_count = Column(Integer)  # Total word count
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    episode = relationship("Episode", back_populates="transcripts")
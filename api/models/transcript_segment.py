@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, Float, String, Text, ForeignKey, Index
+from api.database import Base
+
+
+class TranscriptSegment(Base):
+    __tablename__ = "transcript_segments"
+    __table_args__ = (
+        # One row per position; also serves reads in transcript order
+        Index("ix_transcript_segments_transcript_position", "transcript_id", "position", unique=True),
+        Index("ix_transcript_segments_transcript_start", "transcript_id", "start"),
+        Index("ix_transcript_segments_transcript_speaker", "transcript_id", "speaker"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    transcript_id = Column(Integer, ForeignKey("transcripts.id"), nullable=False)
+    position = Column(Integer, nullable=False)  # 0-based order within the transcript
+    start = Column(Float, nullable=False)  # Seconds from the start of the episode
+    end = Column(Float, nullable=False)
+    speaker = Column(String, nullable=True)
+    text = Column(Text, nullable=False)
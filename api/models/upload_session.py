@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from api.database import Base
+
+
+class UploadSession(Base):
+    __tablename__ = "upload_sessions"
+
+    id = Column(String, primary_key=True)  # Upload ID handed to the client (UUID)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    title = Column(String, nullable=False)
+    original_filename = Column(String, nullable=False)
+    content_type = Column(String, nullable=False)
+    storage_key = Column(String, nullable=False)  # Key of the assembled object
+    total_size = Column(BigInteger, nullable=False)  # Declared size in bytes
+    chunk_size = Column(Integer, nullable=False)  # Size of every part except the last
+    total_parts = Column(Integer, nullable=False)
+    status = Column(String, default="active")  # active, completing, completed, aborted
+    episode_id = Column(Integer, ForeignKey("episodes.id"), nullable=True)  # Set once completed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Processing options for the episode created on completion
+    generate_blog = Column(Boolean, default=True)
+    generate_social = Column(Boolean, default=True)
+    generate_newsletter = Column(Boolean, default=True)
+    generate_show_notes = Column(Boolean, default=True)
+    generate_quote_graphics = Column(Boolean, default=True)
+
+
+class UploadPart(Base):
+    __tablename__ = "upload_parts"
+    __table_args__ = (
+        UniqueConstraint("upload_id", "part_number", name="uq_upload_parts_upload_part"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    upload_id = Column(String, ForeignKey("upload_sessions.id"), nullable=False)
+    part_number = Column(Integer, nullable=False)  # 1-based
+    size = Column(Integer, nullable=False)  # Size in bytes
+    sha256 = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
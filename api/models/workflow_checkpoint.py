@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from api.database import Base
+
+
+class WorkflowCheckpoint(Base):
+    """
+    Outcome of one stage of a workflow run for an episode. A retry reuses the
+    output of completed stages instead of running them again.
+    """
+    __tablename__ = "workflow_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("episode_id", "workflow", "stage", name="uq_workflow_checkpoints_episode_stage"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    episode_id = Column(Integer, ForeignKey("episodes.id"), nullable=False)
+    workflow = Column(String, nullable=False)  # e.g. content
+    stage = Column(String, nullable=False)  # e.g. transcribe, generate:blog_post
+    status = Column(String, nullable=False)  # completed, failed
+    output_json = Column(Text, nullable=True)  # JSON output of a completed stage
+    error = Column(Text, nullable=True)  # Error of the last failed attempt
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
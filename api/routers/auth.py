@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
-from api.database import get_db
+from api.database import get_async_db
 from api.models import User
 from api.schemas import UserCreate, User as UserSchema, Token
-from api.utils import verify_password, get_password_hash, create_access_token, get_current_user
-from api.services import authenticate_user, get_user_by_email
+from api.utils import get_password_hash_async, create_access_token, get_current_user_async
+from api.services import authenticate_user_async, get_user_by_email_async
 
 router = APIRouter()
 
@@ -15,20 +15,20 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
 @router.post("/register", response_model=UserSchema)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user
     """
     # Check if user already exists
-    existing_user = get_user_by_email(db, email=user.email)
+    existing_user = await get_user_by_email_async(db, email=user.email)
     if existing_user:
         raise HTTPException(
-            status_code=status.HTTP_40_BAD_REQUEST,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
     # Hash the password
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     
     # Create new user
     db_user = User(
@@ -38,18 +38,18 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """
     Login a user and return access token
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -67,9 +67,9 @@ def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = D
 
 
 @router.get("/me", response_model=UserSchema)
-def read_users_me(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def read_users_me(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     """
     Get current user info
     """
-    user = get_current_user(token=token, db=db)
-    return user
\ No newline at end of file
+    user = await get_current_user_async(token=token, db=db)
+    return user
@@ -1,29 +1,83 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional
 import os
 from datetime import datetime
 
-from api.database import get_db
+from api.database import get_async_db
 from api.models import Episode, User, Transcript, ProcessingJob
-from api.schemas import Episode as EpisodeSchema, EpisodeCreate, EpisodeUpdate
-from api.utils.auth import oauth2_scheme, get_current_user
+from api.schemas import Episode as EpisodeSchema, EpisodeCreate, EpisodeUpdate, EpisodePage, EpisodeBundle
+from api.utils.auth import oauth2_scheme, get_current_user_async
 from api.services import (
-    create_episode_service,
-    get_episodes_service,
-    get_episode_service,
+    create_episode_with_processing_job_async,
+    get_episode_service_async,
+    InvalidCursorError,
+    list_episodes_page_async,
+    EPISODE_BUNDLE_SECTIONS,
+    get_episode_bundle_async,
+    delete_episode_documents_async,
+    FileTooLargeError,
+    deduplicate_upload,
+    iter_upload_file,
+    save_upload_stream,
     generate_unique_filename,
     validate_file_type,
     validate_file_size,
     get_file_size_limit_mb
 )
-from api.workers.tasks import process_episode_task
+from api.workers.tasks import schedule_episode
 
 router = APIRouter()
 
 
+def _file_format(filename: str) -> str:
+    return os.path.splitext(filename)[1][1:]  # Remove the dot from extension
+
+
+async def _store_and_create_episode(
+    db: AsyncSession,
+    user_id: int,
+    tier: str,
+    title: str,
+    filename: str,
+    chunks: AsyncIterator[bytes],
+    options: dict
+):
+    """
+    Stream an upload into storage, then create the episode and kick off processing
+    """
+    unique_filename = generate_unique_filename(filename)
+    try:
+        stored = await save_upload_stream(chunks, unique_filename)
+    except FileTooLargeError:
+        max_size_mb = get_file_size_limit_mb()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File size exceeds {max_size_mb}MB limit."
+        )
+    
+    stored = await deduplicate_upload(db, stored)
+    
+    episode_data = EpisodeCreate(
+        user_id=user_id,
+        title=title,
+        audio_url=stored.url,
+        file_size=stored.size,
+        file_format=_file_format(filename),
+        content_hash=stored.sha256,
+        duration=None,  # To be calculated later
+        **options
+    )
+    db_episode = await create_episode_with_processing_job_async(db, episode_data, user_id)
+    
+    # Queue for background processing behind the user's fair share
+    schedule_episode(db_episode.id, user_id, tier)
+    
+    return db_episode
+
+
 @router.post("/", response_model=EpisodeSchema)
-def create_episode(
+async def create_episode(
     title: str,
     generate_blog: bool = True,
     generate_social: bool = True,
@@ -31,14 +85,14 @@ def create_episode(
     generate_show_notes: bool = True,
     generate_quote_graphics: bool = True,
     audio_file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme)
 ):
     """
     Upload a new podcast episode and create processing job
     """
     # Get current user from token
-    current_user = get_current_user(token=token, db=db)
+    current_user = await get_current_user_async(token=token, db=db)
     user_id = current_user.id
     
     # Validate file type
@@ -48,93 +102,116 @@ def create_episode(
             detail="Invalid file type. Only MP3, WAV, M4A, and FLAC files are allowed."
         )
     
-    # Validate file size
-    # Note: This is a basic check. For production, implement proper file size validation
-    audio_file.file.seek(0, 2)  # Seek to end of file
-    file_size = audio_file.file.tell()
-    audio_file.file.seek(0)  # Reset file pointer to beginning
-    
-    if not validate_file_size(file_size):
+    # Reject early when the multipart part already reports an oversized file;
+    # the limit is enforced again while streaming to storage
+    if audio_file.size is not None and not validate_file_size(audio_file.size):
         max_size_mb = get_file_size_limit_mb()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File size exceeds {max_size_mb}MB limit."
         )
     
-    # Generate unique filename
-    unique_filename = generate_unique_filename(audio_file.filename)
-    file_path = f"uploads/{unique_filename}"
-    
-    # TODO: Implement actual file upload to S3 or local storage
-    # For now, we'll just store the path as a placeholder
-    # with open(file_path, "wb") as buffer:
-    #     shutil.copyfileobj(audio_file.file, buffer)
-    
-    # Create episode data
-    episode_data = EpisodeCreate(
-        title=title,
-        audio_url=file_path, # This should be the actual URL to the file
-        file_size=file_size,
-        file_format=os.path.splitext(audio_file.filename)[1][1:],  # Remove the dot from extension
-        duration=None,  # To be calculated later
+    options = dict(
         generate_blog=generate_blog,
         generate_social=generate_social,
         generate_newsletter=generate_newsletter,
         generate_show_notes=generate_show_notes,
         generate_quote_graphics=generate_quote_graphics
     )
-    
-    # Create episode using service
-    db_episode = create_episode_service(db, episode_data, user_id)
-    
-    # Create initial processing job
-    processing_job = ProcessingJob(
-        episode_id=db_episode.id,
-        job_type="all",  # Process all content types
-        status="pending"
+    return await _store_and_create_episode(
+        db, user_id, current_user.subscription_tier, title, audio_file.filename, iter_upload_file(audio_file), options
     )
+
+
+@router.post("/upload", response_model=EpisodeSchema)
+async def create_episode_streaming(
+    request: Request,
+    title: str,
+    filename: str,
+    generate_blog: bool = True,
+    generate_social: bool = True,
+    generate_newsletter: bool = True,
+    generate_show_notes: bool = True,
+    generate_quote_graphics: bool = True,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    Upload a new podcast episode sent as the raw request body.
     
-    db.add(processing_job)
-    db.commit()
+    Unlike the multipart endpoint, the body is never spooled to a temporary file:
+    it is read from the socket in chunks and written straight to storage.
+    """
+    current_user = await get_current_user_async(token=token, db=db)
+    user_id = current_user.id
     
-    # Trigger background processing
-    process_episode_task.delay(db_episode.id)
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if not validate_file_type(content_type):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file type. Only MP3, WAV, M4A, and FLAC files are allowed."
+        )
     
-    return db_episode
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and not validate_file_size(int(content_length)):
+        max_size_mb = get_file_size_limit_mb()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File size exceeds {max_size_mb}MB limit."
+        )
+    
+    options = dict(
+        generate_blog=generate_blog,
+        generate_social=generate_social,
+        generate_newsletter=generate_newsletter,
+        generate_show_notes=generate_show_notes,
+        generate_quote_graphics=generate_quote_graphics
+    )
+    return await _store_and_create_episode(
+        db, user_id, current_user.subscription_tier, title, filename, request.stream(), options
+    )
 
 
-@router.get("/", response_model=List[EpisodeSchema])
-def get_episodes(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+@router.get("/", response_model=EpisodePage)
+async def get_episodes(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme)
 ):
     """
-    Get list of episodes for the authenticated user
+    Get a page of episodes for the authenticated user, newest first.
+    
+    Follow next_cursor to get the next page.
     """
     # Get current user from token
-    current_user = get_current_user(token=token, db=db)
+    current_user = await get_current_user_async(token=token, db=db)
     user_id = current_user.id
     
-    episodes = get_episodes_service(db, user_id, skip, limit)
-    return episodes
+    try:
+        return await list_episodes_page_async(db, user_id, limit=limit, cursor=cursor, status=status_filter)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/{episode_id}", response_model=EpisodeSchema)
-def get_episode(
+async def get_episode(
     episode_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme)
 ):
     """
     Get a specific episode by ID
     """
     # Get current user from token
-    current_user = get_current_user(token=token, db=db)
+    current_user = await get_current_user_async(token=token, db=db)
     user_id = current_user.id
     
-    episode = get_episode_service(db, episode_id, user_id)
+    episode = await get_episode_service_async(db, episode_id, user_id)
     
     if not episode:
         raise HTTPException(
@@ -145,21 +222,55 @@ def get_episode(
     return episode
 
 
+@router.get("/{episode_id}/bundle", response_model=EpisodeBundle)
+async def get_episode_bundle(
+    episode_id: int,
+    include: Optional[str] = Query(None, description="Comma-separated sections to load; all when omitted"),
+    transcript_text: bool = True,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    Get an episode together with its transcript, generated content and jobs
+    """
+    current_user = await get_current_user_async(token=token, db=db)
+    
+    sections = None
+    if include:
+        sections = [section.strip() for section in include.split(",") if section.strip()]
+        unknown = [section for section in sections if section not in EPISODE_BUNDLE_SECTIONS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown sections: {', '.join(unknown)}. Valid sections: {', '.join(EPISODE_BUNDLE_SECTIONS)}"
+            )
+    
+    bundle = await get_episode_bundle_async(db, episode_id, current_user.id, sections, transcript_text)
+    
+    if not bundle:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Episode not found"
+        )
+    
+    return bundle
+
+
 @router.put("/{episode_id}", response_model=EpisodeSchema)
-def update_episode(
+async def update_episode(
     episode_id: int,
     episode_update: EpisodeUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme)
 ):
     """
     Update a specific episode
     """
     # Get current user from token
-    current_user = get_current_user(token=token, db=db)
+    current_user = await get_current_user_async(token=token, db=db)
     user_id = current_user.id
     
-    episode = get_episode_service(db, episode_id, user_id)
+    episode = await get_episode_service_async(db, episode_id, user_id)
     
     if not episode:
         raise HTTPException(
@@ -171,26 +282,26 @@ def update_episode(
     for field, value in episode_update.dict(exclude_unset=True).items():
         setattr(episode, field, value)
     
-    db.commit()
-    db.refresh(episode)
+    await db.commit()
+    await db.refresh(episode)
     
     return episode
 
 
 @router.delete("/{episode_id}")
-def delete_episode(
+async def delete_episode(
     episode_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme)
 ):
     """
     Delete a specific episode
     """
     # Get current user from token
-    current_user = get_current_user(token=token, db=db)
+    current_user = await get_current_user_async(token=token, db=db)
     user_id = current_user.id
     
-    episode = get_episode_service(db, episode_id, user_id)
+    episode = await get_episode_service_async(db, episode_id, user_id)
     
     if not episode:
         raise HTTPException(
@@ -198,7 +309,8 @@ def delete_episode(
             detail="Episode not found"
         )
     
-    db.delete(episode)
-    db.commit()
+    await delete_episode_documents_async(db, episode.id)
+    await db.delete(episode)
+    await db.commit()
     
     return {"message": "Episode deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,201 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+from starlette.background import BackgroundTask
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from api.database import get_async_db
+from api.utils.auth import get_current_user_async
+from api.services import (
+    DRAFT_FIELDS,
+    TERMINAL_STATUSES,
+    ProgressHub,
+    build_draft_event,
+    build_progress_event,
+    get_content_draft_async,
+    get_draft_hub,
+    get_episode_service_async,
+    get_latest_processing_job_async,
+    get_progress_hub
+)
+from config import settings
+
+router = APIRouter()
+
+# Browsers' EventSource cannot send headers, so the stream also accepts ?token=
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
+
+
+async def _authorize_viewer(db: AsyncSession, token: Optional[str], episode_id: int) -> None:
+    current_user = await get_current_user_async(token=token, db=db)
+    episode = await get_episode_service_async(db, episode_id, current_user.id)
+    if not episode:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Episode not found"
+        )
+
+
+async def _open_progress_stream(db: AsyncSession, token: Optional[str], episode_id: int):
+    """
+    Authorize the viewer and subscribe to the episode's progress.
+
+    The subscription starts before the current state is read, so no update
+    between the two is missed. Returns the hub queue and the snapshot event.
+    """
+    await _authorize_viewer(db, token, episode_id)
+    hub = get_progress_hub()
+    queue = await hub.subscribe(episode_id)
+    try:
+        job = await get_latest_processing_job_async(db, episode_id)
+        # The stream may stay open for minutes; give the connection back to the pool now
+        await db.close()
+    except BaseException:
+        hub.unsubscribe(episode_id, queue)
+        raise
+    return queue, build_progress_event(job) if job else None
+
+
+async def _progress_events(
+    episode_id: int,
+    queue: asyncio.Queue,
+    snapshot: Optional[Dict[str, Any]],
+    hub: Optional[ProgressHub] = None,
+    accept: Optional[Callable[[Dict[str, Any]], bool]] = None
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Yield the snapshot and then live events (those accepted, if a filter is
+    given) until the job finishes. None is yielded when nothing happened for
+    the keepalive interval.
+    """
+    hub = hub or get_progress_hub()
+    try:
+        if snapshot:
+            yield snapshot
+            if snapshot["status"] in TERMINAL_STATUSES:
+                return
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.progress_stream_keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if accept and not accept(event):
+                continue
+            yield event
+            if event["status"] in TERMINAL_STATUSES:
+                return
+    finally:
+        hub.unsubscribe(episode_id, queue)
+
+
+@router.get("/{episode_id}/progress/stream")
+async def stream_progress(
+    episode_id: int,
+    token: Optional[str] = None,
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Server-sent events with the processing progress of an episode.
+
+    Sends the current state first, then every update, and ends once the job
+    has completed or failed. The subscription is also dropped after the
+    response, in case the client went away before the stream started.
+    """
+    queue, snapshot = await _open_progress_stream(db, header_token or token, episode_id)
+
+    async def event_stream():
+        async for event in _progress_events(episode_id, queue, snapshot):
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: progress\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(get_progress_hub().unsubscribe, episode_id, queue)
+    )
+
+
+@router.get("/{episode_id}/drafts/{content_type}/stream")
+async def stream_draft(
+    episode_id: int,
+    content_type: str,
+    token: Optional[str] = None,
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Server-sent events with the draft of one content format (blog_post,
+    social_media, newsletter, show_notes) as it is generated.
+
+    Each event carries the whole text so far. Sends the saved draft first,
+    then every update, and ends once the format has completed or failed.
+    """
+    if content_type not in DRAFT_FIELDS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown content type"
+        )
+    await _authorize_viewer(db, header_token or token, episode_id)
+    hub = get_draft_hub()
+    queue = await hub.subscribe(episode_id)
+    try:
+        draft = await get_content_draft_async(db, episode_id, content_type)
+        await db.close()
+    except BaseException:
+        hub.unsubscribe(episode_id, queue)
+        raise
+    snapshot = build_draft_event(draft) if draft else None
+
+    async def event_stream():
+        events = _progress_events(
+            episode_id, queue, snapshot, hub=hub, accept=lambda event: event["content_type"] == content_type
+        )
+        async for event in events:
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: draft\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(hub.unsubscribe, episode_id, queue)
+    )
+
+
+@router.websocket("/{episode_id}/progress/ws")
+async def websocket_progress(
+    websocket: WebSocket,
+    episode_id: int,
+    token: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    WebSocket with the processing progress of an episode (pass ?token=).
+    Messages are the same JSON events as the SSE stream.
+    """
+    try:
+        queue, snapshot = await _open_progress_stream(db, token, episode_id)
+    except HTTPException:
+        await websocket.close(code=1008)  # Policy violation: not allowed to watch this episode
+        return
+
+    try:
+        await websocket.accept()
+        async for event in _progress_events(episode_id, queue, snapshot):
+            if event is not None:
+                await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        get_progress_hub().unsubscribe(episode_id, queue)
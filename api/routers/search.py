@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from api.database import get_db
+from api.schemas import SearchResults
+from api.utils.auth import oauth2_scheme, get_current_user
+from api.services import search_documents
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SearchResults)
+def search(
+    q: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    source_type: Optional[str] = None,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    Search the authenticated user's transcripts and generated content
+    """
+    current_user = get_current_user(token=token, db=db)
+    return search_documents(db, current_user.id, q, page=page, page_size=page_size, source_type=source_type)
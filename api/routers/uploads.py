@@ -0,0 +1,199 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+import os
+
+from api.database import get_async_db
+from api.schemas import Episode as EpisodeSchema, UploadSession as UploadSessionSchema, UploadSessionCreate, UploadPart as UploadPartSchema
+from api.utils.auth import oauth2_scheme, get_current_user_async
+from api.services import (
+    InvalidUploadPartError,
+    create_upload_session_async,
+    get_upload_session_async,
+    get_upload_parts_async,
+    get_missing_parts,
+    store_upload_part,
+    record_upload_part_async,
+    claim_upload_session_async,
+    release_upload_session_async,
+    assemble_upload,
+    delete_upload_parts,
+    complete_upload_session_async,
+    abort_upload_session_async,
+    deduplicate_upload,
+    get_episode_service_async,
+    validate_file_type,
+    validate_file_size,
+    get_file_size_limit_mb
+)
+from api.workers.tasks import schedule_episode
+
+router = APIRouter()
+
+
+def _to_schema(upload_session, parts) -> UploadSessionSchema:
+    return UploadSessionSchema(
+        upload_id=upload_session.id,
+        title=upload_session.title,
+        total_size=upload_session.total_size,
+        chunk_size=upload_session.chunk_size,
+        total_parts=upload_session.total_parts,
+        status=upload_session.status,
+        episode_id=upload_session.episode_id,
+        received_parts=[part.part_number for part in parts],
+        missing_parts=get_missing_parts(upload_session, parts),
+        created_at=upload_session.created_at
+    )
+
+
+async def _get_session_or_404(db: AsyncSession, upload_id: str, user_id: int):
+    upload_session = await get_upload_session_async(db, upload_id, user_id)
+    if not upload_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found"
+        )
+    return upload_session
+
+
+def _require_active(upload_session):
+    if upload_session.status != "active":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload is {upload_session.status}"
+        )
+
+
+@router.post("/", response_model=UploadSessionSchema)
+async def init_upload(
+    upload: UploadSessionCreate,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    Start a resumable upload and return its upload ID and part layout
+    """
+    current_user = await get_current_user_async(token=token, db=db)
+    
+    if not validate_file_type(upload.content_type):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file type. Only MP3, WAV, M4A, and FLAC files are allowed."
+        )
+    
+    if upload.total_size <= 0 or not validate_file_size(upload.total_size):
+        max_size_mb = get_file_size_limit_mb()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File size must be between 1 byte and {max_size_mb}MB."
+        )
+    
+    upload_session = await create_upload_session_async(db, upload, current_user.id)
+    return _to_schema(upload_session, [])
+
+
+@router.get("/{upload_id}", response_model=UploadSessionSchema)
+async def get_upload(
+    upload_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    Get the state of an upload, including which parts still need to be sent
+    """
+    current_user = await get_current_user_async(token=token, db=db)
+    upload_session = await _get_session_or_404(db, upload_id, current_user.id)
+    return _to_schema(upload_session, await get_upload_parts_async(db, upload_id))
+
+
+@router.put("/{upload_id}/parts/{part_number}", response_model=UploadPartSchema)
+async def upload_part(
+    upload_id: str,
+    part_number: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    Upload one numbered part as the raw request body.
+    
+    Parts may be sent in parallel and in any order; re-sending a part replaces it.
+    """
+    current_user = await get_current_user_async(token=token, db=db)
+    upload_session = await _get_session_or_404(db, upload_id, current_user.id)
+    _require_active(upload_session)
+    
+    try:
+        stored = await store_upload_part(upload_session, part_number, request.stream())
+    except InvalidUploadPartError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return await record_upload_part_async(db, upload_session, part_number, stored)
+
+
+@router.post("/{upload_id}/complete", response_model=EpisodeSchema)
+async def complete_upload(
+    upload_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    Assemble the uploaded parts and create the episode and its processing job
+    """
+    current_user = await get_current_user_async(token=token, db=db)
+    upload_session = await _get_session_or_404(db, upload_id, current_user.id)
+    
+    # Completing twice returns the episode created the first time
+    if upload_session.status == "completed":
+        return await get_episode_service_async(db, upload_session.episode_id, current_user.id)
+    _require_active(upload_session)
+    
+    parts = await get_upload_parts_async(db, upload_id)
+    missing_parts = get_missing_parts(upload_session, parts)
+    if missing_parts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Missing parts: {missing_parts}"
+        )
+    
+    # Only one request may assemble the upload; a concurrent complete either
+    # sees it completed or gets a conflict
+    if not await claim_upload_session_async(db, upload_session):
+        if upload_session.status == "completed":
+            return await get_episode_service_async(db, upload_session.episode_id, current_user.id)
+        _require_active(upload_session)
+    
+    try:
+        stored = await assemble_upload(upload_session)
+        stored = await deduplicate_upload(db, stored)
+        file_format = os.path.splitext(upload_session.original_filename)[1][1:]
+        db_episode = await complete_upload_session_async(db, upload_session, stored, file_format)
+    except Exception:
+        await release_upload_session_async(db, upload_session)
+        raise
+    
+    # The episode is committed, so the parts are no longer needed for a retry
+    await delete_upload_parts(upload_session)
+    
+    # Queue for background processing behind the user's fair share
+    schedule_episode(db_episode.id, current_user.id, current_user.subscription_tier)
+    
+    return db_episode
+
+
+@router.delete("/{upload_id}")
+async def abort_upload(
+    upload_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    Abort an upload and discard the parts received so far
+    """
+    current_user = await get_current_user_async(token=token, db=db)
+    upload_session = await _get_session_or_404(db, upload_id, current_user.id)
+    _require_active(upload_session)
+    
+    await delete_upload_parts(upload_session)
+    await abort_upload_session_async(db, upload_session)
+    
+    return {"message": "Upload aborted successfully"}
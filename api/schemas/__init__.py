@@ -1,11 +1,15 @@
 from .user import User, UserCreate, UserUpdate, UserInDB
 from .auth import Token, TokenData, UserLogin
-from .episode import Episode, EpisodeCreate, EpisodeUpdate
+from .episode import Episode, EpisodeCreate, EpisodeUpdate, EpisodeListItem, EpisodePage
 from .transcript import Transcript, TranscriptCreate
 from .blog_post import BlogPost, BlogPostCreate, BlogPostUpdate
 from .social_thread import SocialThread, SocialThreadCreate, SocialThreadUpdate
 from .newsletter import Newsletter, NewsletterCreate, NewsletterUpdate
+from .show_notes import ShowNotes, ShowNotesCreate
 from .processing_job import ProcessingJob, ProcessingJobCreate
+from .episode_bundle import EpisodeBundle, BundleTranscript
+from .upload import UploadSession, UploadSessionCreate, UploadPart
+from .search import SearchResult, SearchResults
 
 __all__ = [
     "User",
@@ -18,6 +22,8 @@ __all__ = [
     "Episode",
     "EpisodeCreate",
     "EpisodeUpdate",
+    "EpisodeListItem",
+    "EpisodePage",
     "Transcript",
     "TranscriptCreate",
     "BlogPost",
@@ -29,6 +35,15 @@ __all__ = [
     "Newsletter",
     "NewsletterCreate",
     "NewsletterUpdate",
+    "ShowNotes",
+    "ShowNotesCreate",
     "ProcessingJob",
-    "ProcessingJobCreate"
+    "ProcessingJobCreate",
+    "EpisodeBundle",
+    "BundleTranscript",
+    "UploadSession",
+    "UploadSessionCreate",
+    "UploadPart",
+    "SearchResult",
+    "SearchResults"
 ]
\ No newline at end of file
@@ -10,6 +10,7 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    expires_at: Optional[float] = None  # Unix timestamp from the "exp" claim
 
 
 class UserLogin(BaseModel):
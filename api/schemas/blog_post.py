@@ -13,6 +13,7 @@ class BlogPostBase(BaseModel):
     seo_description: Optional[str] = None
     seo_keywords: Optional[str] = None
     status: Optional[str] = "draft"
+    variant: Optional[str] = "default"
 
 
 class BlogPostCreate(BlogPostBase):
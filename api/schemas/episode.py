@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -9,6 +9,7 @@ class EpisodeBase(BaseModel):
     duration: Optional[int] = None
     file_size: Optional[int] = None
     file_format: Optional[str] = None
+    content_hash: Optional[str] = None
     generate_blog: Optional[bool] = True
     generate_social: Optional[bool] = True
     generate_newsletter: Optional[bool] = True
@@ -45,4 +46,25 @@ class Episode(EpisodeBase):
     processed_at: Optional[datetime] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class EpisodeListItem(BaseModel):
+    """
+    The columns the episode list view needs
+    """
+    id: int
+    title: str
+    status: str
+    duration: Optional[int] = None
+    file_format: Optional[str] = None
+    created_at: datetime
+    processed_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class EpisodePage(BaseModel):
+    items: List[EpisodeListItem]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to get the next page; None on the last page
@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+from .episode import Episode
+from .blog_post import BlogPost
+from .social_thread import SocialThread
+from .newsletter import Newsletter
+from .show_notes import ShowNotes
+from .processing_job import ProcessingJob
+
+
+class BundleTranscript(BaseModel):
+    id: int
+    episode_id: int
+    text: Optional[str] = None  # Omitted when requested with transcript_text=false
+    speakers_json: Optional[str] = None
+    word_count: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class EpisodeBundle(Episode):
+    """
+    An episode with its generated content. Sections the client did not ask for
+    are null; requested sections with no rows are empty lists.
+    """
+    transcript: Optional[BundleTranscript] = None
+    blog_posts: Optional[List[BlogPost]] = None
+    social_threads: Optional[List[SocialThread]] = None
+    newsletters: Optional[List[Newsletter]] = None
+    show_notes: Optional[List[ShowNotes]] = None
+    processing_jobs: Optional[List[ProcessingJob]] = None
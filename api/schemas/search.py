@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class SearchResult(BaseModel):
+    episode_id: int
+    episode_title: Optional[str] = None
+    source_type: str  # transcript, blog_post, newsletter, social_thread, show_notes
+    source_id: int
+    title: Optional[str] = None
+    snippet: str  # Matching excerpt with terms wrapped in <mark>
+    score: float
+
+
+class SearchResults(BaseModel):
+    query: str
+    total: int
+    page: int
+    page_size: int
+    results: List[SearchResult]
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class ShowNotesBase(BaseModel):
+    episode_id: int
+    summary: str
+    key_topics_json: Optional[str] = None
+    time_stamps_json: Optional[str] = None
+    resources_json: Optional[str] = None
+    variant: Optional[str] = "default"
+
+
+class ShowNotesCreate(ShowNotesBase):
+    class Config:
+        from_attributes = True
+
+
+class ShowNotes(ShowNotesBase):
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
@@ -8,6 +8,7 @@ class SocialThreadBase(BaseModel):
     platform: str  # twitter, linkedin, instagram, facebook
     thread_json: str  # JSON string containing the thread structure
     status: Optional[str] = "draft"
+    variant: Optional[str] = "default"
     scheduled_at: Optional[datetime] = None
 
 
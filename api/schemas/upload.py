@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+
+class UploadSessionCreate(BaseModel):
+    title: str
+    filename: str
+    content_type: str
+    total_size: int  # Size of the complete file in bytes
+    generate_blog: Optional[bool] = True
+    generate_social: Optional[bool] = True
+    generate_newsletter: Optional[bool] = True
+    generate_show_notes: Optional[bool] = True
+    generate_quote_graphics: Optional[bool] = True
+
+
+class UploadPart(BaseModel):
+    part_number: int
+    size: int
+    sha256: str
+    
+    class Config:
+        from_attributes = True
+
+
+class UploadSession(BaseModel):
+    upload_id: str
+    title: str
+    total_size: int
+    chunk_size: int
+    total_parts: int
+    status: str
+    episode_id: Optional[int] = None
+    received_parts: List[int] = []
+    missing_parts: List[int] = []
+    created_at: Optional[datetime] = None
@@ -1,36 +1,226 @@
-from .user_service import authenticate_user, get_user_by_email
-from .episode_service import create_episode_service, get_episodes_service, get_episode_service
+from .principal_cache_service import (
+    PrincipalCache,
+    MemoryPrincipalCache,
+    RedisPrincipalCache,
+    get_principal_cache,
+    get_principal_ttl,
+    invalidate_principal
+)
+from .user_service import authenticate_user, get_user_by_email, authenticate_user_async, get_user_by_email_async
+from .episode_service import (
+    create_episode_service,
+    create_episode_with_processing_job,
+    get_episodes_service,
+    get_episode_service,
+    create_episode_with_processing_job_async,
+    get_episode_service_async,
+    InvalidCursorError,
+    list_episodes_page_async,
+    EPISODE_BUNDLE_SECTIONS,
+    get_episode_bundle_async
+)
 from .storage_service import (
+    FileTooLargeError,
+    StoredObject,
+    get_storage_backend,
+    iter_upload_file,
+    save_upload_stream,
     generate_unique_filename, 
     validate_file_type, 
     validate_file_size, 
     get_file_size_limit_mb,
+    get_file_size_limit_bytes,
     get_audio_duration_limit_seconds
 )
+from .upload_service import (
+    InvalidUploadPartError,
+    create_upload_session_async,
+    get_upload_session_async,
+    get_upload_parts_async,
+    get_missing_parts,
+    store_upload_part,
+    record_upload_part_async,
+    claim_upload_session_async,
+    release_upload_session_async,
+    assemble_upload,
+    delete_upload_parts,
+    complete_upload_session_async,
+    abort_upload_session_async
+)
+from .content_index_service import (
+    find_audio_object,
+    register_audio_object,
+    deduplicate_upload,
+    find_reusable_transcript,
+    link_transcript
+)
+from .http_clients import get_http_client, close_http_clients
+from .llm_gateway import LLMGateway, LLMProviderError, LLMResponse, get_llm_gateway, get_primary_llm_model, llm_providers_configured
 from .transcription_service import transcription_service
-from .content_generation_service import content_generation_service
+from .transcript_service import (
+    TranscriptWriter,
+    bulk_insert_segments,
+    copy_transcript_segments,
+    get_segments_in_range,
+    get_segments_by_speaker,
+    iter_transcript_segments
+)
+from .generation_cache_service import (
+    GenerationCache,
+    SqliteGenerationCache,
+    RedisGenerationCache,
+    generation_cache_key,
+    get_generation_cache
+)
+from .content_generation_service import DRAFT_FIELDS, content_generation_service
+from .transcript_chunking_service import (
+    TranscriptChunk,
+    count_tokens,
+    get_segment_token_counts,
+    chunk_transcript_segments,
+    chunk_transcript
+)
+from .transcript_digest_service import build_transcript_digest
+from .search_service import index_document, search_documents, delete_source_document, delete_episode_documents_async
+from .content_persistence_service import persist_generated_content
+from .progress_events_service import (
+    TERMINAL_STATUSES,
+    ProgressBroker,
+    MemoryProgressBroker,
+    RedisProgressBroker,
+    ProgressHub,
+    build_progress_event,
+    get_progress_broker,
+    get_progress_hub,
+    publish_progress
+)
+from .content_draft_service import DraftWriter, get_draft_hub, build_draft_event, get_content_draft_async
+from .episode_scheduler_service import (
+    TIER_POLICIES,
+    EpisodeScheduler,
+    MemoryEpisodeScheduler,
+    RedisEpisodeScheduler,
+    get_episode_scheduler
+)
+from .workflow_checkpoint_service import CheckpointStore, DatabaseCheckpointStore
 from .processing_job_service import (
     create_processing_job,
     get_processing_job,
+    write_processing_job_status,
     update_processing_job_status,
-    get_episode_processing_jobs
+    ProgressReporter,
+    get_episode_processing_jobs,
+    get_latest_processing_job_async
 )
 
 __all__ = [
+    "PrincipalCache",
+    "MemoryPrincipalCache",
+    "RedisPrincipalCache",
+    "get_principal_cache",
+    "get_principal_ttl",
+    "invalidate_principal",
     "authenticate_user",
     "get_user_by_email",
+    "authenticate_user_async",
+    "get_user_by_email_async",
     "create_episode_service",
+    "create_episode_with_processing_job",
     "get_episodes_service",
     "get_episode_service",
+    "create_episode_with_processing_job_async",
+    "get_episode_service_async",
+    "InvalidCursorError",
+    "list_episodes_page_async",
+    "EPISODE_BUNDLE_SECTIONS",
+    "get_episode_bundle_async",
+    "FileTooLargeError",
+    "StoredObject",
+    "get_storage_backend",
+    "iter_upload_file",
+    "save_upload_stream",
     "generate_unique_filename",
     "validate_file_type",
     "validate_file_size",
     "get_file_size_limit_mb",
+    "get_file_size_limit_bytes",
     "get_audio_duration_limit_seconds",
+    "InvalidUploadPartError",
+    "create_upload_session_async",
+    "get_upload_session_async",
+    "get_upload_parts_async",
+    "get_missing_parts",
+    "store_upload_part",
+    "record_upload_part_async",
+    "claim_upload_session_async",
+    "release_upload_session_async",
+    "assemble_upload",
+    "delete_upload_parts",
+    "complete_upload_session_async",
+    "abort_upload_session_async",
+    "find_audio_object",
+    "register_audio_object",
+    "deduplicate_upload",
+    "find_reusable_transcript",
+    "link_transcript",
     "transcription_service",
+    "TranscriptWriter",
+    "bulk_insert_segments",
+    "copy_transcript_segments",
+    "get_segments_in_range",
+    "get_segments_by_speaker",
+    "iter_transcript_segments",
+    "GenerationCache",
+    "SqliteGenerationCache",
+    "RedisGenerationCache",
+    "generation_cache_key",
+    "get_generation_cache",
+    "DRAFT_FIELDS",
     "content_generation_service",
+    "TranscriptChunk",
+    "count_tokens",
+    "get_segment_token_counts",
+    "chunk_transcript_segments",
+    "chunk_transcript",
+    "build_transcript_digest",
+    "index_document",
+    "search_documents",
+    "delete_source_document",
+    "delete_episode_documents_async",
+    "persist_generated_content",
+    "TERMINAL_STATUSES",
+    "ProgressBroker",
+    "MemoryProgressBroker",
+    "RedisProgressBroker",
+    "ProgressHub",
+    "build_progress_event",
+    "get_progress_broker",
+    "get_progress_hub",
+    "publish_progress",
+    "get_http_client",
+    "close_http_clients",
+    "LLMGateway",
+    "LLMProviderError",
+    "LLMResponse",
+    "get_llm_gateway",
+    "get_primary_llm_model",
+    "llm_providers_configured",
+    "DraftWriter",
+    "get_draft_hub",
+    "build_draft_event",
+    "get_content_draft_async",
+    "TIER_POLICIES",
+    "EpisodeScheduler",
+    "MemoryEpisodeScheduler",
+    "RedisEpisodeScheduler",
+    "get_episode_scheduler",
+    "CheckpointStore",
+    "DatabaseCheckpointStore",
     "create_processing_job",
     "get_processing_job",
+    "write_processing_job_status",
     "update_processing_job_status",
-    "get_episode_processing_jobs"
+    "ProgressReporter",
+    "get_episode_processing_jobs",
+    "get_latest_processing_job_async"
 ]
\ No newline at end of file
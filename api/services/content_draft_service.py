@@ -0,0 +1,137 @@
+import time
+from datetime import datetime
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from api.models import ContentDraft
+from api.services.progress_events_service import ProgressBroker, ProgressHub, build_progress_broker
+from config import settings
+
+
+def build_draft_event(draft: Any) -> Dict[str, Any]:
+    """
+    Serializable draft event for a ContentDraft row or DraftWriter
+    """
+    return {
+        "episode_id": draft.episode_id,
+        "content_type": draft.content_type,
+        "status": draft.status,
+        "text": draft.text,
+        "error": draft.error,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+class DraftWriter:
+    """
+    Write-behind draft of one content format while its generator streams.
+
+    append() collects the streamed text; the draft is saved and announced to
+    viewers at most once per flush interval, and always when it starts and
+    finishes. Events carry the whole text so far, so a viewer that misses one
+    only sees the next one a little later.
+    """
+
+    def __init__(self, db: Session, episode_id: int, content_type: str, flush_interval_ms: Optional[int] = None):
+        self.db = db
+        self.episode_id = episode_id
+        self.content_type = content_type
+        if flush_interval_ms is None:
+            flush_interval_ms = settings.content_draft_flush_interval_ms
+        self.flush_interval = flush_interval_ms / 1000
+        self.parts: List[str] = []
+        self.status = "streaming"
+        self.error: Optional[str] = None
+        self.draft_id: Optional[int] = None
+        self.last_flush = float("-inf")
+        self.dirty = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def start(self) -> None:
+        """
+        Reset the format's draft, replacing the one of any earlier run
+        """
+        draft = self.db.query(ContentDraft).filter(
+            ContentDraft.episode_id == self.episode_id,
+            ContentDraft.content_type == self.content_type
+        ).first()
+        if draft is None:
+            draft = ContentDraft(episode_id=self.episode_id, content_type=self.content_type)
+            self.db.add(draft)
+        draft.status, draft.text, draft.error = "streaming", "", None
+        self.db.commit()
+        self.draft_id = draft.id
+        get_draft_broker().publish(build_draft_event(self))
+
+    def append(self, text: str) -> None:
+        """
+        Add streamed text; the save may be deferred
+        """
+        self.parts.append(text)
+        self.dirty = True
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Save and announce the draft, if anything changed since the last save
+        """
+        if not self.dirty:
+            return
+        self.db.execute(
+            update(ContentDraft)
+            .where(ContentDraft.id == self.draft_id)
+            .values(status=self.status, text=self.text, error=self.error, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        self.last_flush = time.monotonic()
+        self.dirty = False
+        get_draft_broker().publish(build_draft_event(self))
+
+    def finish(self, status: str, error: Optional[str] = None) -> None:
+        """
+        Save the final draft as completed or failed
+        """
+        self.status = status
+        self.error = error
+        self.dirty = True
+        self.flush()
+
+
+_draft_broker: Optional[ProgressBroker] = None
+_draft_hub: Optional[ProgressHub] = None
+
+
+def get_draft_broker() -> ProgressBroker:
+    """
+    Return the process-wide broker of draft events, creating it on first use
+    """
+    global _draft_broker
+    if _draft_broker is None:
+        _draft_broker = build_progress_broker(prefix="draft:episode:")
+    return _draft_broker
+
+
+def get_draft_hub() -> ProgressHub:
+    """
+    Return this process's fan-out hub over the draft broker
+    """
+    global _draft_hub
+    if _draft_hub is None or _draft_hub.broker is not get_draft_broker():
+        _draft_hub = ProgressHub(get_draft_broker())
+    return _draft_hub
+
+
+async def get_content_draft_async(db: AsyncSession, episode_id: int, content_type: str) -> Optional[ContentDraft]:
+    """
+    Get the draft of one content format of an episode on an async session
+    """
+    result = await db.execute(
+        select(ContentDraft).where(ContentDraft.episode_id == episode_id, ContentDraft.content_type == content_type)
+    )
+    return result.scalars().first()
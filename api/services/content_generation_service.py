@@ -1,41 +1,190 @@
-from typing import Dict, Any, List
+import asyncio
+import functools
+import heapq
+import re
+from typing import Dict, Any, AsyncIterator, List, Optional
 from config import settings
 from api.models import Episode
+from api.services.content_draft_service import DraftWriter
+from api.services.generation_cache_service import generation_cache_key, get_generation_cache
+from api.services.llm_gateway import get_llm_gateway, get_primary_llm_model, llm_providers_configured
 import json
 
+# Model name in the cache keys of placeholder content, generated without a provider
+PLACEHOLDER_MODEL = "placeholder"
+
+# Bump when a prompt changes meaning, so content generated from the old
+# wording is no longer served from the cache
+PROMPT_VERSION = 1
+
+GENERATION_PROMPTS = {
+    "blog_post": (
+        "Write an SEO-optimized blog post of about {length} words for the podcast episode "
+        "\"{title}\". Return JSON with title, content, excerpt, seo_title, seo_description, "
+        "seo_keywords and word_count."
+    ),
+    "social_media": (
+        "Write a Twitter thread, a LinkedIn post and an Instagram caption promoting the podcast "
+        "episode \"{title}\". Return JSON with twitter_thread, linkedin_post and instagram_caption."
+    ),
+    "newsletter": (
+        "Write a newsletter announcing the podcast episode \"{title}\". Return JSON with "
+        "subject, html_content, plain_text and call_to_action."
+    ),
+    "show_notes": (
+        "Write show notes for the podcast episode \"{title}\". Return JSON with summary, "
+        "key_topics, time_stamps and resources."
+    ),
+}
+
+CHUNK_SUMMARY_PROMPT = (
+    "Summarize this part of a podcast transcript. Return JSON with topic (at most eight words) "
+    "and summary (one or two sentences).\n\n"
+    "Context from the previous part, not to be summarized:\n{context}\n\n"
+    "Transcript:\n{transcript}"
+)
+
+# The field of each format's content that its streamed draft shows
+DRAFT_FIELDS = {
+    "blog_post": "content",
+    "social_media": "linkedin_post",
+    "newsletter": "plain_text",
+    "show_notes": "summary",
+}
+
+
+class DraftFieldReader:
+    """
+    Pulls the value of one string field out of a JSON reply while it streams
+    in, so a draft shows the field's text rather than raw JSON. feed() takes
+    the next delta and returns the text it added to the field.
+    """
+
+    def __init__(self, field: str):
+        self.pattern = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self.buffer = ""
+        self.position: Optional[int] = None
+        self.done = False
+
+    def feed(self, delta: str) -> str:
+        self.buffer += delta
+        if self.done:
+            return ""
+        if self.position is None:
+            match = self.pattern.search(self.buffer)
+            if not match:
+                return ""
+            self.position = match.end()
+        # Decode up to the last complete character; an escape sequence (or a
+        # surrogate pair) split across deltas waits for the rest of it
+        buffer, start, end = self.buffer, self.position, self.position
+        while end < len(buffer):
+            char = buffer[end]
+            if char == '"':
+                self.done = True
+                break
+            length = 1
+            if char == "\\":
+                length = 6 if buffer[end + 1:end + 2] == "u" else 2
+                if length == 6 and buffer[end + 2:end + 4].lower() in ("d8", "d9", "da", "db"):
+                    length = 12
+            if end + length > len(buffer):
+                break
+            end += length
+        self.position = end
+        return json.loads(f'"{buffer[start:end]}"', strict=False)
+
+
+def parse_model_json(text: str) -> Dict[str, Any]:
+    """
+    The JSON object in a model reply, ignoring any prose or code fence around it
+    """
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        content = json.loads(text[start:end + 1], strict=False) if 0 <= start < end else None
+    except ValueError:
+        content = None
+    if not isinstance(content, dict):
+        raise ValueError(f"Model reply is not a JSON object: {text[:200]!r}")
+    return content
+
+
+def build_generation_request(content_type: str, episode: Episode) -> Dict[str, Any]:
+    """
+    Prompt, model and parameters used to generate one content format. The
+    model is the one the LLM gateway sends the request to first.
+    """
+    return {
+        "prompt": GENERATION_PROMPTS[content_type].format(title=episode.title, length=settings.default_blog_length),
+        "model": get_primary_llm_model() or PLACEHOLDER_MODEL,
+        "params": {"temperature": settings.content_generation_temperature, "prompt_version": PROMPT_VERSION}
+    }
+
+
+def cached_generation(content_type: str):
+    """
+    Serve a generate_* method from the generation cache. Regenerations, retries
+    and duplicate episodes send the same request and get the stored content
+    back instead of paying for another model call. A cached draft arrives in
+    one piece.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, episode: Episode, digest: Dict[str, Any], draft: Optional[DraftWriter] = None) -> Dict[str, Any]:
+            request = build_generation_request(content_type, episode)
+            source = json.dumps(digest, sort_keys=True)
+            key = generation_cache_key(request["prompt"], request["model"], request["params"], source)
+            cache = get_generation_cache()
+            content = await asyncio.to_thread(cache.get, key)
+            if content is None:
+                content = await method(self, episode, digest, draft)
+                await asyncio.to_thread(cache.set, key, content)
+            elif draft is not None:
+                draft.append(content[DRAFT_FIELDS[content_type]])
+            return content
+        return wrapper
+    return decorator
+
 
 class ContentGenerationService:
     """
-    Service for generating various content formats from podcast transcripts
+    Service for generating various content formats from podcast transcripts.
+
+    Generators work from the episode digest (see build_transcript_digest), so
+    the full transcript is read by the model once, in chunks, per episode.
+    Given a DraftWriter, they stream their text into it piece by piece.
+
+    With an LLM provider configured, generators and chunk summaries call the
+    model through the LLM gateway, and generators feed the draft the deltas of
+    LLMGateway.stream. Without one they fall back to placeholder content,
+    which generators replay word by word.
     """
     
-    def __init__(self):
-        self.openai_api_key = settings.openai_api_key
-        self.anthropic_api_key = settings.anthropic_api_key
-        # Initialize AI clients based on available API keys
-    
-    async def generate_blog_post(self, episode: Episode, transcript: str) -> Dict[str, Any]:
+    @cached_generation("blog_post")
+    async def generate_blog_post(self, episode: Episode, digest: Dict[str, Any], draft: Optional[DraftWriter] = None) -> Dict[str, Any]:
         """
-        Generate a blog post from the episode transcript
+        Generate a blog post from the episode digest
         """
-        # This is a placeholder implementation
-        # In a real implementation, this would use AI to generate the content
-        return {
+        if llm_providers_configured():
+            return await self._generate_with_model(draft, "blog_post", episode, digest)
+        return await self._stream_placeholder(draft, "blog_post", {
             "title": f"Blog Post for {episode.title}",
-            "content": f"This is a generated blog post based on the episode '{episode.title}'. The transcript was: {transcript[:100]}...",
+            "content": f"This is a generated blog post based on the episode '{episode.title}'. In short: {digest['summary'][:100]}...",
             "excerpt": f"Summary of the episode '{episode.title}'",
             "seo_title": f"Blog Post for {episode.title}",
             "seo_description": f"Discover key insights from {episode.title}",
             "seo_keywords": "podcast, blog, content",
             "word_count": 1500
-        }
+        })
     
-    async def generate_social_media_content(self, episode: Episode, transcript: str) -> Dict[str, Any]:
+    @cached_generation("social_media")
+    async def generate_social_media_content(self, episode: Episode, digest: Dict[str, Any], draft: Optional[DraftWriter] = None) -> Dict[str, Any]:
         """
-        Generate social media content from the episode transcript
+        Generate social media content from the episode digest
         """
-        # This is a placeholder implementation
-        return {
+        if llm_providers_configured():
+            return await self._generate_with_model(draft, "social_media", episode, digest)
+        return await self._stream_placeholder(draft, "social_media", {
             "twitter_thread": [
                 {"text": f"Thread about {episode.title}"},
                 {"text": "Key insight 1 from the episode..."},
@@ -43,35 +192,154 @@ class ContentGenerationService:
             ],
             "linkedin_post": f"Insights from {episode.title}: Key takeaways...",
             "instagram_caption": f"New episode alert! {episode.title} - Key quote: 'Placeholder quote'"
-        }
+        })
     
-    async def generate_newsletter_content(self, episode: Episode, transcript: str) -> Dict[str, Any]:
+    @cached_generation("newsletter")
+    async def generate_newsletter_content(self, episode: Episode, digest: Dict[str, Any], draft: Optional[DraftWriter] = None) -> Dict[str, Any]:
         """
-        Generate newsletter content from the episode transcript
+        Generate newsletter content from the episode digest
         """
-        # This is a placeholder implementation
-        return {
+        if llm_providers_configured():
+            return await self._generate_with_model(draft, "newsletter", episode, digest)
+        return await self._stream_placeholder(draft, "newsletter", {
             "subject": f"New episode: {episode.title}",
             "html_content": f"<h1>{episode.title}</h1><p>Check out our latest episode...</p>",
             "plain_text": f"{episode.title}\n\nCheck out our latest episode...",
             "call_to_action": "Listen Now"
-        }
+        })
     
-    async def generate_show_notes(self, episode: Episode, transcript: str) -> Dict[str, Any]:
+    @cached_generation("show_notes")
+    async def generate_show_notes(self, episode: Episode, digest: Dict[str, Any], draft: Optional[DraftWriter] = None) -> Dict[str, Any]:
         """
-        Generate show notes from the episode transcript
+        Generate show notes from the episode digest
         """
-        # This is a placeholder implementation
-        return {
-            "summary": f"Summary of {episode.title}",
-            "key_topics": ["Topic 1", "Topic 2", "Topic 3"],
-            "time_stamps": [
-                {"time": "00:00", "topic": "Introduction"},
-                {"time": "05:30", "topic": "Main discussion"},
-                {"time": "20:15", "topic": "Key insights"}
-            ],
+        if llm_providers_configured():
+            return await self._generate_with_model(draft, "show_notes", episode, digest)
+        return await self._stream_placeholder(draft, "show_notes", {
+            "summary": digest["summary"][:500] or f"Summary of {episode.title}",
+            "key_topics": [topic["topic"] for topic in digest["topics"][:5]],
+            "time_stamps": digest["topics"],
             "resources": ["Resource 1", "Resource 2"]
+        })
+    
+    async def _generate_with_model(self, draft: Optional[DraftWriter], content_type: str, episode: Episode, digest: Dict[str, Any]) -> Dict[str, Any]:
+        # Streams the reply so the draft grows with the model's output; the
+        # draft shows the format's DRAFT_FIELDS field as it is written
+        request = build_generation_request(content_type, episode)
+        prompt = f"{request['prompt']}\n\nEpisode digest (JSON):\n{json.dumps(digest)}"
+        reader = DraftFieldReader(DRAFT_FIELDS[content_type])
+        parts = []
+        async for delta in get_llm_gateway().stream(prompt, temperature=request["params"]["temperature"]):
+            parts.append(delta)
+            text = reader.feed(delta)
+            if draft is not None and text:
+                draft.append(text)
+        return parse_model_json("".join(parts))
+    
+    async def _stream_placeholder(self, draft: Optional[DraftWriter], content_type: str, content: Dict[str, Any]) -> Dict[str, Any]:
+        # Replays finished placeholder text word by word; it is not a model
+        # stream
+        if draft is not None:
+            for piece in re.findall(r"\S+\s*", content[DRAFT_FIELDS[content_type]]):
+                draft.append(piece)
+                await asyncio.sleep(0)
+        return content
+    
+    async def summarize_transcript_chunk(self, segments: List[Dict[str, Any]], overlap_segments: int = 0) -> Dict[str, Any]:
+        """
+        Summarize one chunk of transcript segments for the episode digest. The
+        first overlap_segments belong to the previous chunk and are context only.
+        """
+        # The model writes the topic and summary; quotable lines and the words
+        # each speaker said are counted here
+        context, segments = segments[:overlap_segments], segments[overlap_segments:]
+        text = " ".join(segment["text"] for segment in segments)
+        words = text.split()
+        speakers: Dict[str, int] = {}
+        quotes = []
+        for segment in segments:
+            word_count = len(segment["text"].split())
+            if segment.get("speaker"):
+                speakers[segment["speaker"]] = speakers.get(segment["speaker"], 0) + word_count
+            if 12 <= word_count <= 40:
+                quotes.append({"text": segment["text"], "speaker": segment.get("speaker"), "time": format_timestamp(segment["start"])})
+        if llm_providers_configured():
+            response = await get_llm_gateway().complete(CHUNK_SUMMARY_PROMPT.format(
+                context=format_transcript_lines(context) or "(none)",
+                transcript=format_transcript_lines(segments)
+            ))
+            summary = parse_model_json(response.text)
+            topic, summary = str(summary.get("topic", "")), str(summary.get("summary", ""))
+        else:
+            # Placeholder: the chunk's opening words as its topic and opening
+            # sentence as its summary
+            topic = " ".join(words[:8]) + ("..." if len(words) > 8 else "")
+            summary = " ".join(text.split(". ")[0].split()[:40])
+        return {
+            "time": format_timestamp(segments[0]["start"]),
+            "topic": topic,
+            "summary": summary,
+            "quotes": quotes,
+            "speakers": speakers
         }
+    
+    async def extract_time_stamps(self, segments: AsyncIterator[Dict[str, Any]], interval_seconds: int = 300) -> List[Dict[str, str]]:
+        """
+        Build show-notes time stamps from transcript segments as they arrive
+        """
+        # This is a placeholder implementation: one marker per interval,
+        # labelled with the opening words of the segment that starts it
+        time_stamps = []
+        next_marker = 0.0
+        async for segment in segments:
+            if segment["start"] >= next_marker:
+                words = segment["text"].split()
+                topic = " ".join(words[:8]) + ("..." if len(words) > 8 else "")
+                time_stamps.append({"time": format_timestamp(segment["start"]), "topic": topic})
+                next_marker = segment["start"] + interval_seconds
+        return time_stamps
+    
+    async def extract_quotes(self, segments: AsyncIterator[Dict[str, Any]], max_quotes: int = 5) -> List[Dict[str, Any]]:
+        """
+        Pick quotable lines from transcript segments as they arrive
+        """
+        # This is a placeholder implementation: keep the longest segments that
+        # still fit on a quote graphic
+        candidates = []
+        async for segment in segments:
+            word_count = len(segment["text"].split())
+            if 12 <= word_count <= 40:
+                quote = {
+                    "text": segment["text"],
+                    "speaker": segment.get("speaker"),
+                    "time": format_timestamp(segment["start"])
+                }
+                heapq.heappush(candidates, (word_count, segment["start"], quote))
+                if len(candidates) > max_quotes:
+                    heapq.heappop(candidates)
+        return [quote for _, _, quote in sorted(candidates, key=lambda c: c[1])]
+
+
+def format_transcript_lines(segments: List[Dict[str, Any]]) -> str:
+    """
+    Transcript segments as "Speaker: text" lines for a prompt
+    """
+    return "\n".join(
+        f"{segment['speaker']}: {segment['text']}" if segment.get("speaker") else segment["text"]
+        for segment in segments
+    )
+
+
+def format_timestamp(seconds: float) -> str:
+    """
+    Format seconds as MM:SS, or H:MM:SS for times past the first hour
+    """
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
 
 
 # Create a singleton instance
@@ -0,0 +1,91 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+from api.models import AudioObject, Transcript
+from api.services.storage_service import StoredObject, StorageBackend, get_storage_backend
+
+
+def find_audio_object(db: Session, content_hash: str) -> Optional[AudioObject]:
+    """
+    Look up stored audio by the SHA-256 of its content
+    """
+    return db.query(AudioObject).filter(AudioObject.content_hash == content_hash).first()
+
+
+def register_audio_object(db: Session, stored: StoredObject) -> Tuple[AudioObject, bool]:
+    """
+    Add a freshly stored upload to the content-addressed index.
+    
+    Returns the index entry and whether the content was already known. When it
+    was, the entry points at the earlier copy and the new object is redundant.
+    """
+    existing = find_audio_object(db, stored.sha256)
+    if existing:
+        return existing, True
+    
+    audio_object = AudioObject(
+        content_hash=stored.sha256,
+        storage_key=stored.key,
+        audio_url=stored.url,
+        file_size=stored.size
+    )
+    db.add(audio_object)
+    try:
+        db.commit()
+    except IntegrityError:
+        # The same content finished uploading concurrently and won the insert
+        db.rollback()
+        return find_audio_object(db, stored.sha256), True
+    
+    db.refresh(audio_object)
+    return audio_object, False
+
+
+async def deduplicate_upload(
+    db: AsyncSession,
+    stored: StoredObject,
+    backend: Optional[StorageBackend] = None
+) -> StoredObject:
+    """
+    Resolve an upload against the index, dropping the new copy of known content.
+    
+    The returned object is the canonical stored copy for the content.
+    """
+    audio_object, is_duplicate = await db.run_sync(register_audio_object, stored)
+    if not is_duplicate or audio_object.storage_key == stored.key:
+        return stored
+    
+    backend = backend or get_storage_backend()
+    await backend.delete(stored.key)
+    print(f"Upload {stored.key} duplicates {audio_object.storage_key}; reusing stored file")
+    return StoredObject(
+        key=audio_object.storage_key,
+        url=audio_object.audio_url,
+        size=audio_object.file_size,
+        sha256=audio_object.content_hash
+    )
+
+
+def find_reusable_transcript(db: Session, content_hash: Optional[str]) -> Optional[Transcript]:
+    """
+    Get the transcript already produced for this audio content, if any
+    """
+    if not content_hash:
+        return None
+    audio_object = find_audio_object(db, content_hash)
+    if not audio_object or audio_object.transcript_id is None:
+        return None
+    return db.query(Transcript).filter(Transcript.id == audio_object.transcript_id).first()
+
+
+def link_transcript(db: Session, content_hash: Optional[str], transcript_id: int) -> None:
+    """
+    Remember the transcript of this audio content so duplicates can reuse it.
+    The change is left in the caller's transaction for it to commit.
+    """
+    if not content_hash:
+        return
+    audio_object = find_audio_object(db, content_hash)
+    if audio_object and audio_object.transcript_id is None:
+        audio_object.transcript_id = transcript_id
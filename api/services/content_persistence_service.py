@@ -0,0 +1,132 @@
+import json
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Tuple
+from slugify import slugify
+from api.database import begin_savepoint
+from api.models import Episode, BlogPost, SocialThread, Newsletter, ShowNotes
+from api.services.search_service import index_document
+
+# Generator output key -> SocialThread.platform
+SOCIAL_PLATFORMS = {
+    "twitter_thread": "twitter",
+    "linkedin_post": "linkedin",
+    "instagram_caption": "instagram",
+}
+
+
+def _blog_post_rows(episode: Episode, content: Dict[str, Any]) -> List[Tuple[Any, Dict[str, Any], str]]:
+    title = content.get("title") or episode.title
+    values = {
+        "title": title,
+        "slug": slugify(title),
+        "content": content.get("content", ""),
+        "excerpt": content.get("excerpt"),
+        "word_count": content.get("word_count"),
+        "seo_title": content.get("seo_title"),
+        "seo_description": content.get("seo_description"),
+        "seo_keywords": content.get("seo_keywords"),
+    }
+    return [(None, values, values["content"])]
+
+
+def _social_thread_rows(episode: Episode, content: Dict[str, Any]) -> List[Tuple[Any, Dict[str, Any], str]]:
+    rows = []
+    for key, platform in SOCIAL_PLATFORMS.items():
+        if key not in content:
+            continue
+        thread = content[key]
+        posts = thread if isinstance(thread, list) else [thread]
+        text = "\n".join(post["text"] if isinstance(post, dict) else str(post) for post in posts)
+        rows.append((platform, {"platform": platform, "thread_json": json.dumps(thread)}, text))
+    return rows
+
+
+def _newsletter_rows(episode: Episode, content: Dict[str, Any]) -> List[Tuple[Any, Dict[str, Any], str]]:
+    values = {
+        "subject": content.get("subject") or episode.title,
+        "html_content": content.get("html_content", ""),
+        "plain_text": content.get("plain_text", ""),
+    }
+    return [(None, values, values["plain_text"])]
+
+
+def _show_notes_rows(episode: Episode, content: Dict[str, Any]) -> List[Tuple[Any, Dict[str, Any], str]]:
+    values = {
+        "summary": content.get("summary", ""),
+        "key_topics_json": json.dumps(content.get("key_topics", [])),
+        "time_stamps_json": json.dumps(content.get("time_stamps", [])),
+        "resources_json": json.dumps(content.get("resources", [])),
+    }
+    text = "\n".join([values["summary"], *content.get("key_topics", [])])
+    return [(None, values, text)]
+
+
+# Content type -> (model, search source type, column distinguishing rows of one
+# episode and variant, row builder)
+CONTENT_TABLES = {
+    "blog_post": (BlogPost, "blog_post", None, _blog_post_rows),
+    "social_media": (SocialThread, "social_thread", "platform", _social_thread_rows),
+    "newsletter": (Newsletter, "newsletter", None, _newsletter_rows),
+    "show_notes": (ShowNotes, "show_notes", None, _show_notes_rows),
+}
+
+
+def _upsert_content(db: Session, episode: Episode, generation_results: Dict[str, Dict[str, Any]], variant: str) -> List[Tuple[str, str, Any, str]]:
+    saved = []
+    new_rows = []
+    for content_type, result in generation_results.items():
+        if result["status"] != "completed" or content_type not in CONTENT_TABLES:
+            continue
+        model, source_type, key_column, build_rows = CONTENT_TABLES[content_type]
+
+        # One query per table for whatever an earlier attempt already wrote
+        existing = {
+            getattr(row, key_column) if key_column else None: row
+            for row in db.query(model).filter(model.episode_id == episode.id, model.variant == variant)
+        }
+        for key, values, search_text in build_rows(episode, result["content"]):
+            row = existing.get(key)
+            if row is None:
+                row = model(episode_id=episode.id, variant=variant)
+                new_rows.append(row)
+            for column, value in values.items():
+                setattr(row, column, value)
+            saved.append((content_type, source_type, row, search_text))
+
+    db.add_all(new_rows)
+    db.flush()
+    return saved
+
+
+def persist_generated_content(
+    db: Session,
+    episode: Episode,
+    generation_results: Dict[str, Dict[str, Any]],
+    variant: str = "default",
+    commit: bool = True
+) -> Dict[str, List[Any]]:
+    """
+    Save the completed generator results of an episode in one transaction.
+
+    Rows are keyed by (episode, content type, variant) - and platform for social
+    threads - so a retried run updates what an earlier attempt wrote instead of
+    adding duplicates. New rows are inserted in a single flush and every row is
+    added to the search index. With commit=False the caller owns the transaction.
+    """
+    try:
+        # A savepoint, so a conflict only undoes these rows and not the caller's work
+        with begin_savepoint(db):
+            saved = _upsert_content(db, episode, generation_results, variant)
+    except IntegrityError:
+        # A concurrent attempt inserted the same rows first; update those instead
+        saved = _upsert_content(db, episode, generation_results, variant)
+
+    rows: Dict[str, List[Any]] = {}
+    for content_type, source_type, row, search_text in saved:
+        index_document(db, episode.user_id, episode.id, source_type, row.id, episode.title, search_text, commit=False)
+        rows.setdefault(content_type, []).append(row)
+
+    if commit:
+        db.commit()
+    return rows
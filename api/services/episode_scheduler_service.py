@@ -0,0 +1,222 @@
+import json
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from config import settings
+
+
+class TierPolicy(NamedTuple):
+    weight: float  # Share of dispatch slots relative to other tenants
+    max_running: int  # Episodes of one user in the pipeline at once
+    priority: int  # Tie-break between equally served tenants; lower goes first
+
+
+TIER_POLICIES = {
+    "agency": TierPolicy(weight=8, max_running=8, priority=0),
+    "professional": TierPolicy(weight=4, max_running=4, priority=1),
+    "starter": TierPolicy(weight=2, max_running=2, priority=2),
+    "free": TierPolicy(weight=1, max_running=1, priority=3),
+}
+
+
+def get_tier_policy(tier: Optional[str]) -> TierPolicy:
+    """
+    Scheduling policy of a subscription tier; unknown tiers are treated as free
+    """
+    return TIER_POLICIES.get(tier or "free", TIER_POLICIES["free"])
+
+
+def new_scheduler_state() -> Dict[str, Any]:
+    return {
+        "pending": {},  # user id -> [[episode id, enqueued at], ...] in submission order
+        "tiers": {},  # user id -> subscription tier
+        "running": {},  # episode id -> [user id, tier, dispatched at]
+        "finish": {},  # user id -> virtual finish time of its last dispatch
+        "vtime": 0.0,
+        "dispatched": {},  # tier -> episodes dispatched since the state was created
+    }
+
+
+class EpisodeScheduler:
+    """
+    Decides which queued episode enters the processing pipeline next.
+
+    Episodes wait here rather than in the Celery queue, which is FIFO. Tenants
+    (users) are served by weighted fair queuing: each dispatch advances the
+    user's virtual finish time by 1 / tier weight and the user with the
+    earliest start time goes next, so an agency gets eight slots for every one
+    of a free user but can never starve them. On top of that each user has a
+    per-tier cap on running episodes, and settings.scheduler_max_in_flight
+    bounds the whole pipeline.
+
+    submit() and complete() return the episode ids to start now. Subclasses
+    provide _update(), which applies a function to the state atomically.
+    """
+
+    def _update(self, apply: Callable[[Dict[str, Any]], Any]) -> Any:
+        raise NotImplementedError
+
+    def _read(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def submit(self, episode_id: int, user_id: int, tier: Optional[str]) -> List[int]:
+        """
+        Queue an episode and return the episodes to dispatch now
+        """
+        def apply(state: Dict[str, Any]) -> List[int]:
+            user = str(user_id)
+            state["pending"].setdefault(user, []).append([episode_id, time.time()])
+            state["tiers"][user] = tier or "free"
+            return self._dispatch(state)
+        return self._update(apply)
+
+    def complete(self, episode_id: int) -> List[int]:
+        """
+        Free the slot of a finished (or failed) episode and return the episodes
+        to dispatch now. Completing an episode twice is harmless.
+        """
+        def apply(state: Dict[str, Any]) -> List[int]:
+            state["running"].pop(str(episode_id), None)
+            return self._dispatch(state)
+        return self._update(apply)
+
+    def _dispatch(self, state: Dict[str, Any]) -> List[int]:
+        now = time.time()
+        running = state["running"]
+        # Slots of episodes whose worker died without reporting back
+        for episode, (_, _, dispatched_at) in list(running.items()):
+            if now - dispatched_at > settings.scheduler_lease_seconds:
+                print(f"Scheduler lease of episode {episode} expired; freeing its slot")
+                del running[episode]
+
+        running_per_user = Counter(user for user, _, _ in running.values())
+        dispatched = []
+        while len(running) < settings.scheduler_max_in_flight:
+            candidates = []
+            for user, queue in state["pending"].items():
+                policy = get_tier_policy(state["tiers"].get(user))
+                if running_per_user[user] < policy.max_running:
+                    start = max(state["finish"].get(user, 0.0), state["vtime"])
+                    candidates.append((start, policy.priority, queue[0][1], user))
+            if not candidates:
+                break
+
+            start, _, _, user = min(candidates)
+            tier = state["tiers"][user]
+            episode_id, _ = state["pending"][user].pop(0)
+            if not state["pending"][user]:
+                del state["pending"][user]
+            state["vtime"] = start
+            state["finish"][user] = start + 1 / get_tier_policy(tier).weight
+            running[str(episode_id)] = [user, tier, now]
+            running_per_user[user] += 1
+            state["dispatched"][tier] = state["dispatched"].get(tier, 0) + 1
+            dispatched.append(episode_id)
+
+        # Tenants with nothing queued or running start afresh at the current virtual time
+        active = set(state["pending"]) | set(running_per_user)
+        for user in list(state["finish"]):
+            if user not in active and state["finish"][user] <= state["vtime"]:
+                del state["finish"][user]
+                state["tiers"].pop(user, None)
+        return dispatched
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Queue depth, running episodes and oldest wait per tier
+        """
+        state = self._read()
+        now = time.time()
+        tiers: Dict[str, Dict[str, Any]] = {}
+
+        def tier_metrics(tier: str) -> Dict[str, Any]:
+            if tier not in tiers:
+                tiers[tier] = {"queued": 0, "running": 0, "oldest_wait_seconds": 0.0, "dispatched_total": state["dispatched"].get(tier, 0)}
+            return tiers[tier]
+
+        for tier in TIER_POLICIES:
+            tier_metrics(tier)
+        for user, queue in state["pending"].items():
+            metrics = tier_metrics(state["tiers"].get(user, "free"))
+            metrics["queued"] += len(queue)
+            metrics["oldest_wait_seconds"] = max(metrics["oldest_wait_seconds"], now - queue[0][1])
+        for _, tier, _ in state["running"].values():
+            tier_metrics(tier)["running"] += 1
+        return {
+            "in_flight": len(state["running"]),
+            "max_in_flight": settings.scheduler_max_in_flight,
+            "tiers": tiers
+        }
+
+
+class MemoryEpisodeScheduler(EpisodeScheduler):
+    """
+    Scheduler state in this process; for development and tests, where
+    episodes are created and finished in one process
+    """
+
+    def __init__(self):
+        self.state = new_scheduler_state()
+        self.lock = threading.Lock()
+
+    def _update(self, apply: Callable[[Dict[str, Any]], Any]) -> Any:
+        with self.lock:
+            return apply(self.state)
+
+    def _read(self) -> Dict[str, Any]:
+        with self.lock:
+            return json.loads(json.dumps(self.state))
+
+
+class RedisEpisodeScheduler(EpisodeScheduler):
+    """
+    Scheduler state shared by the API replicas and the workers, kept in one
+    Redis key and updated in optimistic WATCH/MULTI transactions
+    """
+
+    def __init__(self, redis_url: str, key: str = "scheduler:episodes"):
+        import redis
+
+        self.key = key
+        self.client = redis.Redis.from_url(redis_url)
+
+    def _load(self, client) -> Dict[str, Any]:
+        value = client.get(self.key)
+        return json.loads(value) if value else new_scheduler_state()
+
+    def _update(self, apply: Callable[[Dict[str, Any]], Any]) -> Any:
+        def transaction(pipe):
+            state = self._load(pipe)
+            result = apply(state)
+            pipe.multi()
+            pipe.set(self.key, json.dumps(state))
+            return result
+        return self.client.transaction(transaction, self.key, value_from_callable=True)
+
+    def _read(self) -> Dict[str, Any]:
+        return self._load(self.client)
+
+
+def build_episode_scheduler() -> EpisodeScheduler:
+    """
+    Build the scheduler selected by settings.scheduler_backend
+    """
+    if settings.scheduler_backend == "redis":
+        return RedisEpisodeScheduler(settings.redis_url)
+    if settings.scheduler_backend == "memory":
+        return MemoryEpisodeScheduler()
+    raise ValueError(f"Unknown scheduler backend: {settings.scheduler_backend}")
+
+
+_episode_scheduler: Optional[EpisodeScheduler] = None
+
+
+def get_episode_scheduler() -> EpisodeScheduler:
+    """
+    Return the process-wide episode scheduler, creating it on first use
+    """
+    global _episode_scheduler
+    if _episode_scheduler is None:
+        _episode_scheduler = build_episode_scheduler()
+    return _episode_scheduler
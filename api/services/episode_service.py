@@ -1,26 +1,36 @@
-from sqlalchemy.orm import Session
-from typing import List
-from api.models import Episode, User
+import base64
+import binascii
+from datetime import datetime
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload, selectinload
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from api.models import Episode, User, ProcessingJob, Transcript
 from api.schemas import EpisodeCreate
 
 
-def create_episode_service(db: Session, episode: EpisodeCreate, user_id: int):
-    """
-    Create a new episode
-    """
-    db_episode = Episode(
+def _build_episode(episode: EpisodeCreate, user_id: int) -> Episode:
+    return Episode(
         user_id=user_id,
         title=episode.title,
         audio_url=episode.audio_url,
         duration=episode.duration,
         file_size=episode.file_size,
         file_format=episode.file_format,
+        content_hash=episode.content_hash,
         generate_blog=episode.generate_blog,
         generate_social=episode.generate_social,
         generate_newsletter=episode.generate_newsletter,
         generate_show_notes=episode.generate_show_notes,
         generate_quote_graphics=episode.generate_quote_graphics
     )
+
+
+def create_episode_service(db: Session, episode: EpisodeCreate, user_id: int):
+    """
+    Create a new episode
+    """
+    db_episode = _build_episode(episode, user_id)
     
     db.add(db_episode)
     db.commit()
@@ -29,6 +39,29 @@ def create_episode_service(db: Session, episode: EpisodeCreate, user_id: int):
     return db_episode
 
 
+def create_episode_with_processing_job(db: Session, episode: EpisodeCreate, user_id: int, commit: bool = True):
+    """
+    Create a new episode together with its initial "all" processing job.
+    With commit=False both rows are only flushed, so the caller can commit
+    them together with its own changes.
+    """
+    db_episode = _build_episode(episode, user_id)
+    db.add(db_episode)
+    db.flush()
+    
+    processing_job = ProcessingJob(
+        episode_id=db_episode.id,
+        job_type="all",  # Process all content types
+        status="pending"
+    )
+    db.add(processing_job)
+    if commit:
+        db.commit()
+        db.refresh(db_episode)
+    
+    return db_episode
+
+
 def get_episodes_service(db: Session, user_id: int, skip: int = 0, limit: int = 100):
     """
     Get episodes for a specific user
@@ -40,4 +73,162 @@ def get_episode_service(db: Session, episode_id: int, user_id: int):
     """
     Get a specific episode by ID for a specific user
     """
-    return db.query(Episode).filter(Episode.id == episode_id, Episode.user_id == user_id).first()
\ No newline at end of file
+    return db.query(Episode).filter(Episode.id == episode_id, Episode.user_id == user_id).first()
+
+
+async def create_episode_with_processing_job_async(db: AsyncSession, episode: EpisodeCreate, user_id: int, commit: bool = True):
+    """
+    Create a new episode and its initial "all" processing job in one transaction.
+    With commit=False both rows are only flushed, as in
+    create_episode_with_processing_job.
+    """
+    db_episode = _build_episode(episode, user_id)
+    db.add(db_episode)
+    await db.flush()
+    
+    db.add(ProcessingJob(episode_id=db_episode.id, job_type="all", status="pending"))
+    if commit:
+        await db.commit()
+        await db.refresh(db_episode)
+    
+    return db_episode
+
+
+async def get_episode_service_async(db: AsyncSession, episode_id: int, user_id: int):
+    """
+    Get a specific episode by ID for a specific user on an async session
+    """
+    result = await db.execute(select(Episode).where(Episode.id == episode_id, Episode.user_id == user_id))
+    return result.scalars().first()
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded
+    """
+
+
+# Columns loaded for the list view (see EpisodeListItem)
+EPISODE_LIST_COLUMNS = (
+    Episode.id,
+    Episode.title,
+    Episode.status,
+    Episode.duration,
+    Episode.file_format,
+    Episode.created_at,
+    Episode.processed_at,
+)
+
+
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%f"
+
+
+def encode_episode_cursor(created_at: datetime, episode_id: int) -> str:
+    """
+    Opaque cursor pointing just past the given episode
+    """
+    return base64.urlsafe_b64encode(f"episode:{episode_id}:{created_at.isoformat()}".encode()).decode().rstrip("=")
+
+
+def decode_episode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, episode_id, created_at = value.split(":", 2)
+        if prefix != "episode":
+            raise ValueError(prefix)
+        return datetime.fromisoformat(created_at), int(episode_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("Invalid cursor")
+
+
+async def list_episodes_page_async(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    One page of a user's episodes, newest first, using keyset pagination on
+    (created_at, id) so every page costs the same index range scan however deep
+    it is. Only the list columns are loaded.
+    
+    The cursor carries the created_at and id of the last episode of the previous
+    page, so it keeps working after that episode is deleted.
+    """
+    # SQLite keeps timestamps as text and CURRENT_TIMESTAMP defaults have no
+    # fractional seconds, unlike bound datetimes; compare one normalized form
+    sqlite = db.get_bind().dialect.name == "sqlite"
+    created_at = func.strftime(SQLITE_TIMESTAMP_FORMAT, Episode.created_at) if sqlite else Episode.created_at
+    query = select(*EPISODE_LIST_COLUMNS).where(Episode.user_id == user_id)
+    if status:
+        query = query.where(Episode.status == status)
+    if cursor:
+        after_created_at, after_id = decode_episode_cursor(cursor)
+        if sqlite:
+            after_created_at = func.strftime(SQLITE_TIMESTAMP_FORMAT, after_created_at.isoformat(sep=" "))
+        query = query.where(tuple_(created_at, Episode.id) < tuple_(after_created_at, after_id))
+    
+    # One extra row tells whether another page follows
+    query = query.order_by(created_at.desc(), Episode.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).mappings().all()
+    
+    items = [dict(row) for row in rows[:limit]]
+    next_cursor = encode_episode_cursor(items[-1]["created_at"], items[-1]["id"]) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+# Bundle section -> relationship it is loaded from
+EPISODE_BUNDLE_SECTIONS = {
+    "transcript": Episode.transcripts,
+    "blog_posts": Episode.blog_posts,
+    "social_threads": Episode.social_threads,
+    "newsletters": Episode.newsletters,
+    "show_notes": Episode.show_notes,
+    "processing_jobs": Episode.processing_jobs,
+}
+
+TRANSCRIPT_SUMMARY_COLUMNS = ("id", "episode_id", "speakers_json", "word_count", "created_at", "updated_at")
+
+
+async def get_episode_bundle_async(
+    db: AsyncSession,
+    episode_id: int,
+    user_id: int,
+    sections: Optional[Iterable[str]] = None,
+    transcript_text: bool = True
+) -> Optional[Dict[str, Any]]:
+    """
+    Load an episode with the requested sections of its content (all by default).
+    
+    Each section is one selectin query, so the bundle costs at most one query per
+    section plus one for the episode, and any other lazy load raises instead of
+    quietly adding queries. With transcript_text=False the transcript's text
+    column is never read from the database.
+    """
+    sections = list(EPISODE_BUNDLE_SECTIONS) if sections is None else list(sections)
+    options = [raiseload("*")]
+    for section in sections:
+        loader = selectinload(EPISODE_BUNDLE_SECTIONS[section])
+        if section == "transcript" and not transcript_text:
+            loader = loader.defer(Transcript.text, raiseload=True)
+        options.append(loader)
+    
+    result = await db.execute(
+        select(Episode).where(Episode.id == episode_id, Episode.user_id == user_id).options(*options)
+    )
+    episode = result.scalars().first()
+    if episode is None:
+        return None
+    
+    bundle: Dict[str, Any] = {column.key: getattr(episode, column.key) for column in Episode.__table__.columns}
+    for section in sections:
+        if section != "transcript":
+            bundle[section] = getattr(episode, section)
+            continue
+        # The latest transcript, if the episode was processed more than once
+        transcript = episode.transcripts[-1] if episode.transcripts else None
+        if transcript is not None:
+            columns = TRANSCRIPT_SUMMARY_COLUMNS + (("text",) if transcript_text else ())
+            bundle["transcript"] = {column: getattr(transcript, column) for column in columns}
+    return bundle
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Collapse whitespace so formatting-only edits to a prompt keep their cache entries
+    """
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def generation_cache_key(prompt: str, model: str, params: Dict[str, Any], transcript: str) -> str:
+    """
+    Cache key of one generation: a hash of the normalized prompt, the model, its
+    parameters and the transcript (hashed on its own so it is read only once)
+    """
+    request = {
+        "prompt": normalize_prompt(prompt),
+        "model": model,
+        "params": params,
+        "transcript_sha256": hashlib.sha256(transcript.encode("utf-8")).hexdigest(),
+    }
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """
+    Cache of generated content keyed by generation_cache_key().
+
+    Entries expire after settings.generation_cache_ttl_seconds; beyond
+    settings.generation_cache_max_entries the least recently used are evicted.
+    Hit and miss counts are kept with the entries so every process reports
+    the same metrics.
+    """
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def metrics(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+def _metrics(hits: int, misses: int, entries: int) -> Dict[str, Any]:
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else 0.0,
+        "entries": entries
+    }
+
+
+class NullGenerationCache(GenerationCache):
+    """
+    Disabled cache: every generation runs
+    """
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        pass
+
+    def metrics(self) -> Dict[str, Any]:
+        return _metrics(0, 0, 0)
+
+
+class SqliteGenerationCache(GenerationCache):
+    """
+    On-disk cache in a local SQLite file, shared by the worker processes of
+    one host. Used on its own or as the fallback when Redis is unavailable.
+    """
+
+    def __init__(self, path: str, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.generation_cache_ttl_seconds
+        self.max_entries = max_entries if max_entries is not None else settings.generation_cache_max_entries
+        self.lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS generation_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS ix_generation_cache_accessed_at ON generation_cache (accessed_at)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS generation_cache_stats (name TEXT PRIMARY KEY, count INTEGER NOT NULL)")
+
+    def _count(self, name: str) -> None:
+        self.connection.execute(
+            "INSERT INTO generation_cache_stats (name, count) VALUES (?, 1) "
+            "ON CONFLICT (name) DO UPDATE SET count = count + 1",
+            (name,)
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value FROM generation_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row:
+                self.connection.execute("UPDATE generation_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._count("hits" if row else "misses")
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO generation_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl_seconds, now)
+            )
+            self.connection.execute("DELETE FROM generation_cache WHERE expires_at <= ?", (now,))
+            self.connection.execute(
+                "DELETE FROM generation_cache WHERE key IN ("
+                "SELECT key FROM generation_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def metrics(self) -> Dict[str, Any]:
+        with self.lock:
+            counts = dict(self.connection.execute("SELECT name, count FROM generation_cache_stats").fetchall())
+            entries = self.connection.execute("SELECT COUNT(*) FROM generation_cache").fetchone()[0]
+        return _metrics(counts.get("hits", 0), counts.get("misses", 0), entries)
+
+
+class RedisGenerationCache(GenerationCache):
+    """
+    Cache shared by every worker. Entries expire through Redis TTLs and a
+    sorted set of last access times drives LRU eviction; a second sorted set
+    of expiry times lets writes prune members whose value Redis has already
+    expired. Redis errors fall through to the fallback cache so an outage
+    costs latency, not correctness.
+    """
+
+    def __init__(self, redis_url: str, fallback: GenerationCache, prefix: str = "gencache:",
+                 ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None):
+        import redis
+
+        self.client = redis.Redis.from_url(redis_url)
+        self.fallback = fallback
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.generation_cache_ttl_seconds
+        self.max_entries = max_entries if max_entries is not None else settings.generation_cache_max_entries
+        self.lru_key = f"{prefix}lru"
+        self.expiry_key = f"{prefix}expiry"
+        self.stats_key = f"{prefix}stats"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = self.client.get(f"{self.prefix}{key}")
+            pipe = self.client.pipeline(transaction=False)
+            if value is not None:
+                pipe.zadd(self.lru_key, {key: time.time()})
+            pipe.hincrby(self.stats_key, "hits" if value is not None else "misses", 1)
+            pipe.execute()
+        except Exception as e:
+            logger.warning("Generation cache read failed, using fallback: %s", e)
+            return self.fallback.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(f"{self.prefix}{key}", json.dumps(value), ex=self.ttl_seconds)
+            pipe.zadd(self.lru_key, {key: now})
+            pipe.zadd(self.expiry_key, {key: now + self.ttl_seconds})
+            pipe.zrangebyscore(self.expiry_key, "-inf", now)
+            expired = pipe.execute()[-1]
+            # Redis dropped these values itself; drop their members too so they
+            # are neither counted nor evicted in place of live entries
+            if expired:
+                pipe = self.client.pipeline(transaction=False)
+                pipe.zrem(self.lru_key, *expired)
+                pipe.zrem(self.expiry_key, *expired)
+                pipe.execute()
+            size = self.client.zcard(self.lru_key)
+            if size > self.max_entries:
+                evicted = [member for member, _ in self.client.zpopmin(self.lru_key, size - self.max_entries)]
+                if evicted:
+                    pipe = self.client.pipeline(transaction=False)
+                    pipe.zrem(self.expiry_key, *evicted)
+                    pipe.delete(*(f"{self.prefix}{member.decode()}" for member in evicted))
+                    pipe.execute()
+        except Exception as e:
+            logger.warning("Generation cache write failed, using fallback: %s", e)
+            self.fallback.set(key, value)
+
+    def metrics(self) -> Dict[str, Any]:
+        try:
+            counts = {name.decode(): int(count) for name, count in self.client.hgetall(self.stats_key).items()}
+            entries = self.client.zcount(self.expiry_key, time.time(), "+inf")
+        except Exception as e:
+            logger.warning("Generation cache metrics failed, using fallback: %s", e)
+            return self.fallback.metrics()
+        return _metrics(counts.get("hits", 0), counts.get("misses", 0), entries)
+
+
+def build_generation_cache() -> GenerationCache:
+    """
+    Build the cache selected by settings.generation_cache_backend
+    """
+    if settings.generation_cache_backend == "redis":
+        return RedisGenerationCache(settings.redis_url, SqliteGenerationCache(settings.generation_cache_path))
+    if settings.generation_cache_backend == "sqlite":
+        return SqliteGenerationCache(settings.generation_cache_path)
+    if settings.generation_cache_backend == "none":
+        return NullGenerationCache()
+    raise ValueError(f"Unknown generation cache backend: {settings.generation_cache_backend}")
+
+
+_generation_cache: Optional[GenerationCache] = None
+
+
+def get_generation_cache() -> GenerationCache:
+    """
+    Return the process-wide generation cache, creating it on first use
+    """
+    global _generation_cache
+    if _generation_cache is None:
+        _generation_cache = build_generation_cache()
+    return _generation_cache
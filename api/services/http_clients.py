@@ -0,0 +1,56 @@
+import asyncio
+import threading
+from typing import Dict, Tuple
+import httpx
+from config import settings
+
+
+# Pool name -> (event loop, client). httpx clients belong to the loop they were
+# first used on, so a client is only handed out on its own loop.
+_http_clients: Dict[str, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+_http_clients_lock = threading.Lock()
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """
+    Build an AsyncClient with the configured connection pool and timeouts
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.http_timeout_seconds, connect=settings.http_connect_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds
+        )
+    )
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """
+    Return the shared client of a provider pool ("transcription", "llm") for
+    the running event loop, creating it on first use.
+
+    Reusing one client keeps connections (and their TLS sessions) alive across
+    requests and tasks. Each provider gets its own pool so that slow polling on
+    one does not hold connections another needs.
+    """
+    loop = asyncio.get_running_loop()
+    with _http_clients_lock:
+        entry = _http_clients.get(name)
+        if entry is None or entry[0] is not loop or entry[1].is_closed:
+            # A client left behind by a finished loop cannot be reused or closed here
+            entry = (loop, build_http_client())
+            _http_clients[name] = entry
+    return entry[1]
+
+
+async def close_http_clients() -> None:
+    """
+    Close the shared clients of the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    with _http_clients_lock:
+        names = [name for name, (client_loop, _) in _http_clients.items() if client_loop is loop]
+        clients = [_http_clients.pop(name)[1] for name in names]
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,490 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+import httpx
+from config import settings
+from api.services.http_clients import get_http_client
+from api.services.transcript_chunking_service import count_tokens
+
+# Rate limited, overloaded or temporarily failing; worth another attempt
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+
+class LLMProviderError(Exception):
+    """
+    A provider request failed (after any retries)
+    """
+
+    def __init__(self, provider: str, message: str, status_code: Optional[int] = None):
+        self.provider = provider
+        self.status_code = status_code
+        super().__init__(f"{provider}: {message}")
+
+
+@dataclass
+class LLMResponse:
+    """
+    Completion returned by the gateway
+    """
+    text: str
+    provider: str
+    model: str
+    input_tokens: int
+    output_tokens: int
+    latency_seconds: float
+
+
+class TokenBucket:
+    """
+    Allows `per_minute` units a minute, in bursts of up to a minute's worth.
+    acquire() waits until the units are available; callers queue in order.
+    A per_minute of 0 (or less) means no limit.
+    """
+
+    def __init__(self, per_minute: float):
+        self.unlimited = per_minute <= 0
+        self.rate = per_minute / 60
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> None:
+        if self.unlimited:
+            return
+        # A request larger than the whole bucket waits for a full one
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            self._refill()
+            while self.level < amount:
+                await asyncio.sleep((amount - self.level) / self.rate)
+                self._refill()
+            self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        """
+        Return units taken on an estimate that turned out too high
+        """
+        if self.unlimited:
+            return
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class LLMProvider:
+    """
+    One model API behind the gateway, with its own concurrency limit, request
+    and token rate limits, and a window of recent latencies.
+
+    Subclasses build the provider's request and parse its response and the
+    events of its streamed responses.
+    """
+
+    name = "provider"
+    # Request body fields that turn a request into a server-sent event stream
+    stream_fields: Dict[str, Any] = {"stream": True}
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        model: str,
+        max_concurrency: int,
+        requests_per_minute: int,
+        tokens_per_minute: int
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.latencies: Deque[float] = deque(maxlen=200)
+
+    def build_request(self, prompt: str, max_tokens: int, temperature: float) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        raise NotImplementedError
+
+    def parse_response(self, data: Dict[str, Any]) -> Tuple[str, int, int]:
+        raise NotImplementedError
+
+    def parse_stream_event(self, data: Dict[str, Any]) -> Tuple[str, int, int]:
+        raise NotImplementedError
+
+    def p95_latency(self, min_samples: int = 20) -> Optional[float]:
+        """
+        95th percentile of recent successful request latencies, in seconds
+        (None until there are enough of them)
+        """
+        if len(self.latencies) < min_samples:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[int(len(latencies) * 0.95) - 1]
+
+    def retry_delay(self, response: Optional[httpx.Response], attempt: int) -> float:
+        """
+        Seconds to wait before retrying: the provider's retry-after when it
+        sends one, otherwise exponential backoff with jitter
+        """
+        backoff = min(settings.llm_backoff_max_seconds, settings.llm_backoff_base_seconds * 2 ** attempt)
+        delay = backoff * random.uniform(0.5, 1.0)
+        if response is not None:
+            try:
+                if "retry-after-ms" in response.headers:
+                    delay = float(response.headers["retry-after-ms"]) / 1000
+                elif "retry-after" in response.headers:
+                    delay = float(response.headers["retry-after"])
+            except ValueError:
+                pass  # An HTTP date; keep the backoff
+        return min(delay, settings.llm_backoff_max_seconds)
+
+    async def complete(self, prompt: str, max_tokens: int, temperature: float) -> LLMResponse:
+        """
+        Send one completion, retrying retryable failures up to
+        settings.llm_max_retries times. Each attempt takes its estimated tokens
+        from the rate limiter and returns whatever the response did not use.
+        An attempt the provider accepted but whose usage is unknown (its
+        response could not be parsed, or it was cancelled in flight) keeps the
+        whole estimate.
+        """
+        url, headers, body = self.build_request(prompt, max_tokens, temperature)
+        estimated_tokens = count_tokens(prompt) + max_tokens
+        client = get_http_client("llm")
+        for attempt in range(settings.llm_max_retries + 1):
+            await self.requests.acquire(1)
+            await self.tokens.acquire(estimated_tokens)
+            response = None
+            used_tokens = 0
+            try:
+                async with self.semaphore:
+                    started = time.monotonic()
+                    used_tokens = estimated_tokens
+                    try:
+                        response = await client.post(url, headers=headers, json=body)
+                    except httpx.TransportError as e:
+                        used_tokens = 0
+                        error = LLMProviderError(self.name, f"request failed: {e!r}")
+                    else:
+                        if response.status_code == 200:
+                            latency = time.monotonic() - started
+                            self.latencies.append(latency)
+                            text, input_tokens, output_tokens = self.parse_response(response.json())
+                            used_tokens = input_tokens + output_tokens
+                            return LLMResponse(text, self.name, self.model, input_tokens, output_tokens, latency)
+                        # A rejected request used nothing
+                        used_tokens = 0
+                        error = LLMProviderError(self.name, response.text[:500], response.status_code)
+                        if response.status_code not in RETRYABLE_STATUS_CODES:
+                            raise error
+            finally:
+                # Give back what the estimate overshot
+                self.tokens.refund(estimated_tokens - used_tokens)
+            if attempt < settings.llm_max_retries:
+                await asyncio.sleep(self.retry_delay(response, attempt))
+        raise error
+
+    async def stream(self, prompt: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        """
+        Send one streaming completion and yield its text as it arrives.
+        Failures before the stream starts are retried like complete(); a
+        stream that breaks off part way raises LLMProviderError and, like a
+        cancelled one, keeps its whole token estimate.
+        """
+        url, headers, body = self.build_request(prompt, max_tokens, temperature)
+        body = {**body, **self.stream_fields}
+        estimated_tokens = count_tokens(prompt) + max_tokens
+        client = get_http_client("llm")
+        for attempt in range(settings.llm_max_retries + 1):
+            await self.requests.acquire(1)
+            await self.tokens.acquire(estimated_tokens)
+            response = None
+            used_tokens = 0
+            streamed = False
+            try:
+                async with self.semaphore:
+                    used_tokens = estimated_tokens
+                    reported_tokens = 0
+                    try:
+                        async with client.stream("POST", url, headers=headers, json=body) as response:
+                            if response.status_code == 200:
+                                async for line in response.aiter_lines():
+                                    # Server-sent events: only the data lines carry JSON
+                                    if not line.startswith("data:"):
+                                        continue
+                                    data = line[len("data:"):].strip()
+                                    if data == "[DONE]":
+                                        break
+                                    text, input_tokens, output_tokens = self.parse_stream_event(json.loads(data))
+                                    reported_tokens += input_tokens + output_tokens
+                                    if text:
+                                        streamed = True
+                                        yield text
+                                used_tokens = reported_tokens
+                                return
+                            await response.aread()
+                    except httpx.TransportError as e:
+                        if streamed:
+                            raise LLMProviderError(self.name, f"stream broke off: {e!r}")
+                        used_tokens = 0
+                        error = LLMProviderError(self.name, f"request failed: {e!r}")
+                    else:
+                        used_tokens = 0
+                        error = LLMProviderError(self.name, response.text[:500], response.status_code)
+                        if response.status_code not in RETRYABLE_STATUS_CODES:
+                            raise error
+            finally:
+                self.tokens.refund(estimated_tokens - used_tokens)
+            if attempt < settings.llm_max_retries:
+                await asyncio.sleep(self.retry_delay(response, attempt))
+        raise error
+
+
+class OpenAIProvider(LLMProvider):
+    """
+    OpenAI chat completions
+    """
+
+    name = "openai"
+    stream_fields = {"stream": True, "stream_options": {"include_usage": True}}
+
+    def build_request(self, prompt: str, max_tokens: int, temperature: float) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        return (
+            f"{self.base_url}/chat/completions",
+            {"authorization": f"Bearer {self.api_key}"},
+            {
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": max_tokens,
+                "temperature": temperature
+            }
+        )
+
+    def parse_response(self, data: Dict[str, Any]) -> Tuple[str, int, int]:
+        usage = data.get("usage") or {}
+        return data["choices"][0]["message"]["content"], usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+    def parse_stream_event(self, data: Dict[str, Any]) -> Tuple[str, int, int]:
+        # Usage arrives in a last chunk with no choices
+        usage = data.get("usage") or {}
+        choices = data.get("choices") or []
+        text = ((choices[0].get("delta") or {}).get("content") or "") if choices else ""
+        return text, usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+class AnthropicProvider(LLMProvider):
+    """
+    Anthropic messages API
+    """
+
+    name = "anthropic"
+
+    def build_request(self, prompt: str, max_tokens: int, temperature: float) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        return (
+            f"{self.base_url}/v1/messages",
+            {"x-api-key": self.api_key, "anthropic-version": "2023-06-01"},
+            {
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": max_tokens,
+                "temperature": temperature
+            }
+        )
+
+    def parse_response(self, data: Dict[str, Any]) -> Tuple[str, int, int]:
+        usage = data.get("usage") or {}
+        text = "".join(block.get("text", "") for block in data["content"] if block.get("type") == "text")
+        return text, usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+    def parse_stream_event(self, data: Dict[str, Any]) -> Tuple[str, int, int]:
+        event_type = data.get("type")
+        if event_type == "content_block_delta":
+            return data["delta"].get("text", ""), 0, 0
+        if event_type == "message_start":
+            return "", (data["message"].get("usage") or {}).get("input_tokens", 0), 0
+        if event_type == "message_delta":
+            # The final output token count of the whole message
+            return "", 0, (data.get("usage") or {}).get("output_tokens", 0)
+        if event_type == "error":
+            raise LLMProviderError(self.name, data["error"].get("message", "stream error"))
+        return "", 0, 0
+
+
+class LLMGateway:
+    """
+    Sends completions to the first provider, falling back to the next ones
+    when it fails.
+
+    With hedging on, a request the primary has not answered within its p95
+    latency (settings.llm_hedge_after_ms until there is enough history) is
+    also sent to the second provider; the first answer wins and the other
+    request is cancelled. The remaining providers are tried only when both
+    of those fail.
+    """
+
+    def __init__(self, providers: List[LLMProvider], hedge: bool = False):
+        if not providers:
+            raise ValueError("No LLM provider configured")
+        self.providers = providers
+        self.hedge = hedge
+        self.counts: Dict[str, int] = {}
+
+    def _count(self, name: str) -> None:
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    async def complete(self, prompt: str, max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> LLMResponse:
+        if max_tokens is None:
+            max_tokens = settings.llm_max_tokens
+        if temperature is None:
+            temperature = settings.content_generation_temperature
+        if self.hedge and len(self.providers) > 1:
+            return await self._hedged(prompt, max_tokens, temperature)
+        return await self._with_failover(self.providers, prompt, max_tokens, temperature)
+
+    async def stream(self, prompt: str, max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Stream a completion's text as it arrives. The next provider is tried
+        only while nothing has been yielded yet; streams are not hedged.
+        """
+        if max_tokens is None:
+            max_tokens = settings.llm_max_tokens
+        if temperature is None:
+            temperature = settings.content_generation_temperature
+        error = None
+        for provider in self.providers:
+            streamed = False
+            try:
+                async for text in provider.stream(prompt, max_tokens, temperature):
+                    streamed = True
+                    yield text
+            except LLMProviderError as e:
+                self._count(f"{provider.name}_failed")
+                if streamed:
+                    raise
+                print(f"LLM provider {provider.name} failed, trying the next one: {e}")
+                error = e
+                continue
+            self._count(f"{provider.name}_completed")
+            return
+        raise error
+
+    async def _with_failover(self, providers: List[LLMProvider], prompt: str, max_tokens: int, temperature: float) -> LLMResponse:
+        error = None
+        for provider in providers:
+            try:
+                response = await provider.complete(prompt, max_tokens, temperature)
+            except LLMProviderError as e:
+                print(f"LLM provider {provider.name} failed, trying the next one: {e}")
+                self._count(f"{provider.name}_failed")
+                error = e
+                continue
+            self._count(f"{provider.name}_completed")
+            return response
+        raise error
+
+    async def _hedged(self, prompt: str, max_tokens: int, temperature: float) -> LLMResponse:
+        primary, secondary = self.providers[0], self.providers[1]
+        hedge_after = primary.p95_latency() or settings.llm_hedge_after_ms / 1000
+        tasks = [asyncio.create_task(self._with_failover([primary], prompt, max_tokens, temperature))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            # The second provider gets the request once: as the hedge of a slow
+            # primary or as the fallback of a failed one
+            if not done or tasks[0].exception() is not None:
+                if not done:
+                    self._count("hedged")
+                tasks.append(asyncio.create_task(self._with_failover([secondary], prompt, max_tokens, temperature)))
+            error = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+        if len(self.providers) > 2:
+            return await self._with_failover(self.providers[2:], prompt, max_tokens, temperature)
+        raise error
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Requests by outcome and recent p95 latency per provider
+        """
+        return {
+            "counts": dict(self.counts),
+            "p95_latency_seconds": {provider.name: provider.p95_latency() for provider in self.providers}
+        }
+
+
+PROVIDER_CLASSES = {"openai": OpenAIProvider, "anthropic": AnthropicProvider}
+
+
+def get_primary_llm_model() -> Optional[str]:
+    """
+    The model the gateway sends requests to first: that of the first provider
+    in settings.llm_providers with an API key (None when there is none)
+    """
+    for name in settings.llm_providers.split(","):
+        name = name.strip()
+        if getattr(settings, f"{name}_api_key", None):
+            return getattr(settings, f"{name}_model")
+    return None
+
+
+def llm_providers_configured() -> bool:
+    """
+    Whether build_llm_gateway() has a provider to send requests to
+    """
+    return get_primary_llm_model() is not None
+
+
+def build_llm_gateway() -> LLMGateway:
+    """
+    Build the gateway over the providers in settings.llm_providers (primary
+    first) that have an API key
+    """
+    providers = []
+    for name in settings.llm_providers.split(","):
+        name = name.strip()
+        if name not in PROVIDER_CLASSES:
+            raise ValueError(f"Unknown LLM provider: {name}")
+        api_key = getattr(settings, f"{name}_api_key")
+        if api_key:
+            providers.append(PROVIDER_CLASSES[name](
+                api_key=api_key,
+                base_url=getattr(settings, f"{name}_base_url"),
+                model=getattr(settings, f"{name}_model"),
+                max_concurrency=getattr(settings, f"llm_{name}_max_concurrency"),
+                requests_per_minute=getattr(settings, f"llm_{name}_requests_per_minute"),
+                tokens_per_minute=getattr(settings, f"llm_{name}_tokens_per_minute")
+            ))
+    return LLMGateway(providers, hedge=settings.llm_hedge_requests)
+
+
+# (event loop, gateway). Its semaphores and rate limiters belong to the loop
+# they were first used on, like the HTTP clients.
+_llm_gateway: Optional[Tuple[asyncio.AbstractEventLoop, LLMGateway]] = None
+_llm_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """
+    Return the LLM gateway of the running event loop, creating it on first use
+    """
+    global _llm_gateway
+    loop = asyncio.get_running_loop()
+    with _llm_gateway_lock:
+        if _llm_gateway is None or _llm_gateway[0] is not loop:
+            _llm_gateway = (loop, build_llm_gateway())
+        return _llm_gateway[1]
@@ -0,0 +1,213 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from api.models import User
+from api.schemas import User as UserSchema
+from config import settings
+
+
+class PrincipalCache:
+    """
+    Cache of authenticated users keyed by token subject (the user's email).
+
+    Entries are the public User schema, never the password hash. The async
+    methods default to the sync ones; backends doing network I/O override them.
+    """
+
+    def get(self, subject: str) -> Optional[UserSchema]:
+        raise NotImplementedError
+
+    def set(self, subject: str, principal: UserSchema, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, subject: str) -> None:
+        raise NotImplementedError
+
+    async def get_async(self, subject: str) -> Optional[UserSchema]:
+        return self.get(subject)
+
+    async def set_async(self, subject: str, principal: UserSchema, ttl_seconds: float) -> None:
+        self.set(subject, principal, ttl_seconds)
+
+
+class NullPrincipalCache(PrincipalCache):
+    """
+    Disabled cache: every request looks the user up again
+    """
+
+    def get(self, subject: str) -> Optional[UserSchema]:
+        return None
+
+    def set(self, subject: str, principal: UserSchema, ttl_seconds: float) -> None:
+        pass
+
+    def invalidate(self, subject: str) -> None:
+        pass
+
+
+class MemoryPrincipalCache(PrincipalCache):
+    """
+    Per-process LRU cache with per-entry expiry
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[float, UserSchema]]" = OrderedDict()  # subject -> (expires at, principal)
+        self.lock = threading.Lock()
+
+    def get(self, subject: str) -> Optional[UserSchema]:
+        with self.lock:
+            entry = self.entries.get(subject)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self.entries[subject]
+                return None
+            self.entries.move_to_end(subject)
+            return principal
+
+    def set(self, subject: str, principal: UserSchema, ttl_seconds: float) -> None:
+        with self.lock:
+            self.entries[subject] = (time.monotonic() + ttl_seconds, principal)
+            self.entries.move_to_end(subject)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, subject: str) -> None:
+        with self.lock:
+            self.entries.pop(subject, None)
+
+
+class RedisPrincipalCache(PrincipalCache):
+    """
+    Cache shared by all API replicas. Redis errors are treated as misses so an
+    unavailable cache only costs the user lookup it was meant to save.
+    """
+
+    def __init__(self, redis_url: str, prefix: str = "principal:"):
+        import redis
+        import redis.asyncio
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(redis_url)
+        self.async_client = redis.asyncio.Redis.from_url(redis_url)
+
+    def _key(self, subject: str) -> str:
+        return f"{self.prefix}{subject}"
+
+    def get(self, subject: str) -> Optional[UserSchema]:
+        try:
+            value = self.client.get(self._key(subject))
+        except Exception as e:
+            print(f"Principal cache read failed: {e}")
+            return None
+        return UserSchema.model_validate_json(value) if value else None
+
+    def set(self, subject: str, principal: UserSchema, ttl_seconds: float) -> None:
+        try:
+            self.client.set(self._key(subject), principal.model_dump_json(), px=max(1, int(ttl_seconds * 1000)))
+        except Exception as e:
+            print(f"Principal cache write failed: {e}")
+
+    def invalidate(self, subject: str) -> None:
+        # Not swallowed here; the commit hook that calls this logs the failure
+        self.client.delete(self._key(subject))
+
+    async def get_async(self, subject: str) -> Optional[UserSchema]:
+        try:
+            value = await self.async_client.get(self._key(subject))
+        except Exception as e:
+            print(f"Principal cache read failed: {e}")
+            return None
+        return UserSchema.model_validate_json(value) if value else None
+
+    async def set_async(self, subject: str, principal: UserSchema, ttl_seconds: float) -> None:
+        try:
+            await self.async_client.set(self._key(subject), principal.model_dump_json(), px=max(1, int(ttl_seconds * 1000)))
+        except Exception as e:
+            print(f"Principal cache write failed: {e}")
+
+
+def build_principal_cache() -> PrincipalCache:
+    """
+    Build the principal cache selected by settings.principal_cache_backend
+    """
+    if settings.principal_cache_backend == "memory":
+        return MemoryPrincipalCache(settings.principal_cache_max_entries)
+    if settings.principal_cache_backend == "redis":
+        return RedisPrincipalCache(settings.redis_url)
+    if settings.principal_cache_backend == "none":
+        return NullPrincipalCache()
+    raise ValueError(f"Unknown principal cache backend: {settings.principal_cache_backend}")
+
+
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """
+    Return the process-wide principal cache, creating it on first use
+    """
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = build_principal_cache()
+    return _principal_cache
+
+
+def get_principal_ttl(token_expires_at: Optional[float]) -> float:
+    """
+    Seconds to cache a principal: the configured TTL, but never past the expiry
+    (a Unix timestamp) of the token that was presented
+    """
+    ttl = settings.principal_cache_ttl_seconds
+    if token_expires_at is not None:
+        ttl = min(ttl, token_expires_at - time.time())
+    return ttl
+
+
+def invalidate_principal(email: str) -> None:
+    """
+    Drop the cached principal of a user; call whenever the user row changes
+    """
+    get_principal_cache().invalidate(email)
+
+
+_CHANGED_EMAILS_KEY = "principal_cache_changed_emails"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _record_changed_user(mapper, connection, target: User) -> None:
+    # Only recorded here: the flush may still be rolled back, so the cache is
+    # invalidated once the transaction commits
+    session = object_session(target)
+    if session is None:
+        return
+    changed = session.info.setdefault(_CHANGED_EMAILS_KEY, set())
+    # Covers both the old and the new email when the address itself changed
+    history = inspect(target).attrs.email.history
+    changed.update(email for email in {target.email, *(history.deleted or ())} if email)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    # Releasing a savepoint also fires after_commit; wait for the real commit
+    if session.in_nested_transaction():
+        return
+    for email in session.info.pop(_CHANGED_EMAILS_KEY, ()):
+        try:
+            invalidate_principal(email)
+        except Exception as e:
+            # The change is already committed; a cache outage must not turn it into an error
+            print(f"Principal cache invalidation failed for {email}: {e}")
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rolled_back_users(session: Session, previous_transaction) -> None:
+    # A rolled-back savepoint keeps its emails: invalidating too much only costs a lookup
+    if previous_transaction.parent is None:
+        session.info.pop(_CHANGED_EMAILS_KEY, None)
@@ -1,7 +1,13 @@
+import time
+from types import SimpleNamespace
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Any, Dict, Optional
 from api.models import ProcessingJob, Episode
 from api.schemas import ProcessingJobCreate
+from api.services.progress_events_service import TERMINAL_STATUSES, publish_progress
+from config import settings
 
 
 def create_processing_job(db: Session, job: ProcessingJobCreate):
@@ -30,24 +36,129 @@ def get_processing_job(db: Session, job_id: int):
     return db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
 
 
+def _job_status_values(status: str, progress: Optional[int], error_log: Optional[str]) -> Dict[str, Any]:
+    values: Dict[str, Any] = {"status": status}
+    if progress is not None:
+        values["progress"] = progress
+    if error_log is not None:
+        values["error_log"] = error_log
+    if status == "processing":
+        values["started_at"] = func.coalesce(ProcessingJob.started_at, func.now())
+        values["completed_at"] = None  # A retried job is running again
+    elif status in TERMINAL_STATUSES:
+        values["started_at"] = func.coalesce(ProcessingJob.started_at, func.now())
+        values["completed_at"] = func.now()
+    return values
+
+
+def write_processing_job_status(db: Session, job_id: int, status: str, progress: Optional[int] = None, error_log: Optional[str] = None):
+    """
+    Write the status of a processing job with a single UPDATE and commit.
+
+    Sets started_at when the job first starts processing and completed_at when
+    it completes or fails. Returns the updated columns (None if there is no such
+    job). The commit also covers anything else pending on the session.
+    """
+    row = db.execute(
+        update(ProcessingJob)
+        .where(ProcessingJob.id == job_id)
+        .values(**_job_status_values(status, progress, error_log))
+        .returning(
+            ProcessingJob.id,
+            ProcessingJob.episode_id,
+            ProcessingJob.job_type,
+            ProcessingJob.status,
+            ProcessingJob.progress,
+            ProcessingJob.error_log
+        )
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.commit()
+    return row
+
+
 def update_processing_job_status(db: Session, job_id: int, status: str, progress: Optional[int] = None, error_log: Optional[str] = None):
     """
-    Update the status of a processing job
+    Update the status of a processing job and announce it to viewers
     """
-    job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+    job = write_processing_job_status(db, job_id, status, progress, error_log)
     if job:
-        job.status = status
+        publish_progress(job)
+    return job
+
+
+class ProgressReporter:
+    """
+    Write-behind progress for one running processing job.
+
+    Every report() is announced to viewers, but the database only sees the
+    latest state at most once per flush interval: updates in between are
+    coalesced in memory. Status changes, and therefore the terminal
+    completed/failed states, are always written immediately and announced only
+    once that write has committed, so viewers never hear of a state that was
+    rolled back. There is no timer: a coalesced update is written by the next
+    report() after the interval or by flush(), which callers run when they
+    are done with the reporter.
+    """
+
+    def __init__(self, db: Session, job: ProcessingJob, flush_interval_ms: Optional[int] = None):
+        self.db = db
+        self.job = SimpleNamespace(
+            id=job.id,
+            episode_id=job.episode_id,
+            job_type=job.job_type,
+            status=job.status,
+            progress=job.progress,
+            error_log=job.error_log
+        )
+        if flush_interval_ms is None:
+            flush_interval_ms = settings.progress_flush_interval_ms
+        self.flush_interval = flush_interval_ms / 1000
+        self.written_status = job.status
+        self.last_flush = float("-inf")
+        self.dirty = False
+
+    def report(self, status: str, progress: Optional[int] = None, error_log: Optional[str] = None) -> None:
+        """
+        Record the job's current state; the write may be deferred
+        """
+        if status == self.job.status and progress in (None, self.job.progress) and error_log in (None, self.job.error_log):
+            return
+        self.job.status = status
         if progress is not None:
-            job.progress = progress
+            self.job.progress = progress
         if error_log is not None:
-            job.error_log = error_log
-        db.commit()
-        db.refresh(job)
-    return job
+            self.job.error_log = error_log
+        self.dirty = True
+
+        if status != self.written_status or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+        publish_progress(self.job)
+
+    def flush(self) -> None:
+        """
+        Write the coalesced state, if anything changed since the last write
+        """
+        if not self.dirty:
+            return
+        write_processing_job_status(self.db, self.job.id, self.job.status, self.job.progress, self.job.error_log)
+        self.written_status = self.job.status
+        self.last_flush = time.monotonic()
+        self.dirty = False
 
 
 def get_episode_processing_jobs(db: Session, episode_id: int):
     """
     Get all processing jobs for an episode
     """
-    return db.query(ProcessingJob).filter(ProcessingJob.episode_id == episode_id).all()
\ No newline at end of file
+    return db.query(ProcessingJob).filter(ProcessingJob.episode_id == episode_id).all()
+
+
+async def get_latest_processing_job_async(db: AsyncSession, episode_id: int):
+    """
+    Get the most recent processing job of an episode on an async session
+    """
+    result = await db.execute(
+        select(ProcessingJob).where(ProcessingJob.episode_id == episode_id).order_by(ProcessingJob.id.desc()).limit(1)
+    )
+    return result.scalars().first()
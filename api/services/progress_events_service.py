@@ -0,0 +1,234 @@
+import asyncio
+import json
+import threading
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from config import settings
+
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+
+def build_progress_event(job: Any) -> Dict[str, Any]:
+    """
+    Serializable progress event for a ProcessingJob row
+    """
+    return {
+        "job_id": job.id,
+        "episode_id": job.episode_id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "progress": job.progress,
+        "error_log": job.error_log,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+class ProgressBroker:
+    """
+    Carries progress events from the processes that update jobs (Celery
+    workers) to every API process.
+
+    publish() is synchronous and best effort: a lost event only delays the
+    progress a viewer sees, so it must never fail the job that sent it.
+    subscribe() returns, once the subscription is active, an iterator over
+    every event published from then on.
+    """
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def subscribe(self) -> AsyncIterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class NullProgressBroker(ProgressBroker):
+    def publish(self, event: Dict[str, Any]) -> None:
+        pass
+
+    async def subscribe(self) -> AsyncIterator[Dict[str, Any]]:
+        return self._never()
+
+    async def _never(self) -> AsyncIterator[Dict[str, Any]]:
+        await asyncio.Event().wait()
+        yield {}
+
+
+class MemoryProgressBroker(ProgressBroker):
+    """
+    In-process broker for development and tests, where the workflow runs in
+    the same process as the API. publish() may be called from any thread.
+    """
+
+    def __init__(self):
+        self.listeners: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self.lock = threading.Lock()
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        with self.lock:
+            listeners = list(self.listeners)
+        for loop, queue in listeners:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass  # The listening loop has been closed
+
+    async def subscribe(self) -> AsyncIterator[Dict[str, Any]]:
+        listener = (asyncio.get_running_loop(), asyncio.Queue())
+        with self.lock:
+            self.listeners.append(listener)
+        return self._events(listener)
+
+    async def _events(self, listener: Tuple[asyncio.AbstractEventLoop, asyncio.Queue]) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            while True:
+                yield await listener[1].get()
+        finally:
+            with self.lock:
+                self.listeners.remove(listener)
+
+
+class RedisProgressBroker(ProgressBroker):
+    """
+    Redis pub/sub broker: one channel per episode, and each API process holds
+    a single pattern subscription over all of them
+    """
+
+    def __init__(self, redis_url: str, prefix: str = "progress:episode:"):
+        import redis
+
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(redis_url)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        try:
+            self.client.publish(f"{self.prefix}{event['episode_id']}", json.dumps(event))
+        except Exception as e:
+            print(f"Failed to publish progress for episode {event['episode_id']}: {e}")
+
+    async def subscribe(self) -> AsyncIterator[Dict[str, Any]]:
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.redis_url)
+        pubsub = client.pubsub()
+        await pubsub.psubscribe(f"{self.prefix}*")
+        return self._events(client, pubsub)
+
+    async def _events(self, client, pubsub) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "pmessage":
+                    yield json.loads(message["data"])
+        finally:
+            await pubsub.reset()
+            await client.close()
+
+
+class ProgressHub:
+    """
+    Fans progress events out to the viewers connected to this API process.
+
+    One listener task reads the broker for the whole process; each viewer gets
+    a small queue for the episode it watches. Only the latest progress matters,
+    so a viewer that falls behind drops its oldest events rather than growing.
+    """
+
+    def __init__(self, broker: ProgressBroker, queue_size: int = 16):
+        self.broker = broker
+        self.queue_size = queue_size
+        self.subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.task: Optional[asyncio.Task] = None
+        self.ready: Optional[asyncio.Event] = None
+
+    async def _ensure_listening(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop or self.task is None or self.task.done():
+            # First viewer, or the previous event loop went away
+            self.loop = loop
+            self.subscribers = {}
+            self.ready = asyncio.Event()
+            self.task = loop.create_task(self._listen())
+        await self.ready.wait()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                events = await self.broker.subscribe()
+                self.ready.set()
+                async for event in events:
+                    self._dispatch(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Viewers still get their snapshot; live events resume on reconnect
+                self.ready.set()
+                print(f"Progress listener failed, reconnecting: {e}")
+                await asyncio.sleep(1)
+
+    def _dispatch(self, event: Dict[str, Any]) -> None:
+        for queue in self.subscribers.get(event.get("episode_id"), ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def subscribe(self, episode_id: int) -> asyncio.Queue:
+        """
+        Start receiving the events of an episode; pair with unsubscribe()
+        """
+        await self._ensure_listening()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.setdefault(episode_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, episode_id: int, queue: asyncio.Queue) -> None:
+        queues = self.subscribers.get(episode_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[episode_id]
+
+
+def build_progress_broker(prefix: str = "progress:episode:") -> ProgressBroker:
+    """
+    Build the broker selected by settings.progress_events_backend. Other
+    per-episode event streams use it with their own channel prefix.
+    """
+    if settings.progress_events_backend == "redis":
+        return RedisProgressBroker(settings.redis_url, prefix)
+    if settings.progress_events_backend == "memory":
+        return MemoryProgressBroker()
+    if settings.progress_events_backend == "none":
+        return NullProgressBroker()
+    raise ValueError(f"Unknown progress events backend: {settings.progress_events_backend}")
+
+
+_progress_broker: Optional[ProgressBroker] = None
+_progress_hub: Optional[ProgressHub] = None
+
+
+def get_progress_broker() -> ProgressBroker:
+    """
+    Return the process-wide progress broker, creating it on first use
+    """
+    global _progress_broker
+    if _progress_broker is None:
+        _progress_broker = build_progress_broker()
+    return _progress_broker
+
+
+def get_progress_hub() -> ProgressHub:
+    """
+    Return this process's fan-out hub over the progress broker
+    """
+    global _progress_hub
+    if _progress_hub is None or _progress_hub.broker is not get_progress_broker():
+        _progress_hub = ProgressHub(get_progress_broker())
+    return _progress_hub
+
+
+def publish_progress(job: Any) -> None:
+    """
+    Announce the current state of a processing job to connected viewers
+    """
+    get_progress_broker().publish(build_progress_event(job))
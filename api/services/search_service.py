@@ -0,0 +1,322 @@
+import html
+import math
+import re
+import threading
+import weakref
+from collections import Counter, defaultdict
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple
+from api.database import begin_savepoint
+from api.models import SearchDocument, Episode
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i in is it its of on or our she so "
+    "that the their them they this to was we were what when which who will with you your".split()
+)
+SNIPPET_RADIUS = 80
+
+
+def tokenize(value: str) -> List[str]:
+    """
+    Lowercase word tokens with stopwords removed
+    """
+    return [token for token in TOKEN_PATTERN.findall(value.lower()) if token not in STOPWORDS]
+
+
+def mark_terms(text: str, pattern: "re.Pattern[str]") -> str:
+    """
+    HTML-escape text and wrap the matches of pattern in <mark>. Matching runs
+    on the raw text, so a term can never land inside an entity.
+    """
+    parts = []
+    last = 0
+    for match in pattern.finditer(text):
+        parts.append(html.escape(text[last:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group(0))}</mark>")
+        last = match.end()
+    parts.append(html.escape(text[last:]))
+    return "".join(parts)
+
+
+def highlight_snippet(body: str, terms: List[str], radius: int = SNIPPET_RADIUS) -> str:
+    """
+    Cut a window of text around the first query term and wrap matches in <mark>
+    """
+    if not terms:
+        return html.escape(body[:radius * 2])
+    pattern = re.compile(r"\b(" + "|".join(re.escape(term) for term in terms) + r")\b", re.IGNORECASE)
+    match = pattern.search(body)
+    center = match.start() if match else 0
+    start = max(0, center - radius)
+    end = min(len(body), center + radius)
+    snippet = mark_terms(body[start:end], pattern)
+    return ("..." if start > 0 else "") + snippet + ("..." if end < len(body) else "")
+
+
+# ts_headline marks matches with these private-use characters instead of HTML,
+# so the headline can be escaped before the <mark> tags go in
+HEADLINE_START = "\ue000"
+HEADLINE_STOP = "\ue001"
+HEADLINE_OPTIONS = f"StartSel={HEADLINE_START}, StopSel={HEADLINE_STOP}, MaxWords=35, MinWords=15, MaxFragments=1"
+
+
+def mark_headline(headline: str) -> str:
+    """
+    Escape a ts_headline result and turn its sentinels into <mark> tags, giving
+    the same markup as highlight_snippet
+    """
+    return html.escape(headline).replace(HEADLINE_START, "<mark>").replace(HEADLINE_STOP, "</mark>")
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index with BM25 ranking, used where Postgres full-text
+    search is not available (SQLite in development and tests)
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)  # term -> {document id: term frequency}
+        self.documents: Dict[int, Dict[str, Any]] = {}  # document id -> metadata and length
+        self.total_length = 0
+        self.lock = threading.Lock()
+
+    def add(self, document_id: int, user_id: int, title: Optional[str], body: str) -> None:
+        with self.lock:
+            self._remove(document_id)
+            # Title terms count double, mirroring the higher weight they get in Postgres
+            counts = Counter(tokenize(body)) + Counter(tokenize(title or "") * 2)
+            for term, frequency in counts.items():
+                self.postings[term][document_id] = frequency
+            length = sum(counts.values())
+            self.documents[document_id] = {"user_id": user_id, "length": length, "terms": list(counts)}
+            self.total_length += length
+
+    def _remove(self, document_id: int) -> None:
+        document = self.documents.pop(document_id, None)
+        if document is None:
+            return
+        self.total_length -= document["length"]
+        for term in document["terms"]:
+            self.postings[term].pop(document_id, None)
+            if not self.postings[term]:
+                del self.postings[term]
+
+    def search(self, user_id: int, terms: List[str]) -> List[Tuple[int, float]]:
+        """
+        Return (document id, score) for the user's documents matching every term
+        """
+        with self.lock:
+            if not terms or not self.documents:
+                return []
+            postings = [self.postings.get(term, {}) for term in terms]
+            candidates = set(min(postings, key=len))
+            for posting in postings:
+                candidates &= posting.keys()
+            candidates = [d for d in candidates if self.documents[d]["user_id"] == user_id]
+
+            n = len(self.documents)
+            average_length = self.total_length / n if n else 0
+            scores = []
+            for document_id in candidates:
+                length = self.documents[document_id]["length"]
+                score = 0.0
+                for posting in postings:
+                    frequency = posting[document_id]
+                    idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                    norm = self.k1 * (1 - self.b + self.b * length / average_length) if average_length else self.k1
+                    score += idf * frequency * (self.k1 + 1) / (frequency + norm)
+                scores.append((document_id, score))
+            scores.sort(key=lambda item: (-item[1], item[0]))
+            return scores
+
+
+# One index per database engine, with the stamp of search_documents it was built from
+_python_indexes: "weakref.WeakKeyDictionary[Any, Tuple[Tuple[Any, ...], InvertedIndex]]" = weakref.WeakKeyDictionary()
+_python_indexes_lock = threading.Lock()
+
+# Changes whenever a document is added, updated or deleted
+INDEX_STAMP_QUERY = select(
+    func.count(),
+    func.max(SearchDocument.id),
+    func.max(SearchDocument.updated_at),
+    func.sum(func.length(SearchDocument.body))
+)
+
+
+def _uses_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _get_python_index(db: Session) -> InvertedIndex:
+    """
+    The in-memory index of the session's database, rebuilt whenever the
+    committed documents have changed since it was built - including writes by
+    other processes such as the Celery workers, and deletions
+    """
+    engine = db.get_bind()
+    # A connection of its own only sees committed rows, so the session's
+    # pending writes never reach the shared index
+    with engine.connect() as connection:
+        stamp = tuple(connection.execute(INDEX_STAMP_QUERY).one())
+        with _python_indexes_lock:
+            cached = _python_indexes.get(engine)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            index = InvertedIndex()
+            rows = connection.execute(select(SearchDocument.id, SearchDocument.user_id, SearchDocument.title, SearchDocument.body))
+            for document_id, user_id, title, body in rows:
+                index.add(document_id, user_id, title, body)
+            _python_indexes[engine] = (stamp, index)
+    return index
+
+
+def index_document(
+    db: Session,
+    user_id: int,
+    episode_id: int,
+    source_type: str,
+    source_id: int,
+    title: Optional[str],
+    body: str,
+    commit: bool = True
+) -> SearchDocument:
+    """
+    Add or refresh the search entry of a transcript or content row
+    """
+    def upsert():
+        document = db.query(SearchDocument).filter(
+            SearchDocument.source_type == source_type,
+            SearchDocument.source_id == source_id
+        ).first()
+        if document is None:
+            document = SearchDocument(source_type=source_type, source_id=source_id)
+            db.add(document)
+        document.user_id = user_id
+        document.episode_id = episode_id
+        document.title = title
+        document.body = body
+        db.flush()
+        return document
+
+    try:
+        # A savepoint, so a conflict only undoes this row and not the caller's work
+        with begin_savepoint(db):
+            document = upsert()
+    except IntegrityError:
+        # A concurrent writer indexed the same source first; update its row instead
+        document = upsert()
+
+    if commit:
+        db.commit()
+    return document
+
+
+def delete_source_document(db: Session, source_type: str, source_id: int) -> None:
+    """
+    Remove the search entry of a transcript or content row that is being
+    deleted; the caller commits
+    """
+    db.execute(delete(SearchDocument).where(
+        SearchDocument.source_type == source_type,
+        SearchDocument.source_id == source_id
+    ))
+
+
+async def delete_episode_documents_async(db: AsyncSession, episode_id: int) -> None:
+    """
+    Remove every search entry of an episode that is being deleted; the caller
+    commits
+    """
+    await db.execute(delete(SearchDocument).where(SearchDocument.episode_id == episode_id))
+
+
+def _search_postgres(db: Session, user_id: int, query: str, source_type: Optional[str], limit: int, offset: int) -> Tuple[int, List[Dict[str, Any]]]:
+    source_filter = "AND d.source_type = :source_type" if source_type else ""
+    # Rank and page first, then build headlines only for the rows on the page
+    rows = db.execute(text(f"""
+        WITH q AS (SELECT websearch_to_tsquery('english', :query) AS query),
+        page AS (
+            SELECT d.id, ts_rank_cd(d.search_vector, q.query) AS score, count(*) OVER () AS total
+            FROM search_documents d, q
+            WHERE d.user_id = :user_id AND d.search_vector @@ q.query {source_filter}
+            ORDER BY score DESC, d.id
+            LIMIT :limit OFFSET :offset
+        )
+        SELECT d.id, d.episode_id, d.source_type, d.source_id, d.title, page.score, page.total,
+               ts_headline('english', d.body, q.query, :headline_options) AS snippet
+        FROM page JOIN search_documents d ON d.id = page.id, q
+        ORDER BY page.score DESC, d.id
+    """), {
+        "query": query,
+        "user_id": user_id,
+        "source_type": source_type,
+        "limit": limit,
+        "offset": offset,
+        "headline_options": HEADLINE_OPTIONS
+    }).mappings().all()
+
+    total = rows[0]["total"] if rows else 0
+    return total, [{**row, "snippet": mark_headline(row["snippet"])} for row in rows]
+
+
+def _search_python(db: Session, user_id: int, query: str, source_type: Optional[str], limit: int, offset: int) -> Tuple[int, List[Dict[str, Any]]]:
+    terms = tokenize(query)
+    matches = _get_python_index(db).search(user_id, terms)
+    if source_type:
+        allowed = {
+            document_id for (document_id,) in db.query(SearchDocument.id).filter(
+                SearchDocument.user_id == user_id,
+                SearchDocument.source_type == source_type
+            )
+        }
+        matches = [match for match in matches if match[0] in allowed]
+
+    page = matches[offset:offset + limit]
+    documents = {
+        document.id: document
+        for document in db.query(SearchDocument).filter(SearchDocument.id.in_([document_id for document_id, _ in page]))
+    }
+    results = []
+    for document_id, score in page:
+        document = documents.get(document_id)
+        if document is None:
+            continue
+        results.append({
+            "id": document.id,
+            "episode_id": document.episode_id,
+            "source_type": document.source_type,
+            "source_id": document.source_id,
+            "title": document.title,
+            "score": score,
+            "snippet": highlight_snippet(document.body, terms)
+        })
+    return len(matches), results
+
+
+def search_documents(
+    db: Session,
+    user_id: int,
+    query: str,
+    page: int = 1,
+    page_size: int = 20,
+    source_type: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Ranked, paginated full-text search over one user's transcripts and content
+    """
+    offset = (page - 1) * page_size
+    search = _search_postgres if _uses_postgres(db) else _search_python
+    total, results = search(db, user_id, query, source_type, page_size, offset)
+
+    episode_ids = {result["episode_id"] for result in results}
+    titles = dict(db.query(Episode.id, Episode.title).filter(Episode.id.in_(episode_ids)).all()) if episode_ids else {}
+    for result in results:
+        result["episode_title"] = titles.get(result["episode_id"])
+
+    return {"query": query, "total": total, "page": page, "page_size": page_size, "results": results}
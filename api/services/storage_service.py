@@ -1,9 +1,346 @@
+import asyncio
+import hashlib
 import os
 import uuid
-from typing import Optional
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional
+from fastapi import UploadFile
 from config import settings
 
 
+class FileTooLargeError(Exception):
+    """
+    Raised when an upload stream grows past the configured size limit
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"Upload exceeds the {max_size} byte limit")
+
+
+@dataclass
+class StoredObject:
+    """
+    Result of streaming an upload into a storage backend
+    """
+    key: str
+    url: str
+    size: int
+    sha256: str
+
+
+class StorageWriter:
+    """
+    Incremental writer for a single object. Chunks are passed straight through
+    to the backend; nothing is visible under the key until commit() succeeds.
+    """
+
+    async def write(self, chunk: bytes) -> None:
+        raise NotImplementedError
+
+    async def commit(self) -> None:
+        raise NotImplementedError
+
+    async def abort(self) -> None:
+        raise NotImplementedError
+
+
+class StorageBackend:
+    """
+    Interface for the object stores audio files are written to
+    """
+
+    async def open_writer(self, key: str) -> StorageWriter:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def iter_object(self, key: str, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+    def get_url(self, key: str) -> str:
+        raise NotImplementedError
+
+    def get_read_url(self, url: str) -> str:
+        """
+        A path or URL that tools outside the backend (ffprobe) can read the
+        object stored at url from
+        """
+        return url
+
+
+class LocalFileWriter(StorageWriter):
+    def __init__(self, path: str):
+        self.path = path
+        self.partial_path = f"{path}.{uuid.uuid4().hex}.partial"
+        self.file = None
+
+    async def open(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.file = await asyncio.to_thread(open, self.partial_path, "wb")
+
+    async def write(self, chunk: bytes) -> None:
+        await asyncio.to_thread(self.file.write, chunk)
+
+    async def commit(self) -> None:
+        await asyncio.to_thread(self.file.close)
+        await asyncio.to_thread(os.replace, self.partial_path, self.path)
+
+    async def abort(self) -> None:
+        await asyncio.to_thread(self.file.close)
+        if os.path.exists(self.partial_path):
+            await asyncio.to_thread(os.remove, self.partial_path)
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Stores objects as files below a root directory
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    async def open_writer(self, key: str) -> StorageWriter:
+        writer = LocalFileWriter(self._path(key))
+        await writer.open()
+        return writer
+
+    async def delete(self, key: str) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            await asyncio.to_thread(os.remove, path)
+
+    async def iter_object(self, key: str, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        chunk_size = chunk_size or settings.upload_chunk_size_bytes
+        f = await asyncio.to_thread(open, self._path(key), "rb")
+        try:
+            while True:
+                chunk = await asyncio.to_thread(f.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            await asyncio.to_thread(f.close)
+
+    def get_url(self, key: str) -> str:
+        return self._path(key)
+
+
+class S3MultipartWriter(StorageWriter):
+    """
+    Streams an object to S3 with a multipart upload. At most one part is held
+    in memory; S3 requires every part except the last to be at least 5 MB.
+    """
+
+    def __init__(self, client, bucket: str, key: str, part_size: int):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(part_size, 5 * 1024 * 1024)
+        self.buffer = bytearray()
+        self.parts = []
+        self.upload_id = None
+
+    async def open(self) -> None:
+        response = await asyncio.to_thread(
+            self.client.create_multipart_upload, Bucket=self.bucket, Key=self.key
+        )
+        self.upload_id = response["UploadId"]
+
+    async def _upload_part(self, data: bytes) -> None:
+        part_number = len(self.parts) + 1
+        response = await asyncio.to_thread(
+            self.client.upload_part,
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=data
+        )
+        self.parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+
+    async def write(self, chunk: bytes) -> None:
+        self.buffer.extend(chunk)
+        while len(self.buffer) >= self.part_size:
+            data = bytes(self.buffer[:self.part_size])
+            del self.buffer[:self.part_size]
+            await self._upload_part(data)
+
+    async def commit(self) -> None:
+        if self.buffer or not self.parts:
+            await self._upload_part(bytes(self.buffer))
+            self.buffer.clear()
+        await asyncio.to_thread(
+            self.client.complete_multipart_upload,
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts}
+        )
+
+    async def abort(self) -> None:
+        self.buffer.clear()
+        await asyncio.to_thread(
+            self.client.abort_multipart_upload,
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id
+        )
+
+
+class S3StorageBackend(StorageBackend):
+    """
+    Stores objects in an S3 (or S3-compatible) bucket
+    """
+
+    def __init__(self, bucket: str, region: str, endpoint_url: Optional[str] = None, part_size: Optional[int] = None):
+        import boto3
+
+        self.bucket = bucket
+        self.region = region
+        self.endpoint_url = endpoint_url
+        self.part_size = part_size or settings.s3_multipart_part_size_bytes
+        self.client = boto3.client(
+            "s3",
+            region_name=region,
+            endpoint_url=endpoint_url,
+            aws_access_key_id=settings.aws_access_key_id,
+            aws_secret_access_key=settings.aws_secret_access_key
+        )
+
+    async def open_writer(self, key: str) -> StorageWriter:
+        writer = S3MultipartWriter(self.client, self.bucket, key, self.part_size)
+        await writer.open()
+        return writer
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def iter_object(self, key: str, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        chunk_size = chunk_size or settings.upload_chunk_size_bytes
+        response = await asyncio.to_thread(self.client.get_object, Bucket=self.bucket, Key=key)
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    def get_url(self, key: str) -> str:
+        return f"s3://{self.bucket}/{key}"
+
+    def get_read_url(self, url: str) -> str:
+        prefix = f"s3://{self.bucket}/"
+        if not url.startswith(prefix):
+            return url
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": url[len(prefix):]},
+            ExpiresIn=3600
+        )
+
+
+def build_storage_backend() -> StorageBackend:
+    """
+    Build the storage backend selected by settings.storage_backend
+    """
+    if settings.storage_backend == "s3":
+        return S3StorageBackend(
+            bucket=settings.s3_bucket_name,
+            region=settings.s3_region,
+            endpoint_url=settings.s3_endpoint_url
+        )
+    if settings.storage_backend == "local":
+        return LocalStorageBackend(settings.local_storage_path)
+    raise ValueError(f"Unknown storage backend: {settings.storage_backend}")
+
+
+_storage_backend: Optional[StorageBackend] = None
+
+
+def get_storage_backend() -> StorageBackend:
+    """
+    Return the process-wide storage backend, creating it on first use
+    """
+    global _storage_backend
+    if _storage_backend is None:
+        _storage_backend = build_storage_backend()
+    return _storage_backend
+
+
+async def iter_upload_file(upload: UploadFile, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """
+    Yield an UploadFile in fixed-size chunks
+    """
+    chunk_size = chunk_size or settings.upload_chunk_size_bytes
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def save_upload_stream(
+    chunks: AsyncIterator[bytes],
+    key: str,
+    max_size: Optional[int] = None,
+    backend: Optional[StorageBackend] = None
+) -> StoredObject:
+    """
+    Stream chunks into the storage backend under the given key.
+
+    The size limit is enforced while streaming: as soon as it is crossed the
+    partial object is discarded and FileTooLargeError is raised. A SHA-256 of the
+    content is computed on the way through.
+    """
+    backend = backend or get_storage_backend()
+    max_size = max_size if max_size is not None else get_file_size_limit_bytes()
+
+    digest = hashlib.sha256()
+    size = 0
+    writer = await backend.open_writer(key)
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_size:
+                raise FileTooLargeError(max_size)
+            digest.update(chunk)
+            await writer.write(chunk)
+        await writer.commit()
+    except BaseException:
+        # Also after a failed commit, so no partial object or upload is left behind
+        await writer.abort()
+        raise
+
+    return StoredObject(key=key, url=backend.get_url(key), size=size, sha256=digest.hexdigest())
+
+
+async def concat_objects(
+    source_keys: List[str],
+    key: str,
+    max_size: Optional[int] = None,
+    backend: Optional[StorageBackend] = None
+) -> StoredObject:
+    """
+    Assemble several stored objects, in order, into a single new object
+    """
+    backend = backend or get_storage_backend()
+
+    async def chunks():
+        for source_key in source_keys:
+            async for chunk in backend.iter_object(source_key):
+                yield chunk
+
+    return await save_upload_stream(chunks(), key, max_size=max_size, backend=backend)
+
+
 def generate_unique_filename(original_filename: str) -> str:
     """
     Generate a unique filename by adding a UUID prefix
@@ -36,8 +373,15 @@ def get_file_size_limit_mb() -> int:
     return settings.max_file_size_mb
 
 
+def get_file_size_limit_bytes() -> int:
+    """
+    Get the maximum file size limit in bytes
+    """
+    return settings.max_file_size_mb * 1024 * 1024
+
+
 def get_audio_duration_limit_seconds() -> int:
     """
     Get the maximum audio duration limit in seconds
     """
-    return settings.max_audio_duration_seconds
\ No newline at end of file
+    return settings.max_audio_duration_seconds
@@ -0,0 +1,153 @@
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy.orm import Session
+from api.models import Transcript
+from api.services.transcript_service import iter_transcript_segments
+from config import settings
+
+
+@dataclass
+class TranscriptChunk:
+    """
+    Consecutive transcript segments within a token budget. The first
+    overlap_segments repeat the end of the previous chunk for context.
+    """
+    segments: List[Dict[str, Any]]
+    token_count: int
+    overlap_segments: int = 0
+    overlap_tokens: int = 0
+
+    @property
+    def start(self) -> float:
+        return self.segments[0]["start"]
+
+    @property
+    def end(self) -> float:
+        return self.segments[-1]["end"]
+
+
+_encoding = None
+
+
+def get_encoding():
+    """
+    Return the tiktoken encoding selected by settings.transcript_encoding
+    """
+    global _encoding
+    if _encoding is None:
+        import tiktoken
+
+        _encoding = tiktoken.get_encoding(settings.transcript_encoding)
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Number of tokens in a piece of text
+    """
+    return len(get_encoding().encode_ordinary(text))
+
+
+def count_segment_tokens(segments: Sequence[Dict[str, Any]]) -> array:
+    """
+    Token count of every segment, encoded in one batch across threads
+    """
+    encoded = get_encoding().encode_ordinary_batch([segment["text"] for segment in segments])
+    return array("I", (len(tokens) for tokens in encoded))
+
+
+# Transcripts do not change once written, so their token counts are kept for
+# the next consumer (digest, generators, rate limiting) instead of re-encoding
+_token_counts: "OrderedDict[int, array]" = OrderedDict()
+_token_counts_lock = threading.Lock()
+TOKEN_COUNT_CACHE_SIZE = 32
+
+
+def get_segment_token_counts(transcript_id: int, segments: Sequence[Dict[str, Any]]) -> array:
+    """
+    count_segment_tokens() for the segments of a stored transcript, cached by
+    transcript id
+    """
+    with _token_counts_lock:
+        counts = _token_counts.get(transcript_id)
+        if counts is not None and len(counts) == len(segments):
+            _token_counts.move_to_end(transcript_id)
+            return counts
+    counts = count_segment_tokens(segments)
+    with _token_counts_lock:
+        _token_counts[transcript_id] = counts
+        while len(_token_counts) > TOKEN_COUNT_CACHE_SIZE:
+            _token_counts.popitem(last=False)
+    return counts
+
+
+def chunk_transcript_segments(
+    segments: Sequence[Dict[str, Any]],
+    token_counts: Sequence[int],
+    max_tokens: int,
+    overlap_tokens: int = 0
+) -> List[TranscriptChunk]:
+    """
+    Split transcript segments into chunks of at most max_tokens, overlap included.
+
+    Segments are never split; one longer than the budget gets a chunk of its
+    own. A chunk ends at the last change of speaker in its second half when
+    there is one, so a speaker's turn is not cut in the middle. Each chunk
+    after the first starts with up to overlap_tokens of the previous one.
+    """
+    offsets = [0]
+    for count in token_counts:
+        offsets.append(offsets[-1] + count)
+
+    def tokens(first: int, last: int) -> int:
+        return offsets[last] - offsets[first]
+
+    chunks = []
+    context = begin = 0
+    while begin < len(segments):
+        end = begin + 1
+        while end < len(segments) and tokens(context, end + 1) <= max_tokens:
+            end += 1
+        if end < len(segments):
+            for cut in range(end - 1, begin, -1):
+                if tokens(context, cut) < max_tokens // 2:
+                    break
+                if segments[cut].get("speaker") != segments[cut - 1].get("speaker"):
+                    end = cut
+                    break
+        chunks.append(TranscriptChunk(
+            segments=list(segments[context:end]),
+            token_count=tokens(context, end),
+            overlap_segments=begin - context,
+            overlap_tokens=tokens(context, begin)
+        ))
+        context = end
+        while context > begin and tokens(context - 1, end) <= overlap_tokens:
+            context -= 1
+        begin = end
+    return chunks
+
+
+def chunk_transcript(
+    db: Session,
+    transcript_id: int,
+    max_tokens: Optional[int] = None,
+    overlap_tokens: Optional[int] = None
+) -> List[TranscriptChunk]:
+    """
+    Chunk a stored transcript by its segments (see chunk_transcript_segments).
+    Transcripts saved before segments were stored are chunked as one segment.
+    """
+    if max_tokens is None:
+        max_tokens = settings.transcript_chunk_tokens
+    if overlap_tokens is None:
+        overlap_tokens = settings.transcript_chunk_overlap_tokens
+    segments = list(iter_transcript_segments(db, transcript_id))
+    if not segments:
+        text = db.query(Transcript.text).filter(Transcript.id == transcript_id).scalar()
+        segments = [{"start": 0.0, "end": 0.0, "text": text, "speaker": None}]
+    token_counts = get_segment_token_counts(transcript_id, segments)
+    return chunk_transcript_segments(segments, token_counts, max_tokens, overlap_tokens)
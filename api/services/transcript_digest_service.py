@@ -0,0 +1,55 @@
+import asyncio
+import heapq
+from typing import Any, Dict, List, Optional
+from config import settings
+from api.services.content_generation_service import content_generation_service
+from api.services.transcript_chunking_service import TranscriptChunk
+
+
+def reduce_chunk_summaries(summaries: List[Dict[str, Any]], max_quotes: int = 10) -> Dict[str, Any]:
+    """
+    Merge per-chunk summaries, in transcript order, into the episode digest:
+
+        summary      the chunk summaries joined
+        topics       one {"time", "topic"} per chunk
+        quotes       the longest quotable lines, in transcript order
+        speakers     {"speaker", "words"} by words spoken, most first
+        token_count  tokens of the whole transcript
+    """
+    speakers: Dict[str, int] = {}
+    quotes = []
+    for summary in summaries:
+        for speaker, words in summary["speakers"].items():
+            speakers[speaker] = speakers.get(speaker, 0) + words
+        quotes.extend(summary["quotes"])
+    quotes = heapq.nlargest(max_quotes, enumerate(quotes), key=lambda quote: len(quote[1]["text"]))
+    return {
+        "summary": " ".join(summary["summary"] for summary in summaries if summary["summary"]),
+        "topics": [{"time": summary["time"], "topic": summary["topic"]} for summary in summaries],
+        "quotes": [quote for _, quote in sorted(quotes, key=lambda quote: quote[0])],
+        "speakers": [
+            {"speaker": speaker, "words": words}
+            for speaker, words in sorted(speakers.items(), key=lambda item: -item[1])
+        ],
+        "token_count": sum(summary["token_count"] for summary in summaries)
+    }
+
+
+async def build_transcript_digest(chunks: List[TranscriptChunk], max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Analyze a transcript once for every content generator: summarize its
+    chunks (see chunk_transcript) in parallel (map), then merge the summaries
+    into one small digest (reduce). Generators read the digest instead of the
+    full transcript.
+    """
+    if max_concurrency is None:
+        max_concurrency = settings.content_generation_concurrency
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def summarize(chunk: TranscriptChunk) -> Dict[str, Any]:
+        async with semaphore:
+            summary = await content_generation_service.summarize_transcript_chunk(chunk.segments, chunk.overlap_segments)
+        return {**summary, "token_count": chunk.token_count - chunk.overlap_tokens}
+
+    summaries = await asyncio.gather(*(summarize(chunk) for chunk in chunks))
+    return reduce_chunk_summaries(list(summaries))
@@ -0,0 +1,192 @@
+import json
+from sqlalchemy import delete, insert, literal, select, update
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, List, Optional
+from api.models import Transcript, TranscriptSegment
+from api.services.search_service import delete_source_document
+from config import settings
+
+
+def _segment_row(transcript_id: int, position: int, segment: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "transcript_id": transcript_id,
+        "position": position,
+        "start": segment["start"],
+        "end": segment["end"],
+        "speaker": segment.get("speaker"),
+        "text": segment["text"]
+    }
+
+
+def _segment_dict(row: TranscriptSegment) -> Dict[str, Any]:
+    return {"start": row.start, "end": row.end, "text": row.text, "speaker": row.speaker}
+
+
+def bulk_insert_segments(db: Session, transcript_id: int, segments: List[Dict[str, Any]], start_position: int = 0) -> None:
+    """
+    Insert transcript segments with a single executemany; the caller commits
+    """
+    if not segments:
+        return
+    db.execute(
+        insert(TranscriptSegment),
+        [_segment_row(transcript_id, start_position + i, segment) for i, segment in enumerate(segments)]
+    )
+
+
+def copy_transcript_segments(db: Session, source_transcript_id: int, target_transcript_id: int) -> None:
+    """
+    Copy all segments of one transcript to another inside the database
+    """
+    db.execute(
+        insert(TranscriptSegment).from_select(
+            ["transcript_id", "position", "start", "end", "speaker", "text"],
+            select(
+                literal(target_transcript_id),
+                TranscriptSegment.position,
+                TranscriptSegment.start,
+                TranscriptSegment.end,
+                TranscriptSegment.speaker,
+                TranscriptSegment.text
+            ).where(TranscriptSegment.transcript_id == source_transcript_id)
+        )
+    )
+    db.commit()
+
+
+def get_segments_in_range(db: Session, transcript_id: int, start: float, end: float) -> List[Dict[str, Any]]:
+    """
+    Get the segments overlapping [start, end) seconds, in order
+    """
+    rows = db.query(TranscriptSegment).filter(
+        TranscriptSegment.transcript_id == transcript_id,
+        TranscriptSegment.start < end,
+        TranscriptSegment.end > start
+    ).order_by(TranscriptSegment.start).all()
+    return [_segment_dict(row) for row in rows]
+
+
+def get_segments_by_speaker(db: Session, transcript_id: int, speaker: str) -> List[Dict[str, Any]]:
+    """
+    Get every segment spoken by one speaker, in order
+    """
+    rows = db.query(TranscriptSegment).filter(
+        TranscriptSegment.transcript_id == transcript_id,
+        TranscriptSegment.speaker == speaker
+    ).order_by(TranscriptSegment.start).all()
+    return [_segment_dict(row) for row in rows]
+
+
+def iter_transcript_segments(db: Session, transcript_id: int, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over all segments of a transcript in order, one page of rows at a time
+    """
+    position = -1
+    while True:
+        rows = db.query(TranscriptSegment).filter(
+            TranscriptSegment.transcript_id == transcript_id,
+            TranscriptSegment.position > position
+        ).order_by(TranscriptSegment.position).limit(batch_size).all()
+        for row in rows:
+            yield _segment_dict(row)
+        if len(rows) < batch_size:
+            return
+        position = rows[-1].position
+
+
+class TranscriptWriter:
+    """
+    Persist a transcript in batches while its segments are still arriving.
+    
+    Each flush bulk-inserts the batch into transcript_segments and appends its
+    text to the transcript row with a single UPDATE, so the full text is never
+    rebuilt in worker memory.
+    """
+    
+    def __init__(self, db: Session, episode_id: int, batch_size: Optional[int] = None):
+        self.db = db
+        self.episode_id = episode_id
+        self.batch_size = batch_size or settings.transcript_flush_batch_size
+        self.transcript_id: Optional[int] = None
+        self.pending: List[Dict[str, Any]] = []
+        self.position = 0
+        self.speakers: List[str] = []
+        self.has_text = False
+    
+    def start(self) -> Transcript:
+        """
+        Create the empty transcript row that batches are appended to
+        """
+        transcript = Transcript(episode_id=self.episode_id, text="", word_count=0)
+        self.db.add(transcript)
+        self.db.commit()
+        self.transcript_id = transcript.id
+        return transcript
+    
+    def add(self, segment: Dict[str, Any]) -> None:
+        """
+        Queue a segment, flushing once a full batch is pending
+        """
+        if self.transcript_id is None:
+            self.start()
+        self.pending.append(segment)
+        speaker = segment.get("speaker")
+        if speaker and speaker not in self.speakers:
+            self.speakers.append(speaker)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+    
+    def flush(self) -> None:
+        """
+        Write the pending segments and append their text to the transcript row
+        """
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        
+        text = " ".join(segment["text"] for segment in batch)
+        if self.has_text:
+            text = f" {text}"
+        self.has_text = True
+        
+        bulk_insert_segments(self.db, self.transcript_id, batch, start_position=self.position)
+        self.position += len(batch)
+        self.db.execute(
+            update(Transcript)
+            .where(Transcript.id == self.transcript_id)
+            .values(
+                text=Transcript.text + text,
+                word_count=Transcript.word_count + sum(len(segment["text"].split()) for segment in batch)
+            )
+        )
+        self.db.commit()
+    
+    def discard(self) -> None:
+        """
+        Delete the partial transcript after a failed transcription, so a retry
+        starts from a clean slate
+        """
+        self.db.rollback()
+        if self.transcript_id is None:
+            return
+        self.db.execute(delete(TranscriptSegment).where(TranscriptSegment.transcript_id == self.transcript_id))
+        delete_source_document(self.db, "transcript", self.transcript_id)
+        self.db.execute(delete(Transcript).where(Transcript.id == self.transcript_id))
+        self.db.commit()
+        self.transcript_id = None
+        self.pending = []
+    
+    def finish(self) -> Transcript:
+        """
+        Flush the remaining segments, record the speakers and return the row
+        """
+        if self.transcript_id is None:
+            self.start()
+        self.flush()
+        self.db.execute(
+            update(Transcript)
+            .where(Transcript.id == self.transcript_id)
+            .values(speakers_json=json.dumps(self.speakers))
+        )
+        self.db.commit()
+        return self.db.query(Transcript).filter(Transcript.id == self.transcript_id).first()
@@ -0,0 +1,322 @@
+import asyncio
+import re
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from api.services.transcription_providers import TranscriptionProvider
+
+
+def detect_silences(audio_path: str, min_silence_ms: int = 700, silence_thresh_db: int = -40) -> Tuple[float, List[Tuple[float, float]]]:
+    """
+    Return the duration of a local audio file and its silent stretches, in seconds
+    """
+    from pydub import AudioSegment
+    from pydub.silence import detect_silence
+
+    audio = AudioSegment.from_file(audio_path)
+    silences = detect_silence(audio, min_silence_len=min_silence_ms, silence_thresh=silence_thresh_db)
+    return len(audio) / 1000, [(start / 1000, end / 1000) for start, end in silences]
+
+
+def probe_duration(audio_url: str) -> Optional[float]:
+    """
+    Return the duration of audio at a path or URL in seconds, as ffprobe reads
+    it from the container, or None when it cannot be determined. Remote audio
+    is not downloaded in full.
+    """
+    from pydub.utils import mediainfo
+
+    try:
+        duration = mediainfo(audio_url).get("duration")
+        return float(duration) if duration else None
+    except (OSError, ValueError) as e:
+        print(f"Could not probe the duration of {audio_url}: {e}")
+        return None
+
+
+def plan_cut_points(
+    duration: float,
+    window_seconds: float,
+    silences: Optional[List[Tuple[float, float]]] = None,
+    search_seconds: Optional[float] = None
+) -> List[float]:
+    """
+    Choose where to cut the audio: roughly every window_seconds, moved to the
+    middle of the nearest silence within search_seconds so that no word is split.
+    Returns the cut points including 0 and duration.
+    """
+    if search_seconds is None:
+        search_seconds = window_seconds * 0.15
+    silence_midpoints = sorted((start + end) / 2 for start, end in silences or [])
+
+    cuts = [0.0]
+    target = window_seconds
+    while target < duration - window_seconds * 0.25:
+        nearby = [m for m in silence_midpoints if abs(m - target) <= search_seconds and m > cuts[-1]]
+        cut = min(nearby, key=lambda m: abs(m - target)) if nearby else target
+        cuts.append(cut)
+        target = cut + window_seconds
+    cuts.append(duration)
+    return cuts
+
+
+def plan_windows(cuts: List[float], overlap_seconds: float) -> List[Tuple[float, float]]:
+    """
+    Turn cut points into overlapping transcription windows. Each window extends
+    half the overlap past its cuts so words at the boundary are heard twice.
+    """
+    half = overlap_seconds / 2
+    return [
+        (max(cuts[0], cuts[i] - half), min(cuts[-1], cuts[i + 1] + half))
+        for i in range(len(cuts) - 1)
+    ]
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^\w']", "", text.lower())
+
+
+def _overlap_matches(previous: List[Dict[str, Any]], current: List[Dict[str, Any]], tolerance: float) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Pair up the same spoken word as heard by two adjacent windows
+    """
+    matches = []
+    j = 0
+    for word in previous:
+        while j < len(current) and current[j]["start"] < word["start"] - tolerance:
+            j += 1
+        k = j
+        while k < len(current) and current[k]["start"] <= word["start"] + tolerance:
+            if _normalize(current[k]["text"]) == _normalize(word["text"]):
+                matches.append((word, current[k]))
+                break
+            k += 1
+    return matches
+
+
+def _reconcile_speakers(
+    previous_words: List[Dict[str, Any]],
+    window_words: List[Dict[str, Any]],
+    overlap: Tuple[float, float],
+    next_speaker_number: int,
+    tolerance: float
+) -> Tuple[Dict[str, str], int]:
+    """
+    Map a window's local speaker labels onto the global labels of the previous
+    window by voting over the words both windows transcribed in their overlap.
+    Labels that cannot be matched become new speakers.
+    """
+    in_overlap = lambda w: overlap[0] <= w["start"] < overlap[1]
+    votes = Counter(
+        (local["speaker"], known["speaker"])
+        for known, local in _overlap_matches(
+            [w for w in previous_words if in_overlap(w)],
+            [w for w in window_words if in_overlap(w)],
+            tolerance
+        )
+    )
+
+    mapping: Dict[str, str] = {}
+    used = set()
+    for (local, known), _ in votes.most_common():
+        if local not in mapping and known not in used:
+            mapping[local] = known
+            used.add(known)
+
+    for word in window_words:
+        if word["speaker"] not in mapping:
+            mapping[word["speaker"]] = f"Speaker {next_speaker_number}"
+            next_speaker_number += 1
+    return mapping, next_speaker_number
+
+
+class WindowStitcher:
+    """
+    Incrementally stitch per-window provider results into one ordered word list.
+
+    Results must be added in window order. Timestamps are shifted back to
+    absolute time, each boundary keeps the words centred before the cut from the
+    earlier window and the rest from the later one, duplicates straddling a cut
+    are dropped, and speaker labels are made consistent across windows.
+    """
+
+    def __init__(self, windows: List[Tuple[float, float]], cuts: List[float], tolerance: float = 0.5):
+        self.windows = windows
+        self.cuts = cuts
+        self.tolerance = tolerance
+        self.index = 0
+        self.previous_words: List[Dict[str, Any]] = []
+        self.last_word: Optional[Dict[str, Any]] = None
+        self.next_speaker_number = 1
+
+    def add(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Add the next window's result and return the words it contributes
+        """
+        i = self.index
+        window_start, window_end = self.windows[i]
+        words = [
+            {**word, "start": word["start"] + window_start, "end": word["end"] + window_start}
+            for word in result.get("words", [])
+        ]
+        words.sort(key=lambda w: w["start"])
+
+        overlap = (window_start, self.windows[i - 1][1]) if i > 0 else (window_start, window_start)
+        mapping, self.next_speaker_number = _reconcile_speakers(
+            self.previous_words, words, overlap, self.next_speaker_number, self.tolerance
+        )
+
+        kept = []
+        keep_from, keep_until = self.cuts[i], self.cuts[i + 1]
+        for word in words:
+            midpoint = (word["start"] + word["end"]) / 2
+            if midpoint < keep_from and i > 0:
+                continue
+            if midpoint >= keep_until and i < len(self.windows) - 1:
+                continue
+            word = {**word, "speaker": mapping[word["speaker"]]}
+            last = self.last_word
+            if last and _normalize(last["text"]) == _normalize(word["text"]) and abs(last["start"] - word["start"]) <= self.tolerance:
+                continue
+            kept.append(word)
+            self.last_word = word
+
+        self.previous_words = [{**word, "speaker": mapping[word["speaker"]]} for word in words]
+        self.index += 1
+        return kept
+
+
+def merge_window_transcripts(
+    windows: List[Tuple[float, float]],
+    cuts: List[float],
+    results: List[Dict[str, Any]],
+    tolerance: float = 0.5
+) -> List[Dict[str, Any]]:
+    """
+    Stitch all per-window provider results into one ordered word list
+    """
+    stitcher = WindowStitcher(windows, cuts, tolerance)
+    merged: List[Dict[str, Any]] = []
+    for result in results:
+        merged.extend(stitcher.add(result))
+    return merged
+
+
+class SegmentBuilder:
+    """
+    Incrementally group consecutive words into segments at speaker changes and
+    long pauses. add() returns the segments that can no longer grow.
+    """
+
+    def __init__(self, max_pause_seconds: float = 2.0):
+        self.max_pause_seconds = max_pause_seconds
+        self.current: Optional[Dict[str, Any]] = None
+
+    def add(self, words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        closed = []
+        for word in words:
+            current = self.current
+            if (
+                current is None
+                or current["speaker"] != word["speaker"]
+                or word["start"] - current["end"] > self.max_pause_seconds
+            ):
+                if current is not None:
+                    closed.append(current)
+                self.current = {
+                    "start": word["start"],
+                    "end": word["end"],
+                    "text": word["text"],
+                    "speaker": word["speaker"]
+                }
+            else:
+                current["end"] = word["end"]
+                current["text"] = f"{current['text']} {word['text']}"
+        return closed
+
+    def finish(self) -> List[Dict[str, Any]]:
+        closed = [self.current] if self.current is not None else []
+        self.current = None
+        return closed
+
+
+def build_segments(words: List[Dict[str, Any]], max_pause_seconds: float = 2.0) -> List[Dict[str, Any]]:
+    """
+    Group consecutive words into segments at speaker changes and long pauses
+    """
+    builder = SegmentBuilder(max_pause_seconds)
+    return builder.add(words) + builder.finish()
+
+
+def build_transcript(words: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Assemble the transcript dict returned by TranscriptionService from words
+    """
+    segments = build_segments(words)
+    speakers = list(dict.fromkeys(segment["speaker"] for segment in segments))
+    confidence = sum(word.get("confidence", 1.0) for word in words) / len(words) if words else 0.0
+    return {
+        "text": " ".join(word["text"] for word in words),
+        "segments": segments,
+        "speakers": speakers,
+        "word_count": len(words),
+        "confidence": confidence
+    }
+
+
+async def stream_windowed_segments(
+    provider: TranscriptionProvider,
+    audio_url: str,
+    duration: float,
+    window_seconds: float,
+    overlap_seconds: float,
+    max_concurrency: int,
+    silences: Optional[List[Tuple[float, float]]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Transcribe long audio as overlapping windows in parallel, yielding finished
+    segments in order as soon as every window up to them has been stitched
+    """
+    cuts = plan_cut_points(duration, window_seconds, silences)
+    windows = plan_windows(cuts, overlap_seconds)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def transcribe(window: Tuple[float, float]) -> Dict[str, Any]:
+        async with semaphore:
+            return await provider.transcribe_window(audio_url, window[0], window[1])
+
+    tasks = [asyncio.ensure_future(transcribe(window)) for window in windows]
+    stitcher = WindowStitcher(windows, cuts)
+    builder = SegmentBuilder()
+    try:
+        for task in tasks:
+            for segment in builder.add(stitcher.add(await task)):
+                yield segment
+        for segment in builder.finish():
+            yield segment
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def transcribe_in_windows(
+    provider: TranscriptionProvider,
+    audio_url: str,
+    duration: float,
+    window_seconds: float,
+    overlap_seconds: float,
+    max_concurrency: int,
+    silences: Optional[List[Tuple[float, float]]] = None
+) -> Dict[str, Any]:
+    """
+    Transcribe long audio as overlapping windows in parallel and stitch the result
+    """
+    cuts = plan_cut_points(duration, window_seconds, silences)
+    windows = plan_windows(cuts, overlap_seconds)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def transcribe(window: Tuple[float, float]) -> Dict[str, Any]:
+        async with semaphore:
+            return await provider.transcribe_window(audio_url, window[0], window[1])
+
+    results = await asyncio.gather(*(transcribe(window) for window in windows))
+    return build_transcript(merge_window_transcripts(windows, cuts, list(results)))
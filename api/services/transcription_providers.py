@@ -0,0 +1,147 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+import httpx
+from config import settings
+from api.services.http_clients import get_http_client
+
+
+class TranscriptionProviderError(RuntimeError):
+    """
+    The provider failed to transcribe a window, or did not finish in time
+    """
+    pass
+
+
+class TranscriptionProvider:
+    """
+    Interface for speech-to-text backends.
+
+    transcribe_window() transcribes the [start, end) slice of the audio (in
+    seconds) and returns {"words": [...]}, where each word is a dict with
+    "text", "start", "end", "speaker" and "confidence". Timestamps are relative
+    to the start of the window and speaker labels only need to be consistent
+    within that one window.
+    """
+
+    async def transcribe_window(self, audio_url: str, start: float, end: Optional[float]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class AssemblyAIProvider(TranscriptionProvider):
+    """
+    AssemblyAI transcription; windows are requested with audio_start_from/audio_end_at
+    """
+
+    base_url = "https://api.assemblyai.com/v2"
+
+    def __init__(
+        self,
+        api_key: str,
+        poll_interval_seconds: float = 3.0,
+        client: Optional[httpx.AsyncClient] = None,
+        poll_timeout_seconds: Optional[float] = None
+    ):
+        self.api_key = api_key
+        self.poll_interval_seconds = poll_interval_seconds
+        self.client = client
+        self.poll_timeout_seconds = poll_timeout_seconds or settings.assemblyai_poll_timeout_seconds
+
+    async def transcribe_window(self, audio_url: str, start: float, end: Optional[float]) -> Dict[str, Any]:
+        request = {"audio_url": audio_url, "speaker_labels": True}
+        if start > 0:
+            request["audio_start_from"] = int(start * 1000)
+        if end is not None:
+            request["audio_end_at"] = int(end * 1000)
+
+        headers = {"authorization": self.api_key}
+        # The shared pool keeps connections to the API open between windows and tasks
+        client = self.client or get_http_client("transcription")
+        response = await client.post(f"{self.base_url}/transcript", json=request, headers=headers)
+        response.raise_for_status()
+        transcript_id = response.json()["id"]
+
+        # A job stuck in the provider's queue must not hold the window forever
+        deadline = time.monotonic() + self.poll_timeout_seconds
+        while True:
+            response = await client.get(f"{self.base_url}/transcript/{transcript_id}", headers=headers)
+            response.raise_for_status()
+            result = response.json()
+            if result["status"] == "completed":
+                break
+            if result["status"] == "error":
+                raise TranscriptionProviderError(f"AssemblyAI transcription failed: {result.get('error')}")
+            if time.monotonic() >= deadline:
+                raise TranscriptionProviderError(
+                    f"AssemblyAI transcription {transcript_id} not done after {self.poll_timeout_seconds}s "
+                    f"(status {result['status']})"
+                )
+            await asyncio.sleep(self.poll_interval_seconds)
+
+        # AssemblyAI reports millisecond offsets into the original file
+        return {
+            "words": [
+                {
+                    "text": word["text"],
+                    "start": word["start"] / 1000 - start,
+                    "end": word["end"] / 1000 - start,
+                    "speaker": word.get("speaker") or "A",
+                    "confidence": word.get("confidence", 1.0)
+                }
+                for word in result.get("words") or []
+            ]
+        }
+
+
+class LocalTranscriptionProvider(TranscriptionProvider):
+    """
+    Offline stand-in that "transcribes" from a known word list.
+
+    Words are given with absolute timestamps and true speakers. Each window
+    returns the words it overlaps, re-based to the window start and with
+    speakers relabelled per window (A, B, ... in order of appearance), the way a
+    real diarizing provider treats every request independently.
+    """
+
+    def __init__(self, words: List[Dict[str, Any]], latency_seconds: float = 0.0):
+        self.words = sorted(words, key=lambda word: word["start"])
+        self.latency_seconds = latency_seconds
+        self.calls: List[tuple] = []
+        self.active = 0
+        self.max_active = 0  # Most windows in flight at once
+
+    async def transcribe_window(self, audio_url: str, start: float, end: Optional[float]) -> Dict[str, Any]:
+        self.calls.append((start, end))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.latency_seconds:
+                await asyncio.sleep(self.latency_seconds)
+        finally:
+            self.active -= 1
+
+        labels: Dict[str, str] = {}
+        words = []
+        for word in self.words:
+            if word["end"] <= start or (end is not None and word["start"] >= end):
+                continue
+            speaker = word.get("speaker", "Speaker 1")
+            if speaker not in labels:
+                labels[speaker] = chr(ord("A") + len(labels))
+            words.append({
+                "text": word["text"],
+                "start": word["start"] - start,
+                "end": word["end"] - start,
+                "speaker": labels[speaker],
+                "confidence": word.get("confidence", 1.0)
+            })
+        return {"words": words}
+
+
+def build_transcription_provider() -> Optional[TranscriptionProvider]:
+    """
+    Pick the transcription provider for the configured API keys
+    """
+    if settings.assemblyai_api_key:
+        return AssemblyAIProvider(settings.assemblyai_api_key)
+    return None
@@ -1,5 +1,18 @@
-from typing import Dict, Any, Optional
+import asyncio
+import os
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from config import settings
+from api.services.storage_service import get_storage_backend
+from api.services.transcription_providers import TranscriptionProvider, build_transcription_provider
+from api.services.transcription_chunking import (
+    build_transcript,
+    detect_silences,
+    probe_duration,
+    build_segments,
+    merge_window_transcripts,
+    stream_windowed_segments,
+    transcribe_in_windows
+)
 
 
 class TranscriptionService:
@@ -7,15 +20,33 @@ class TranscriptionService:
     Service for handling audio transcription using external APIs like AssemblyAI or OpenAI Whisper
     """
     
-    def __init__(self):
+    def __init__(self, provider: Optional[TranscriptionProvider] = None):
         self.api_key = settings.assemblyai_api_key or settings.openai_api_key
-        # Initialize the appropriate client based on available API keys
+        self.provider = provider or build_transcription_provider()
     
-    async def transcribe_audio(self, audio_url: str) -> Dict[str, Any]:
+    async def transcribe_audio(self, audio_url: str, duration: Optional[float] = None) -> Dict[str, Any]:
         """
-        Transcribe audio file and return transcript with metadata
+        Transcribe audio file and return transcript with metadata.
+        
+        Audio longer than transcription_chunk_threshold_seconds is split at
+        silences into overlapping windows that are transcribed concurrently.
         """
-        # This is a placeholder implementation
+        if self.provider is not None:
+            duration, silences = await self.probe_audio(audio_url, duration)
+            if self._is_long(duration):
+                return await transcribe_in_windows(
+                    self.provider,
+                    audio_url,
+                    duration,
+                    window_seconds=settings.transcription_window_seconds,
+                    overlap_seconds=settings.transcription_window_overlap_seconds,
+                    max_concurrency=settings.transcription_concurrency,
+                    silences=silences
+                )
+            
+            return build_transcript(await self._transcribe_whole_file(audio_url))
+        
+        # No provider configured: this is a placeholder implementation
         # In a real implementation, this would call the transcription API
         return {
             "text": "This is a placeholder transcript. In a real implementation, this would be the actual transcription of the audio file.",
@@ -32,6 +63,66 @@ class TranscriptionService:
             "confidence": 0.95
         }
     
+    async def stream_segments(
+        self,
+        audio_url: str,
+        duration: Optional[float] = None,
+        silences: Optional[List[Tuple[float, float]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield transcript segments in order as soon as they are final, so callers
+        can persist and analyse the transcript while long audio is still being
+        transcribed. Pass the silences from an earlier probe_audio() to skip
+        probing the audio again.
+        """
+        if self.provider is None:
+            transcript = await self.transcribe_audio(audio_url, duration)
+            for segment in transcript["segments"]:
+                yield segment
+            return
+        
+        if silences is None:
+            duration, silences = await self.probe_audio(audio_url, duration)
+        if self._is_long(duration):
+            async for segment in stream_windowed_segments(
+                self.provider,
+                audio_url,
+                duration,
+                window_seconds=settings.transcription_window_seconds,
+                overlap_seconds=settings.transcription_window_overlap_seconds,
+                max_concurrency=settings.transcription_concurrency,
+                silences=silences
+            ):
+                yield segment
+            return
+        
+        for segment in build_segments(await self._transcribe_whole_file(audio_url)):
+            yield segment
+    
+    async def probe_audio(self, audio_url: str, duration: Optional[float] = None) -> Tuple[Optional[float], Optional[List[Tuple[float, float]]]]:
+        """
+        Measure duration and silences of the audio when chunking may apply.
+        Local files are decoded to find silences to cut at; for stored or
+        remote audio only the duration is probed, and long audio is then cut
+        at fixed window offsets. Without a provider nothing is chunked, so
+        nothing is probed.
+        """
+        if self.provider is None or (duration is not None and not self._is_long(duration)):
+            return duration, None
+        if os.path.exists(audio_url):
+            return await asyncio.to_thread(detect_silences, audio_url)
+        if duration is None:
+            duration = await asyncio.to_thread(probe_duration, get_storage_backend().get_read_url(audio_url))
+        return duration, None
+    
+    def _is_long(self, duration: Optional[float]) -> bool:
+        return duration is not None and duration > settings.transcription_chunk_threshold_seconds
+    
+    async def _transcribe_whole_file(self, audio_url: str) -> List[Dict[str, Any]]:
+        result = await self.provider.transcribe_window(audio_url, 0, None)
+        whole_file = (0.0, float("inf"))
+        return merge_window_transcripts([whole_file], list(whole_file), [result])
+    
     async def get_transcription_status(self, transcript_id: str) -> str:
         """
         Get the status of a transcription job
@@ -0,0 +1,238 @@
+import math
+import uuid
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional
+from api.models import UploadSession, UploadPart
+from api.schemas import UploadSessionCreate, EpisodeCreate
+from api.services.episode_service import create_episode_with_processing_job_async
+from api.services.storage_service import (
+    StoredObject,
+    get_storage_backend,
+    save_upload_stream,
+    concat_objects,
+    generate_unique_filename
+)
+from config import settings
+
+
+class InvalidUploadPartError(Exception):
+    """
+    Raised when a part does not fit the upload session it was sent to
+    """
+    pass
+
+
+async def create_upload_session_async(db: AsyncSession, upload: UploadSessionCreate, user_id: int):
+    """
+    Start a resumable upload; the file is later sent as numbered parts
+    """
+    chunk_size = settings.resumable_upload_part_size_bytes
+    db_session = UploadSession(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        title=upload.title,
+        original_filename=upload.filename,
+        content_type=upload.content_type,
+        storage_key=generate_unique_filename(upload.filename),
+        total_size=upload.total_size,
+        chunk_size=chunk_size,
+        total_parts=max(1, math.ceil(upload.total_size / chunk_size)),
+        status="active",
+        generate_blog=upload.generate_blog,
+        generate_social=upload.generate_social,
+        generate_newsletter=upload.generate_newsletter,
+        generate_show_notes=upload.generate_show_notes,
+        generate_quote_graphics=upload.generate_quote_graphics
+    )
+    
+    db.add(db_session)
+    await db.commit()
+    await db.refresh(db_session)
+    
+    return db_session
+
+
+async def get_upload_session_async(db: AsyncSession, upload_id: str, user_id: int) -> Optional[UploadSession]:
+    """
+    Get an upload session by ID for a specific user
+    """
+    result = await db.execute(select(UploadSession).where(
+        UploadSession.id == upload_id,
+        UploadSession.user_id == user_id
+    ))
+    return result.scalars().first()
+
+
+async def get_upload_parts_async(db: AsyncSession, upload_id: str) -> List[UploadPart]:
+    """
+    Get the parts received so far for an upload, in part order
+    """
+    result = await db.execute(
+        select(UploadPart).where(UploadPart.upload_id == upload_id).order_by(UploadPart.part_number)
+    )
+    return list(result.scalars())
+
+
+def get_expected_part_size(upload_session: UploadSession, part_number: int) -> int:
+    """
+    Every part is chunk_size bytes except the last, which holds the remainder
+    """
+    if part_number < 1 or part_number > upload_session.total_parts:
+        raise InvalidUploadPartError(
+            f"Part number must be between 1 and {upload_session.total_parts}"
+        )
+    if part_number < upload_session.total_parts:
+        return upload_session.chunk_size
+    return upload_session.total_size - upload_session.chunk_size * (upload_session.total_parts - 1)
+
+
+def get_part_key(upload_session: UploadSession, part_number: int) -> str:
+    """
+    Storage key a part is kept under until the upload is assembled
+    """
+    return f"{upload_session.storage_key}.parts/{part_number:05d}"
+
+
+async def store_upload_part(upload_session: UploadSession, part_number: int, chunks: AsyncIterator[bytes]) -> StoredObject:
+    """
+    Stream one part into storage. Re-sending a part overwrites the earlier copy,
+    so clients can retry failed parts independently and in any order.
+    """
+    expected_size = get_expected_part_size(upload_session, part_number)
+    key = get_part_key(upload_session, part_number)
+    
+    stored = await save_upload_stream(chunks, key, max_size=expected_size)
+    if stored.size != expected_size:
+        await get_storage_backend().delete(key)
+        raise InvalidUploadPartError(
+            f"Part {part_number} must be {expected_size} bytes, received {stored.size}"
+        )
+    return stored
+
+
+async def record_upload_part_async(db: AsyncSession, upload_session: UploadSession, part_number: int, stored: StoredObject):
+    """
+    Record a received part, replacing any earlier attempt at the same part
+    """
+    async def upsert():
+        result = await db.execute(select(UploadPart).where(
+            UploadPart.upload_id == upload_session.id,
+            UploadPart.part_number == part_number
+        ))
+        part = result.scalars().first()
+        if part is None:
+            part = UploadPart(upload_id=upload_session.id, part_number=part_number)
+            db.add(part)
+        part.size = stored.size
+        part.sha256 = stored.sha256
+        await db.commit()
+        return part
+    
+    try:
+        part = await upsert()
+    except IntegrityError:
+        # A concurrent retry of the same part inserted first; update its row instead
+        await db.rollback()
+        part = await upsert()
+    
+    await db.refresh(part)
+    return part
+
+
+def get_missing_parts(upload_session: UploadSession, parts: List[UploadPart]) -> List[int]:
+    """
+    Part numbers that still have to be uploaded
+    """
+    received = {part.part_number for part in parts}
+    return [n for n in range(1, upload_session.total_parts + 1) if n not in received]
+
+
+async def claim_upload_session_async(db: AsyncSession, upload_session: UploadSession) -> bool:
+    """
+    Atomically move an active upload to "completing" so only one request
+    assembles it. Returns False when another request got there first.
+    """
+    result = await db.execute(
+        update(UploadSession)
+        .where(UploadSession.id == upload_session.id, UploadSession.status == "active")
+        .values(status="completing")
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    await db.refresh(upload_session)
+    return result.rowcount == 1
+
+
+async def release_upload_session_async(db: AsyncSession, upload_session: UploadSession):
+    """
+    Hand a claimed upload back to "active" after a failed completion so the
+    client can retry; the parts are still in storage
+    """
+    upload_id = upload_session.id
+    await db.rollback()
+    await db.execute(
+        update(UploadSession)
+        .where(UploadSession.id == upload_id, UploadSession.status == "completing")
+        .values(status="active")
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def assemble_upload(upload_session: UploadSession) -> StoredObject:
+    """
+    Concatenate all parts into the final object. The part objects are kept
+    until the upload is completed, so a failed completion can be retried.
+    """
+    part_keys = [get_part_key(upload_session, n) for n in range(1, upload_session.total_parts + 1)]
+    return await concat_objects(part_keys, upload_session.storage_key, max_size=upload_session.total_size)
+
+
+async def delete_upload_parts(upload_session: UploadSession) -> None:
+    """
+    Remove every part object of an upload from storage
+    """
+    backend = get_storage_backend()
+    for part_number in range(1, upload_session.total_parts + 1):
+        await backend.delete(get_part_key(upload_session, part_number))
+
+
+async def complete_upload_session_async(db: AsyncSession, upload_session: UploadSession, stored: StoredObject, file_format: str):
+    """
+    Create the episode and its processing job for an assembled upload and mark
+    the upload completed, all in one transaction
+    """
+    episode_data = EpisodeCreate(
+        user_id=upload_session.user_id,
+        title=upload_session.title,
+        audio_url=stored.url,
+        file_size=stored.size,
+        file_format=file_format,
+        content_hash=stored.sha256,
+        duration=None,  # To be calculated later
+        generate_blog=upload_session.generate_blog,
+        generate_social=upload_session.generate_social,
+        generate_newsletter=upload_session.generate_newsletter,
+        generate_show_notes=upload_session.generate_show_notes,
+        generate_quote_graphics=upload_session.generate_quote_graphics
+    )
+    db_episode = await create_episode_with_processing_job_async(db, episode_data, upload_session.user_id, commit=False)
+    
+    upload_session.status = "completed"
+    upload_session.episode_id = db_episode.id
+    await db.commit()
+    await db.refresh(db_episode)
+    
+    return db_episode
+
+
+async def abort_upload_session_async(db: AsyncSession, upload_session: UploadSession):
+    """
+    Mark an upload as aborted and forget its parts
+    """
+    await db.execute(delete(UploadPart).where(UploadPart.upload_id == upload_session.id))
+    upload_session.status = "aborted"
+    await db.commit()
+    return upload_session
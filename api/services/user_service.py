@@ -1,6 +1,8 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from api.models import User
-from api.utils import verify_password
+from api.utils import verify_and_update_password, verify_and_update_password_async
 
 
 def authenticate_user(db: Session, email: str, password: str):
@@ -10,8 +12,13 @@ def authenticate_user(db: Session, email: str, password: str):
     user = db.query(User).filter(User.email == email).first()
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return False
+    if new_hash:
+        # The hash used an outdated work factor; store it with the current one
+        user.hashed_password = new_hash
+        db.commit()
     return user
 
 
@@ -19,4 +26,29 @@ def get_user_by_email(db: Session, email: str):
     """
     Get a user by email
     """
-    return db.query(User).filter(User.email == email).first()
\ No newline at end of file
+    return db.query(User).filter(User.email == email).first()
+
+
+async def get_user_by_email_async(db: AsyncSession, email: str):
+    """
+    Get a user by email on an async session
+    """
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+
+async def authenticate_user_async(db: AsyncSession, email: str, password: str):
+    """
+    Authenticate a user by email and password on an async session
+    """
+    user = await get_user_by_email_async(db, email)
+    if not user:
+        return False
+    # bcrypt is deliberately slow; it runs on the password pool, off the event loop
+    valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not valid:
+        return False
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    return user
@@ -0,0 +1,91 @@
+import json
+from sqlalchemy.orm import Session
+from typing import Any, Dict
+from api.models import WorkflowCheckpoint
+
+
+class CheckpointStore:
+    """
+    Where a workflow records the outcome of its stages. This base store keeps
+    nothing, so every run starts from scratch.
+    """
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Return the output of every completed stage, keyed by stage name
+        """
+        return {}
+
+    def save(self, stage: str, output: Any) -> None:
+        pass
+
+    def fail(self, stage: str, error: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class DatabaseCheckpointStore(CheckpointStore):
+    """
+    Checkpoints of one workflow for one episode in the workflow_checkpoints
+    table. Stage outputs must be JSON serializable.
+    """
+
+    def __init__(self, db: Session, episode_id: int, workflow: str):
+        self.db = db
+        self.episode_id = episode_id
+        self.workflow = workflow
+        self.rows: Dict[str, WorkflowCheckpoint] = {}
+
+    def load(self) -> Dict[str, Any]:
+        self.rows = {
+            row.stage: row
+            for row in self.db.query(WorkflowCheckpoint).filter(
+                WorkflowCheckpoint.episode_id == self.episode_id,
+                WorkflowCheckpoint.workflow == self.workflow
+            )
+        }
+        return {
+            stage: json.loads(row.output_json) if row.output_json else None
+            for stage, row in self.rows.items()
+            if row.status == "completed"
+        }
+
+    def _row(self, stage: str) -> WorkflowCheckpoint:
+        row = self.rows.get(stage)
+        if row is None:
+            row = WorkflowCheckpoint(episode_id=self.episode_id, workflow=self.workflow, stage=stage, attempts=0)
+            self.rows[stage] = row
+        # Also re-adds a new row that a rollback detached again
+        self.db.add(row)
+        return row
+
+    def save(self, stage: str, output: Any) -> None:
+        row = self._row(stage)
+        row.status = "completed"
+        row.output_json = json.dumps(output)
+        row.error = None
+        row.attempts += 1
+        self.db.commit()
+
+    def fail(self, stage: str, error: str) -> None:
+        # The failed stage may have left the session mid-transaction. Stages
+        # that run concurrently keep their writes on sessions of their own, so
+        # this only discards the failed stage's work.
+        self.db.rollback()
+        row = self._row(stage)
+        row.status = "failed"
+        row.output_json = None
+        row.error = error
+        row.attempts += 1
+        self.db.commit()
+
+    def clear(self) -> None:
+        """
+        Forget every checkpoint once the workflow has finished. Not committed,
+        so it can share the transaction that records the final result.
+        """
+        for row in self.rows.values():
+            self.db.delete(row)
+        self.rows = {}
@@ -1,10 +1,24 @@
-from .password import verify_password, get_password_hash
-from .auth import create_access_token, verify_token, get_current_user
+from .password import (
+    verify_password,
+    get_password_hash,
+    verify_and_update_password,
+    verify_password_async,
+    get_password_hash_async,
+    verify_and_update_password_async,
+    shutdown_password_pool
+)
+from .auth import create_access_token, verify_token, get_current_user, get_current_user_async
 
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "verify_and_update_password",
+    "verify_password_async",
+    "get_password_hash_async",
+    "verify_and_update_password_async",
+    "shutdown_password_pool",
     "create_access_token",
     "verify_token",
-    "get_current_user"
+    "get_current_user",
+    "get_current_user_async"
 ]
\ No newline at end of file
@@ -2,10 +2,14 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
-from api.schemas import TokenData
+from fastapi.security import OAuth2PasswordBearer
+from api.schemas import TokenData, User as UserSchema
 from config import settings
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from api.services import get_user_by_email
+from api.services import user_service, principal_cache_service
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -32,15 +36,16 @@ def verify_token(token: str, credentials_exception: HTTPException):
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
+        token_data = TokenData(email=email, expires_at=payload.get("exp"))
     except JWTError:
         raise credentials_exception
     return token_data
 
 
-def get_current_user(token: str = None, db: Session = None):
+def _verify_request_token(token: Optional[str]):
     """
-    Get the current user from the token
+    Check that a token was sent and decode it, returning the token data and the
+    exception to raise when the user it names does not exist
     """
     if not token:
         raise HTTPException(
@@ -55,10 +60,47 @@ def get_current_user(token: str = None, db: Session = None):
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token_data = verify_token(token, credentials_exception)
-    user = get_user_by_email(db, email=token_data.email)
+    return verify_token(token, credentials_exception), credentials_exception
+
+
+def get_current_user(token: str = None, db: Session = None) -> UserSchema:
+    """
+    Get the current user from the token.
+    
+    The user is served from the principal cache when possible; only a miss
+    queries the database.
+    """
+    token_data, credentials_exception = _verify_request_token(token)
+    cache = principal_cache_service.get_principal_cache()
+    principal = cache.get(token_data.email)
+    if principal is not None:
+        return principal
+    
+    user = user_service.get_user_by_email(db, email=token_data.email)
+    
+    if user is None:
+        raise credentials_exception
+    
+    principal = UserSchema.model_validate(user)
+    cache.set(token_data.email, principal, principal_cache_service.get_principal_ttl(token_data.expires_at))
+    return principal
+
+
+async def get_current_user_async(token: str = None, db: AsyncSession = None) -> UserSchema:
+    """
+    Get the current user from the token on an async session, via the principal cache
+    """
+    token_data, credentials_exception = _verify_request_token(token)
+    cache = principal_cache_service.get_principal_cache()
+    principal = await cache.get_async(token_data.email)
+    if principal is not None:
+        return principal
+    
+    user = await user_service.get_user_by_email_async(db, email=token_data.email)
     
     if user is None:
         raise credentials_exception
     
-    return user
\ No newline at end of file
+    principal = UserSchema.model_validate(user)
+    await cache.set_async(token_data.email, principal, principal_cache_service.get_principal_ttl(token_data.expires_at))
+    return principal
\ No newline at end of file
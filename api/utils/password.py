@@ -1,6 +1,14 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
 from passlib.context import CryptContext
+from config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with a different work factor are flagged by needs_update() and
+# replaced on the user's next successful login
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.password_hash_rounds)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -14,4 +22,76 @@ def get_password_hash(password: str) -> str:
     """
     Generate a hash for a plain password
     """
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, when its hash uses outdated settings, return a
+    replacement hash (None otherwise)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+_password_pool: Optional[ProcessPoolExecutor] = None
+_password_pool_lock = threading.Lock()
+
+
+def get_password_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Return the process pool that runs bcrypt, creating it on first use.
+
+    bcrypt is CPU-bound by design; running it in separate processes keeps a
+    burst of logins from starving the API worker. Returns None when
+    settings.password_hash_workers is 0, in which case hashing runs on a thread.
+    """
+    global _password_pool
+    if settings.password_hash_workers <= 0:
+        return None
+    with _password_pool_lock:
+        if _password_pool is None:
+            # spawn rather than fork: the API process has running threads and event loops
+            _password_pool = ProcessPoolExecutor(
+                max_workers=settings.password_hash_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+    return _password_pool
+
+
+def shutdown_password_pool() -> None:
+    """
+    Stop the password hashing processes
+    """
+    global _password_pool
+    with _password_pool_lock:
+        if _password_pool is not None:
+            _password_pool.shutdown(wait=True, cancel_futures=True)
+            _password_pool = None
+
+
+async def _run_password_task(function, *args):
+    pool = get_password_pool()
+    if pool is None:
+        return await asyncio.to_thread(function, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, function, *args)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password without blocking the event loop
+    """
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password without blocking the event loop
+    """
+    return await _run_password_task(get_password_hash, password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    verify_and_update_password without blocking the event loop
+    """
+    return await _run_password_task(verify_and_update_password, plain_password, hashed_password)
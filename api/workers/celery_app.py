@@ -1,9 +1,23 @@
 from celery import Celery
+from celery.signals import celeryd_init
+from kombu import Queue
 from config import settings
 
 # Create Celery instance
 celery_app = Celery('podcast_multiplier')
 
+# Each pipeline stage is routed to the queue of the resource it waits on:
+#   transcribe  transcription API calls and transcript writes (network-bound)
+#   generate    LLM content generation and persistence (network-bound)
+#   media       audio analysis and image work (CPU-bound)
+# Start one worker per queue so each pool can be sized on its own, e.g.
+#   celery -A api.workers.celery_app worker -Q media
+QUEUE_SETTINGS = {
+    "transcribe": (settings.celery_transcribe_concurrency, settings.celery_transcribe_prefetch),
+    "generate": (settings.celery_generate_concurrency, settings.celery_generate_prefetch),
+    "media": (settings.celery_media_concurrency, settings.celery_media_prefetch),
+}
+
 # Configure Celery
 celery_app.conf.update(
     broker_url=settings.redis_url,
@@ -13,10 +27,43 @@ celery_app.conf.update(
     result_serializer='json',
     timezone='UTC',
     enable_utc=True,
+    task_queues=[Queue(name) for name in QUEUE_SETTINGS],
+    task_default_queue='generate',
+    task_routes={
+        'api.workers.tasks.process_episode_task': {'queue': 'transcribe'},
+        'api.workers.tasks.media_stage_task': {'queue': 'media'},
+        'api.workers.tasks.transcribe_stage_task': {'queue': 'transcribe'},
+        'api.workers.tasks.generate_stage_task': {'queue': 'generate'},
+        'api.workers.tasks.persist_stage_task': {'queue': 'generate'},
+        'api.workers.tasks.release_episode_task': {'queue': 'transcribe'},
+    },
+    # Stages are checkpointed, so a task redelivered after a worker crash
+    # resumes instead of losing the episode
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
 )
 
+
+@celeryd_init.connect
+def configure_queue_worker(sender=None, conf=None, options=None, **kwargs):
+    """
+    Apply the concurrency and prefetch settings of the queue a worker consumes,
+    unless they were given on the command line
+    """
+    queues = options.get("queues") or []
+    if isinstance(queues, str):
+        queues = queues.split(",")
+    if len(queues) != 1 or queues[0] not in QUEUE_SETTINGS:
+        return
+    concurrency, prefetch = QUEUE_SETTINGS[queues[0]]
+    if not options.get("concurrency"):
+        conf.worker_concurrency = concurrency
+    if not options.get("prefetch_multiplier"):
+        conf.worker_prefetch_multiplier = prefetch
+
+
 # Import tasks
 from . import tasks
 
 if __name__ == '__main__':
-    celery_app.start()
\ No newline at end of file
+    celery_app.start()
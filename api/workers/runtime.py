@@ -0,0 +1,85 @@
+import asyncio
+import os
+import threading
+from typing import Any, Coroutine, Optional
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+from api.services.http_clients import close_http_clients
+
+
+class WorkerLoop:
+    """
+    One long-lived event loop per worker process, running on its own thread.
+
+    Tasks submit their coroutines to it instead of calling asyncio.run(), so
+    the loop, and every connection pool bound to it (the shared httpx
+    clients), survives from one task to the next. Submitting from several
+    threads is safe, so thread-pool workers share the loop as well.
+    """
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.pid: Optional[int] = None
+        self.lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self.lock:
+            # A loop started before a fork has no thread in the child; start afresh
+            if self.loop is None or self.pid != os.getpid() or self.loop.is_closed():
+                self.loop = asyncio.new_event_loop()
+                self.pid = os.getpid()
+                self.thread = threading.Thread(target=self.loop.run_forever, name="worker-event-loop", daemon=True)
+                self.thread.start()
+            return self.loop
+
+    def run(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        """
+        Run a coroutine on the worker loop and wait for its result
+        """
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def shutdown(self) -> None:
+        """
+        Close the shared HTTP clients and stop the loop
+        """
+        with self.lock:
+            loop, thread = self.loop, self.thread
+            if loop is None or self.pid != os.getpid() or loop.is_closed():
+                return
+            self.loop = self.thread = None
+        try:
+            asyncio.run_coroutine_threadsafe(close_http_clients(), loop).result(timeout=10)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=10)
+            loop.close()
+
+
+_worker_loop = WorkerLoop()
+
+
+def get_worker_loop() -> WorkerLoop:
+    """
+    Return this process's worker loop
+    """
+    return _worker_loop
+
+
+def run_in_worker_loop(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine on this process's persistent worker loop
+    """
+    return _worker_loop.run(coroutine)
+
+
+@worker_process_init.connect
+def start_worker_loop(**kwargs):
+    # Start in each pool process so the first task does not pay for it
+    _worker_loop._ensure_started()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def stop_worker_loop(**kwargs):
+    _worker_loop.shutdown()
@@ -1,24 +1,119 @@
-import asyncio
+from typing import Any, Dict, List, Optional
+from celery import chain, chord
 from .celery_app import celery_app
+from .runtime import run_in_worker_loop
 from api.database import SessionLocal
-from api.workflows import process_episode_content
+from api.models import Episode
+from api.services import get_episode_scheduler
+from api.workflows import get_generate_stages, run_episode_stage
+
+
+async def _run_stage_async(episode_id: int, stage: str, inputs: Optional[Dict[str, Any]]) -> Any:
+    # Each task gets its own database session, opened on the loop thread that uses it
+    db = SessionLocal()
+    try:
+        return await run_episode_stage(db, episode_id, stage, inputs)
+    finally:
+        db.close()
+
+
+def _run_stage(episode_id: int, stage: str, inputs: Optional[Dict[str, Any]] = None) -> Any:
+    try:
+        return run_in_worker_loop(_run_stage_async(episode_id, stage, inputs))
+    except Exception as e:
+        print(f"Error in stage {stage} of episode {episode_id}: {str(e)}")
+        raise e
+
+
+def build_episode_pipeline(episode_id: int, generate_stages: List[str]):
+    """
+    The content workflow as a Celery canvas: audio probe on the media queue,
+    transcription on the transcribe queue, then one generate task per format
+    in a chord whose callback persists the results. The episode's scheduler
+    slot is released at the end, or by the errback if a stage fails.
+    """
+    if generate_stages:
+        generate = chord(
+            (generate_stage_task.si(episode_id, stage) for stage in generate_stages),
+            persist_stage_task.s(episode_id)
+        )
+    else:
+        generate = persist_stage_task.si([], episode_id)
+    return chain(
+        media_stage_task.si(episode_id, "probe"),
+        transcribe_stage_task.si(episode_id, "transcribe"),
+        transcribe_stage_task.si(episode_id, "analyze"),
+        generate,
+        release_episode_task.si(episode_id)
+    )
 
 
 @celery_app.task
 def process_episode_task(episode_id: int):
     """
-    Celery task to process an episode in the background
+    Celery task to process an episode in the background: dispatches the
+    per-stage pipeline and returns its id
     """
-    # Create a new database session for this task
     db = SessionLocal()
     try:
-        # Run the content processing workflow in an async context
-        result = asyncio.run(process_episode_content(db, episode_id))
-        return result
-    except Exception as e:
-        # Log the error and re-raise
-        print(f"Error processing episode {episode_id}: {str(e)}")
-        raise e
+        episode = db.query(Episode).filter(Episode.id == episode_id).first()
+        if not episode:
+            release_episode_task(episode_id)
+            raise ValueError(f"Episode with ID {episode_id} not found")
+        generate_stages = get_generate_stages(episode)
     finally:
-        # Close the database session
-        db.close()
\ No newline at end of file
+        db.close()
+    pipeline = build_episode_pipeline(episode_id, generate_stages)
+    return pipeline.apply_async(link_error=release_episode_task.si(episode_id)).id
+
+
+def schedule_episode(episode_id: int, user_id: int, tier: str) -> None:
+    """
+    Queue an episode for processing behind its tenant's fair share, and start
+    whatever the scheduler lets through now
+    """
+    for dispatched_id in get_episode_scheduler().submit(episode_id, user_id, tier):
+        process_episode_task.delay(dispatched_id)
+
+
+@celery_app.task
+def release_episode_task(episode_id: int):
+    """
+    Free the scheduler slot of a finished or failed episode and start the
+    episodes waiting for it
+    """
+    for dispatched_id in get_episode_scheduler().complete(episode_id):
+        process_episode_task.delay(dispatched_id)
+
+
+@celery_app.task
+def media_stage_task(episode_id: int, stage: str):
+    """
+    Run a CPU-bound stage (audio analysis) of an episode's workflow
+    """
+    return _run_stage(episode_id, stage)
+
+
+@celery_app.task
+def transcribe_stage_task(episode_id: int, stage: str):
+    """
+    Run a transcription stage of an episode's workflow
+    """
+    return _run_stage(episode_id, stage)
+
+
+@celery_app.task
+def generate_stage_task(episode_id: int, stage: str) -> Dict[str, Any]:
+    """
+    Run one content generator; the result is keyed by stage for the chord callback
+    """
+    return {stage: _run_stage(episode_id, stage)}
+
+
+@celery_app.task
+def persist_stage_task(generated: List[Dict[str, Any]], episode_id: int):
+    """
+    Chord callback: persist the results of every generate task
+    """
+    inputs = {stage: output for result in generated for stage, output in result.items()}
+    return _run_stage(episode_id, "persist", inputs)
@@ -1,5 +1,11 @@
-from .content_processing_workflow import process_episode_content
+from .content_processing_workflow import process_episode_content, run_episode_stage, get_generate_stages
+from .dag import Stage, StageFailedError, Workflow
 
 __all__ = [
-    "process_episode_content"
+    "process_episode_content",
+    "run_episode_stage",
+    "get_generate_stages",
+    "Stage",
+    "StageFailedError",
+    "Workflow"
 ]
\ No newline at end of file
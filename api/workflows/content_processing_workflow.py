@@ -1,20 +1,291 @@
 import asyncio
 import json
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
 
 from api.models import Episode, Transcript, ProcessingJob
 from api.services import (
     transcription_service,
     content_generation_service,
-    update_processing_job_status
+    ProgressReporter,
+    find_reusable_transcript,
+    link_transcript,
+    TranscriptWriter,
+    copy_transcript_segments,
+    iter_transcript_segments,
+    chunk_transcript,
+    build_transcript_digest,
+    index_document,
+    persist_generated_content,
+    CheckpointStore,
+    DatabaseCheckpointStore,
+    DraftWriter
 )
+from api.workflows.dag import Stage, Workflow
+from api.workflows.transcript_stream import TranscriptStream
+from config import settings
 
 
-async def process_episode_content(db: Session, episode_id: int):
+def get_enabled_generators(episode: Episode) -> Dict[str, Callable[..., Awaitable[Dict[str, Any]]]]:
+    """
+    Map each content type the episode asked for to its generator coroutine
+    """
+    generators = {
+        "blog_post": (episode.generate_blog, content_generation_service.generate_blog_post),
+        "social_media": (episode.generate_social, content_generation_service.generate_social_media_content),
+        "newsletter": (episode.generate_newsletter, content_generation_service.generate_newsletter_content),
+        "show_notes": (episode.generate_show_notes, content_generation_service.generate_show_notes),
+    }
+    return {
+        content_type: generator
+        for content_type, (enabled, generator) in generators.items()
+        if enabled
+    }
+
+
+async def run_content_generator(
+    episode: Episode,
+    digest: Dict[str, Any],
+    content_type: str,
+    generator: Callable[..., Awaitable[Dict[str, Any]]],
+    semaphore: asyncio.Semaphore,
+    timeout_seconds: float,
+    draft: Optional[DraftWriter] = None
+) -> Dict[str, Any]:
+    """
+    Run one content generator under the shared concurrency limit and its own
+    timeout, turning any failure into {"status": "failed", "error": ...}.
+    With a draft, the streamed text is saved as it arrives.
+    """
+    async with semaphore:
+        print(f"Generating {content_type}...")
+        if draft:
+            draft.start()
+        try:
+            content = await asyncio.wait_for(generator(episode, digest, draft=draft), timeout=timeout_seconds)
+            result = {"status": "completed", "content": content}
+        except asyncio.TimeoutError:
+            result = {"status": "failed", "error": f"Timed out after {timeout_seconds}s"}
+        except Exception as e:
+            result = {"status": "failed", "error": str(e)}
+        if draft:
+            draft.finish(result["status"], result.get("error"))
+        return result
+
+
+async def iter_segments(segments: Iterable[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    for segment in segments:
+        yield segment
+
+
+async def report_transcription_progress(
+    segments: AsyncIterator[Dict[str, Any]],
+    reporter: ProgressReporter,
+    duration: Optional[float],
+    start: int = 10,
+    end: int = 40
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Pass segments through, reporting progress from start to end by how much
+    of the audio they cover
+    """
+    async for segment in segments:
+        yield segment
+        if duration and segment.get("end") is not None:
+            reporter.report("processing", start + int((end - start) * min(1.0, segment["end"] / duration)))
+
+
+async def transcribe_with_early_insights(
+    db: Session,
+    episode: Episode,
+    segments: AsyncIterator[Dict[str, Any]],
+    existing_transcript: Optional[Transcript] = None
+) -> Tuple[Transcript, Dict[str, Any]]:
+    """
+    Consume a stream of transcript segments: persist them in batches (unless the
+    transcript already exists) and feed the early-insight extractors as they arrive.
+    """
+    stream = TranscriptStream()
+    insight_tasks = {
+        "time_stamps": asyncio.create_task(content_generation_service.extract_time_stamps(stream.subscribe())),
+        "quotes": asyncio.create_task(content_generation_service.extract_quotes(stream.subscribe()))
+    }
+    writer = TranscriptWriter(db, episode.id) if existing_transcript is None else None
+    
+    try:
+        async for segment in segments:
+            if writer:
+                writer.add(segment)
+            await stream.publish(segment)
+    except Exception:
+        for task in insight_tasks.values():
+            task.cancel()
+        if writer:
+            writer.discard()
+        raise
+    finally:
+        await stream.close()
+    
+    transcript = writer.finish() if writer else existing_transcript
+    insights = await asyncio.gather(*insight_tasks.values())
+    return transcript, dict(zip(insight_tasks.keys(), insights))
+
+
+CONTENT_WORKFLOW = "content"
+
+
+def build_content_workflow(db: Session, episode: Episode, reporter: ProgressReporter, checkpoints: CheckpointStore) -> Workflow:
+    """
+    The content pipeline as a DAG:
+    
+        probe -> transcribe -> analyze -> generate:<format> (one per format, in parallel) -> persist
+    
+    Stage outputs are small JSON documents (ids, insights, the episode digest,
+    generated content); the transcript itself stays in the database.
+    """
+    generators = get_enabled_generators(episode)
+    semaphore = asyncio.Semaphore(max(1, settings.content_generation_concurrency))
+    
+    async def probe(inputs: Dict[str, Any]) -> Dict[str, Any]:
+        # CPU-bound silence detection that plans where long audio is cut
+        if find_reusable_transcript(db, episode.content_hash):
+            return {"duration": episode.duration, "silences": None}
+        duration, silences = await transcription_service.probe_audio(episode.audio_url, episode.duration)
+        return {"duration": duration, "silences": silences}
+    
+    async def transcribe(inputs: Dict[str, Any]) -> Dict[str, Any]:
+        # Reuse the transcript of identical audio if there is one. Early insights
+        # (show-notes time stamps, quotes) are extracted from the segments while
+        # they stream in.
+        duration = inputs["probe"]["duration"] or episode.duration
+        reusable_transcript = find_reusable_transcript(db, episode.content_hash)
+        if reusable_transcript:
+            print(f"Reusing transcript {reusable_transcript.id} for episode {episode.id}")
+            transcript = Transcript(
+                episode_id=episode.id,
+                text=reusable_transcript.text,
+                speakers_json=reusable_transcript.speakers_json,
+                word_count=reusable_transcript.word_count
+            )
+            db.add(transcript)
+            db.commit()
+            copy_transcript_segments(db, reusable_transcript.id, transcript.id)
+            segments = iter_segments(iter_transcript_segments(db, transcript.id))
+        else:
+            print(f"Starting transcription for episode {episode.id}")
+            transcript = None
+            segments = transcription_service.stream_segments(
+                episode.audio_url, duration=duration, silences=inputs["probe"]["silences"]
+            )
+        
+        segments = report_transcription_progress(segments, reporter, duration)
+        transcript, insights = await transcribe_with_early_insights(db, episode, segments, transcript)
+        if not reusable_transcript:
+            link_transcript(db, episode.content_hash, transcript.id)
+            db.commit()
+        return {"transcript_id": transcript.id, **insights}
+    
+    async def analyze(inputs: Dict[str, Any]) -> Dict[str, Any]:
+        # The one pass over the full transcript: index it for search and
+        # condense it into the digest every generator works from
+        transcribed = inputs["transcribe"]
+        transcript_id = transcribed["transcript_id"]
+        text = db.query(Transcript.text).filter(Transcript.id == transcript_id).scalar()
+        index_document(db, episode.user_id, episode.id, "transcript", transcript_id, episode.title, text)
+        digest = await build_transcript_digest(chunk_transcript(db, transcript_id))
+        print(f"Digested {digest['token_count']} transcript tokens for episode {episode.id}")
+        return {**transcribed, "digest": digest}
+    
+    def generate_stage(content_type: str) -> Stage:
+        async def generate(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            # Generate stages run concurrently, so each writes its draft on a
+            # session of its own: a rollback of the shared session (a failed
+            # sibling's checkpoint) cannot discard it
+            with Session(bind=db.get_bind(), autoflush=False) as draft_db:
+                return await run_content_generator(
+                    episode,
+                    inputs["analyze"]["digest"],
+                    content_type,
+                    generators[content_type],
+                    semaphore,
+                    settings.content_generation_timeout_seconds,
+                    DraftWriter(draft_db, episode.id, content_type)
+                )
+        
+        # A failed format is retried on the next run; completed ones are kept
+        return Stage(
+            f"generate:{content_type}",
+            generate,
+            depends_on=("analyze",),
+            reusable=lambda result: result["status"] == "completed"
+        )
+    
+    async def persist(inputs: Dict[str, Any]) -> Dict[str, Any]:
+        insights = inputs["analyze"]
+        generation_results = {
+            content_type: inputs[f"generate:{content_type}"]
+            for content_type in generators
+        }
+        failed_formats = {
+            content_type: result["error"]
+            for content_type, result in generation_results.items()
+            if result["status"] == "failed"
+        }
+        if generation_results and len(failed_formats) == len(generation_results):
+            raise RuntimeError(f"All content generators failed: {failed_formats}")
+        
+        show_notes = generation_results.get("show_notes")
+        if show_notes and show_notes["status"] == "completed" and insights["time_stamps"]:
+            show_notes["content"]["time_stamps"] = insights["time_stamps"]
+        
+        # Save every generated artifact together with the final job and episode
+        # status in a single transaction; the reporter's terminal write commits it.
+        # The checkpoints go in the same transaction, so reprocessing the episode
+        # later starts from scratch.
+        persist_generated_content(db, episode, generation_results, commit=False)
+        checkpoints.clear()
+        episode.status = "completed"
+        episode.processed_at = datetime.utcnow()
+        reporter.report("completed", 100, json.dumps(failed_formats) if failed_formats else None)
+        return {
+            "formats": {
+                content_type: result["status"]
+                for content_type, result in generation_results.items()
+            },
+            "quotes": insights["quotes"]
+        }
+    
+    generate_stages = [generate_stage(content_type) for content_type in generators]
+    return Workflow([
+        Stage("probe", probe),
+        Stage("transcribe", transcribe, depends_on=("probe",)),
+        Stage("analyze", analyze, depends_on=("transcribe",)),
+        *generate_stages,
+        Stage(
+            "persist",
+            persist,
+            depends_on=("analyze", *(stage.name for stage in generate_stages)),
+            reusable=lambda output: False
+        ),
+    ])
+
+
+def stage_progress(completed: Set[str], generate_stages: List[str]) -> int:
+    """
+    Job progress once the given stages are done: transcription takes it to 40,
+    the generators share the next 50 and persisting completes the job
+    """
+    progress = 40 if "transcribe" in completed else 10
+    if generate_stages:
+        progress += 50 * len(completed.intersection(generate_stages)) // len(generate_stages)
+    return progress
+
+
+def _open_episode_workflow(db: Session, episode_id: int) -> Tuple[Episode, ProgressReporter, DatabaseCheckpointStore, Workflow, Callable[[str, Any, bool], None]]:
     """
-    Main workflow to process an episode: transcribe -> generate content -> update status
+    Load an episode and its processing job and build its content workflow,
+    with a stage callback that reports progress
     """
     # Get the episode from the database
     episode = db.query(Episode).filter(Episode.id == episode_id).first()
@@ -29,76 +300,80 @@ async def process_episode_content(db: Session, episode_id: int):
     if not processing_job:
         raise ValueError(f"No processing job found for episode {episode_id}")
     
-    # Update job status to processing
-    update_processing_job_status(db, processing_job.id, "processing", 10)
+    # Progress ticks are coalesced; only status changes and one write per
+    # flush interval reach the database
+    reporter = ProgressReporter(db, processing_job)
+    checkpoints = DatabaseCheckpointStore(db, episode_id, CONTENT_WORKFLOW)
+    workflow = build_content_workflow(db, episode, reporter, checkpoints)
+    generate_stages = [name for name in workflow.stages if name.startswith("generate:")]
+    completed: Set[str] = set()
+    
+    def report_stage_done(stage: str, output: Any, from_checkpoint: bool) -> None:
+        completed.add(stage)
+        if stage == "transcribe" or stage in generate_stages:
+            reporter.report("processing", stage_progress(completed, generate_stages))
+    
+    return episode, reporter, checkpoints, workflow, report_stage_done
+
+
+def _record_failure(db: Session, episode: Episode, reporter: ProgressReporter, error: Exception) -> None:
+    # Drop any half-written content before recording the failure. Progress
+    # is left where it was: completed stages are resumed, not redone.
+    db.rollback()
+    episode.status = "failed"
+    reporter.report("failed", error_log=str(error))
+    print(f"Failed processing for episode {episode.id}: {str(error)}")
+
+
+async def process_episode_content(db: Session, episode_id: int):
+    """
+    Main workflow to process an episode: transcribe -> generate content -> update status.
+    
+    Runs as a checkpointed DAG (see build_content_workflow): after a failure, the
+    next run resumes from the first stage that did not complete.
+    """
+    episode, reporter, checkpoints, workflow, report_stage_done = _open_episode_workflow(db, episode_id)
+    reporter.report("processing", 10)
     
     try:
-        # Step 1: Transcribe the audio
-        print(f"Starting transcription for episode {episode_id}")
-        transcript_data = await transcription_service.transcribe_audio(episode.audio_url)
-        
-        # Create transcript record
-        transcript = Transcript(
-            episode_id=episode.id,
-            text=transcript_data["text"],
-            segments_json=json.dumps(transcript_data["segments"]),
-            speakers_json=json.dumps(transcript_data["speakers"]),
-            word_count=transcript_data["word_count"]
-        )
-        db.add(transcript)
-        db.commit()
-        
-        # Update progress
-        update_processing_job_status(db, processing_job.id, "processing", 40)
-        
-        # Step 2: Generate content based on user preferences
-        print(f"Starting content generation for episode {episode_id}")
-        
-        # Generate blog post if requested
-        if episode.generate_blog:
-            print("Generating blog post...")
-            blog_content = await content_generation_service.generate_blog_post(episode, transcript.text)
-            # In a real implementation, we would save this to the database
-            
-        # Update progress
-        update_processing_job_status(db, processing_job.id, "processing", 60)
-        
-        # Generate social media content if requested
-        if episode.generate_social:
-            print("Generating social media content...")
-            social_content = await content_generation_service.generate_social_media_content(episode, transcript.text)
-            # In a real implementation, we would save this to the database
-            
-        # Update progress
-        update_processing_job_status(db, processing_job.id, "processing", 80)
-        
-        # Generate newsletter content if requested
-        if episode.generate_newsletter:
-            print("Generating newsletter content...")
-            newsletter_content = await content_generation_service.generate_newsletter_content(episode, transcript.text)
-            # In a real implementation, we would save this to the database
-            
-        # Generate show notes if requested
-        if episode.generate_show_notes:
-            print("Generating show notes...")
-            show_notes = await content_generation_service.generate_show_notes(episode, transcript.text)
-            # In a real implementation, we would save this to the database
-            
-        # Update progress to complete
-        update_processing_job_status(db, processing_job.id, "completed", 100)
-        
-        # Update episode status
-        episode.status = "completed"
-        episode.processed_at = datetime.utcnow()
-        db.commit()
-        
-        print(f"Completed processing for episode {episode_id}")
-        return {"status": "success", "episode_id": episode_id}
-        
+        outputs = await workflow.run(checkpoints, on_stage_done=report_stage_done)
+    except Exception as e:
+        _record_failure(db, episode, reporter, e)
+        raise e
+    finally:
+        # Write any progress tick still coalesced in memory
+        reporter.flush()
+    
+    print(f"Completed processing for episode {episode_id}")
+    return {
+        "status": "success",
+        "episode_id": episode_id,
+        **outputs["persist"]
+    }
+
+
+async def run_episode_stage(db: Session, episode_id: int, stage: str, inputs: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Run one stage of an episode's content workflow, for the per-stage Celery
+    tasks. Earlier stages are read from their checkpoints; inputs supplies the
+    outputs that are not checkpointed (failed generators, for persist).
+    """
+    episode, reporter, checkpoints, workflow, report_stage_done = _open_episode_workflow(db, episode_id)
+    reporter.report("processing")
+    
+    try:
+        output = await workflow.run_stage(stage, checkpoints, inputs, on_stage_done=report_stage_done)
     except Exception as e:
-        # Update job status to failed
-        update_processing_job_status(db, processing_job.id, "failed", 0, str(e))
-        episode.status = "failed"
-        db.commit()
-        print(f"Failed processing for episode {episode_id}: {str(e)}")
-        raise e
\ No newline at end of file
+        _record_failure(db, episode, reporter, e)
+        raise e
+    
+    # This reporter ends with the task
+    reporter.flush()
+    return output
+
+
+def get_generate_stages(episode: Episode) -> List[str]:
+    """
+    Names of the generate stages of an episode's content workflow, in order
+    """
+    return [f"generate:{content_type}" for content_type in get_enabled_generators(episode)]
@@ -0,0 +1,163 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from api.services.workflow_checkpoint_service import CheckpointStore
+
+
+class StageFailedError(Exception):
+    """
+    Raised when a stage of a workflow fails; the cause is chained
+    """
+
+    def __init__(self, stage: str, error: BaseException):
+        self.stage = stage
+        super().__init__(f"Stage {stage} failed: {error}")
+
+
+@dataclass
+class Stage:
+    """
+    One step of a workflow.
+
+    run receives the outputs of the stages it depends on, keyed by stage name.
+    Its output is checkpointed unless reusable(output) is False, in which case
+    a retry runs the stage again.
+    """
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: Sequence[str] = field(default_factory=tuple)
+    reusable: Optional[Callable[[Any], bool]] = None
+
+
+class Workflow:
+    """
+    A DAG of stages. Each stage starts as soon as everything it depends on has
+    completed, so independent stages run concurrently.
+
+    Completed stages are recorded in a CheckpointStore; running the workflow
+    again skips them and hands their saved output to the stages that follow.
+    When a stage fails no new stages start, the ones already running finish
+    (and are checkpointed), and StageFailedError is raised.
+
+    Recording a failure may roll back the checkpoint store's session, so
+    stages that can run at the same time as others must not leave
+    uncommitted work on that session.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        for stage in stages:
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage {stage.name} depends on unknown stage {dependency}")
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        remaining = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        while remaining:
+            ready = [name for name, dependencies in remaining.items() if not dependencies]
+            if not ready:
+                raise ValueError(f"Workflow has a dependency cycle among {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+
+    async def run(
+        self,
+        checkpoints: Optional[CheckpointStore] = None,
+        on_stage_done: Optional[Callable[[str, Any, bool], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run every stage that has no checkpoint yet and return all outputs.
+
+        on_stage_done, if given, is called with the stage name, its output and
+        whether it came from a checkpoint.
+        """
+        checkpoints = checkpoints or CheckpointStore()
+        outputs = {name: output for name, output in checkpoints.load().items() if name in self.stages}
+        for name in self.stages:
+            if name in outputs and on_stage_done:
+                on_stage_done(name, outputs[name], True)
+
+        pending = [name for name in self.stages if name not in outputs]
+        running: Dict[asyncio.Task, str] = {}
+        failure: Optional[StageFailedError] = None
+
+        try:
+            while pending or running:
+                if failure is None:
+                    for name in list(pending):
+                        stage = self.stages[name]
+                        if all(dependency in outputs for dependency in stage.depends_on):
+                            pending.remove(name)
+                            inputs = {dependency: outputs[dependency] for dependency in stage.depends_on}
+                            running[asyncio.ensure_future(stage.run(inputs))] = name
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    stage = self.stages[name]
+                    if task.cancelled() or task.exception() is not None:
+                        error = task.exception() if not task.cancelled() else asyncio.CancelledError()
+                        checkpoints.fail(name, str(error))
+                        if failure is None:
+                            failure = StageFailedError(name, error)
+                            failure.__cause__ = error
+                        continue
+                    output = task.result()
+                    outputs[name] = output
+                    if stage.reusable is None or stage.reusable(output):
+                        checkpoints.save(name, output)
+                    if on_stage_done:
+                        on_stage_done(name, output, False)
+        finally:
+            # Stages are only left running here when run() itself was interrupted
+            for task in running:
+                task.cancel()
+
+        if failure is not None:
+            raise failure
+        return outputs
+
+    async def run_stage(
+        self,
+        name: str,
+        checkpoints: CheckpointStore,
+        inputs: Optional[Dict[str, Any]] = None,
+        on_stage_done: Optional[Callable[[str, Any, bool], None]] = None
+    ) -> Any:
+        """
+        Run a single stage, for executors that schedule stages themselves (one
+        Celery task per stage). The outputs it depends on come from the
+        checkpoints, or from inputs for outputs that are not checkpointed.
+        A stage that is already checkpointed is not run again.
+        """
+        stage = self.stages[name]
+        outputs = {stage_name: output for stage_name, output in checkpoints.load().items() if stage_name in self.stages}
+        if on_stage_done:
+            for stage_name, output in outputs.items():
+                on_stage_done(stage_name, output, True)
+        if name in outputs:
+            return outputs[name]
+
+        available = {**outputs, **(inputs or {})}
+        missing = [dependency for dependency in stage.depends_on if dependency not in available]
+        if missing:
+            raise ValueError(f"Stage {name} is missing the output of {', '.join(missing)}")
+
+        try:
+            output = await stage.run({dependency: available[dependency] for dependency in stage.depends_on})
+        except Exception as e:
+            checkpoints.fail(name, str(e))
+            raise StageFailedError(name, e) from e
+        if stage.reusable is None or stage.reusable(output):
+            checkpoints.save(name, output)
+        if on_stage_done:
+            on_stage_done(name, output, False)
+        return output
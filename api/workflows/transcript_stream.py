@@ -0,0 +1,40 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List
+
+
+class TranscriptStream:
+    """
+    Fan a live sequence of transcript segments out to several consumers.
+    
+    Every subscriber sees all segments from the beginning, in order, and its
+    iteration ends once the stream is closed. This lets downstream stages start
+    while transcription is still running.
+    """
+    
+    def __init__(self):
+        self.segments: List[Dict[str, Any]] = []
+        self.closed = False
+        self._changed = asyncio.Condition()
+    
+    async def publish(self, segment: Dict[str, Any]) -> None:
+        async with self._changed:
+            self.segments.append(segment)
+            self._changed.notify_all()
+    
+    async def close(self) -> None:
+        async with self._changed:
+            self.closed = True
+            self._changed.notify_all()
+    
+    async def subscribe(self) -> AsyncIterator[Dict[str, Any]]:
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.segments) or self.closed)
+                available = self.segments[index:]
+                finished = self.closed
+            for segment in available:
+                yield segment
+            index += len(available)
+            if finished and index >= len(self.segments):
+                return
@@ -0,0 +1,143 @@
+"""
+Login throughput benchmark for the password hashing strategies.
+
+Fires concurrent POST /api/v1/auth/login requests while probing GET /health,
+so the numbers show both login throughput and how much a login burst delays
+unrelated requests. Modes:
+
+    inline   bcrypt runs on the event loop (how login behaved before the pool)
+    thread   bcrypt runs on a thread (PASSWORD_HASH_WORKERS=0)
+    process  bcrypt runs on the password process pool
+
+    python benchmarks/login_benchmark.py --logins 200 --concurrency 50 --workers 4
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import api.models  # noqa: F401  (registers every table on Base.metadata)
+from api.database import Base, get_async_database_url, get_async_db
+from api.main import app
+from api.models import User
+from api.utils import get_password_hash, password, shutdown_password_pool
+from config import settings
+
+EMAIL = "login-benchmark@example.com"
+PASSWORD = "benchmark-password"
+
+
+def seed(database_url: str) -> None:
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.query(User).filter(User.email == EMAIL).delete()
+        db.add(User(email=EMAIL, hashed_password=get_password_hash(PASSWORD)))
+        db.commit()
+    engine.dispose()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[max(0, int(len(values) * fraction) - 1)] * 1000
+
+
+async def run_mode(client: httpx.AsyncClient, logins: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    login_latencies: List[float] = []
+    probe_latencies: List[float] = []
+    errors = 0
+    done = asyncio.Event()
+
+    async def login():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post("/api/v1/auth/login", data={"username": EMAIL, "password": PASSWORD})
+            login_latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    async def probe():
+        # Measured from when the probe was due, so time spent waiting for a
+        # blocked event loop counts against it
+        while not done.is_set():
+            due = time.perf_counter() + 0.01
+            await asyncio.sleep(0.01)
+            await client.get("/health")
+            probe_latencies.append(time.perf_counter() - due)
+
+    prober = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+
+    return {
+        "logins_per_second": logins / elapsed,
+        "login_p50_ms": statistics.median(login_latencies) * 1000,
+        "health_p95_ms": percentile(probe_latencies, 0.95),
+        "errors": errors
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    seed(args.database_url)
+    async_engine = create_async_engine(get_async_database_url(args.database_url))
+    AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    run_password_task = password._run_password_task
+
+    async def run_inline(function, *args):
+        return function(*args)
+
+    modes = {
+        "inline": (run_inline, 0),
+        "thread": (run_password_task, 0),
+        "process": (run_password_task, args.workers),
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name in args.modes:
+            runner, workers = modes[name]
+            password._run_password_task = runner
+            settings.password_hash_workers = workers
+            await run_mode(client, min(args.logins, workers or 1), args.concurrency)  # start the pool
+            result = await run_mode(client, args.logins, args.concurrency)
+            shutdown_password_pool()
+            print(
+                f"{name:>7}: {result['logins_per_second']:7.1f} logins/s  "
+                f"login p50 {result['login_p50_ms']:7.1f} ms  "
+                f"/health p95 {result['health_p95_ms']:7.1f} ms  errors {result['errors']}"
+            )
+
+    password._run_password_task = run_password_task
+    app.dependency_overrides.clear()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=f"sqlite:///{os.path.join(tempfile.gettempdir(), 'podcast_login_benchmark.db')}")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--modes", nargs="+", choices=["inline", "thread", "process"], default=["inline", "thread", "process"])
+    asyncio.run(main(parser.parse_args()))
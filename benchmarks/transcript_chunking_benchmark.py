@@ -0,0 +1,82 @@
+"""
+Chunking benchmark for a multi-hour transcript.
+
+Builds a synthetic transcript (two speakers taking turns, about 150 words a
+minute) and times chunk_transcript_segments() on it, cold (every segment
+encoded) and warm (token counts served from the per-transcript cache), as
+the analyze stage and later consumers would use it.
+
+    python benchmarks/transcript_chunking_benchmark.py --hours 4 --max-tokens 4000 --overlap-tokens 200
+
+The encoding's vocabulary is downloaded by tiktoken on first use and cached
+(see TIKTOKEN_CACHE_DIR).
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.services import chunk_transcript_segments, get_segment_token_counts, transcript_chunking_service
+from config import settings
+
+WORDS = (
+    "so the thing about building an audience is that you have to show up every week and "
+    "people notice when the episodes stop we tried a dozen formats before this one stuck "
+    "honestly the interviews with listeners were the turning point for the whole show"
+).split()
+
+
+def make_segments(hours: float, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    segments = []
+    start = 0.0
+    speaker = "Host"
+    while start < hours * 3600:
+        word_count = rng.randint(6, 30)
+        duration = word_count / 2.5  # 150 words a minute
+        segments.append({
+            "start": start,
+            "end": start + duration,
+            "text": " ".join(rng.choice(WORDS) for _ in range(word_count)),
+            "speaker": speaker
+        })
+        start += duration
+        if rng.random() < 0.2:
+            speaker = "Guest" if speaker == "Host" else "Host"
+    return segments
+
+
+def main(args: argparse.Namespace) -> None:
+    settings.transcript_encoding = args.encoding
+    transcript_chunking_service.get_encoding()  # load the vocabulary outside the timings
+    segments = make_segments(args.hours)
+    print(f"{len(segments)} segments, {sum(len(s['text'].split()) for s in segments)} words")
+
+    for label, warm in [("cold", False), ("warm", True)]:
+        timings = []
+        for _ in range(args.runs):
+            if not warm:
+                transcript_chunking_service._token_counts.clear()
+            started = time.perf_counter()
+            token_counts = get_segment_token_counts(1, segments)
+            chunks = chunk_transcript_segments(segments, token_counts, args.max_tokens, args.overlap_tokens)
+            timings.append(time.perf_counter() - started)
+        print(
+            f"{label}: {len(chunks)} chunks, {sum(token_counts)} tokens  "
+            f"median {statistics.median(timings) * 1000:7.1f} ms  max {max(timings) * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=4)
+    parser.add_argument("--max-tokens", type=int, default=settings.transcript_chunk_tokens)
+    parser.add_argument("--overlap-tokens", type=int, default=settings.transcript_chunk_overlap_tokens)
+    parser.add_argument("--encoding", default=settings.transcript_encoding)
+    parser.add_argument("--runs", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,158 @@
+from collections import OrderedDict
+
+import pytest
+import tiktoken
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+import api.models  # noqa: F401  (registers every table on Base.metadata)
+from api.database import Base, get_async_db, get_db
+from api.main import app
+from api.models import User
+from api.services import (
+    content_draft_service,
+    episode_scheduler_service,
+    generation_cache_service,
+    principal_cache_service,
+    progress_events_service,
+    storage_service,
+    transcript_chunking_service
+)
+from api.utils import create_access_token, get_password_hash
+from api.workers import tasks
+from config import settings
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    # A file rather than an in-memory database, so that the sync session used by
+    # tests and the async sessions used by async routes see the same data
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def db(database_path):
+    engine = create_engine(
+        f"sqlite:///{database_path}",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def principal_cache(monkeypatch):
+    # Users from one test's database must never be served to another test
+    cache = principal_cache_service.MemoryPrincipalCache()
+    monkeypatch.setattr(principal_cache_service, "_principal_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def progress_broker(monkeypatch):
+    broker = progress_events_service.MemoryProgressBroker()
+    monkeypatch.setattr(progress_events_service, "_progress_broker", broker)
+    return broker
+
+
+@pytest.fixture(autouse=True)
+def draft_broker(monkeypatch):
+    broker = progress_events_service.MemoryProgressBroker()
+    monkeypatch.setattr(content_draft_service, "_draft_broker", broker)
+    return broker
+
+
+@pytest.fixture(autouse=True)
+def episode_scheduler(monkeypatch):
+    scheduler = episode_scheduler_service.MemoryEpisodeScheduler()
+    monkeypatch.setattr(episode_scheduler_service, "_episode_scheduler", scheduler)
+    return scheduler
+
+
+@pytest.fixture(autouse=True)
+def generation_cache(tmp_path_factory, monkeypatch):
+    path = tmp_path_factory.mktemp("generation_cache") / "cache.sqlite3"
+    cache = generation_cache_service.SqliteGenerationCache(str(path))
+    monkeypatch.setattr(generation_cache_service, "_generation_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def encoding(monkeypatch):
+    # Byte-level encoding: real tiktoken, without downloading a vocabulary
+    encoding = tiktoken.Encoding(
+        name="bytes",
+        pat_str=r"\s?\S+|\s+",
+        mergeable_ranks={bytes([byte]): byte for byte in range(256)},
+        special_tokens={}
+    )
+    monkeypatch.setattr(transcript_chunking_service, "_encoding", encoding)
+    monkeypatch.setattr(transcript_chunking_service, "_token_counts", OrderedDict())
+    return encoding
+
+
+@pytest.fixture(autouse=True)
+def llm_providers(monkeypatch):
+    # No API keys from the environment: generators use their placeholders
+    # unless a test points the providers at a fake
+    monkeypatch.setattr(settings, "openai_api_key", None)
+    monkeypatch.setattr(settings, "anthropic_api_key", None)
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    backend = storage_service.LocalStorageBackend(str(tmp_path / "storage"))
+    monkeypatch.setattr(storage_service, "_storage_backend", backend)
+    return backend
+
+
+@pytest.fixture
+def dispatched_episodes(monkeypatch):
+    dispatched = []
+    monkeypatch.setattr(tasks.process_episode_task, "delay", lambda episode_id: dispatched.append(episode_id))
+    return dispatched
+
+
+@pytest.fixture
+def client(db, database_path, storage, dispatched_episodes):
+    # NullPool: every request opens its connection on the TestClient's event loop
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+    TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        yield db
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def user(db):
+    db_user = User(email="host@example.com", full_name="Podcast Host", hashed_password=get_password_hash("secret"))
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
+
+@pytest.fixture
+def auth_headers(user):
+    token = create_access_token(data={"sub": user.email})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,100 @@
+import time
+from datetime import timedelta
+
+from passlib.context import CryptContext
+from sqlalchemy import text
+
+from api.services import MemoryPrincipalCache
+from api.utils import create_access_token, password
+from config import settings
+
+
+def test_register_login_and_me(client):
+    response = client.post(
+        "/api/v1/auth/register",
+        json={"email": "new@example.com", "full_name": "New Host", "password": "hunter2"}
+    )
+    assert response.status_code == 200
+
+    duplicate = client.post("/api/v1/auth/register", json={"email": "new@example.com", "password": "x"})
+    assert duplicate.status_code == 400
+
+    wrong = client.post("/api/v1/auth/login", data={"username": "new@example.com", "password": "nope"})
+    assert wrong.status_code == 401
+
+    token = client.post("/api/v1/auth/login", data={"username": "new@example.com", "password": "hunter2"}).json()
+    me = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token['access_token']}"})
+    assert me.json()["email"] == "new@example.com"
+
+
+def test_principal_is_cached_until_user_changes(client, db, user, auth_headers, principal_cache):
+    assert client.get("/api/v1/auth/me", headers=auth_headers).json()["full_name"] == "Podcast Host"
+    assert principal_cache.get(user.email).id == user.id
+
+    # Served from the cache: a change made behind the ORM's back is not seen
+    db.execute(text("UPDATE users SET full_name = 'Stale' WHERE id = :id"), {"id": user.id})
+    db.commit()
+    assert client.get("/api/v1/auth/me", headers=auth_headers).json()["full_name"] == "Podcast Host"
+
+    # An ORM update invalidates the entry
+    db.refresh(user)
+    user.full_name = "Renamed Host"
+    db.commit()
+    assert principal_cache.get(user.email) is None
+    assert client.get("/api/v1/auth/me", headers=auth_headers).json()["full_name"] == "Renamed Host"
+
+
+def test_principal_is_invalidated_only_after_commit(client, db, user, auth_headers, principal_cache, monkeypatch):
+    client.get("/api/v1/auth/me", headers=auth_headers)
+
+    # A flushed but rolled-back change keeps the cached principal
+    user.full_name = "Never Saved"
+    db.flush()
+    assert principal_cache.get(user.email) is not None
+    db.rollback()
+    assert principal_cache.get(user.email) is not None
+
+    # A cache outage does not fail the committed update
+    def fail(subject):
+        raise ConnectionError("cache unavailable")
+
+    monkeypatch.setattr(principal_cache, "invalidate", fail)
+    user.full_name = "Saved"
+    db.commit()
+    db.refresh(user)
+    assert user.full_name == "Saved"
+
+
+def test_principal_ttl_never_outlives_token(client, user, principal_cache):
+    token = create_access_token(data={"sub": user.email}, expires_delta=timedelta(seconds=2))
+    client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+    expires_at, _ = principal_cache.entries[user.email]
+    assert expires_at - time.monotonic() <= 2
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryPrincipalCache(max_entries=2)
+    principals = {}
+    for email in ["a@example.com", "b@example.com", "c@example.com"]:
+        principals[email] = object()
+        cache.set(email, principals[email], ttl_seconds=60)
+        if email == "b@example.com":
+            cache.get("a@example.com")
+
+    assert cache.get("b@example.com") is None
+    assert cache.get("a@example.com") is principals["a@example.com"]
+    assert cache.get("c@example.com") is principals["c@example.com"]
+
+
+def test_login_rehashes_password_when_work_factor_changes(client, db, user, monkeypatch):
+    monkeypatch.setattr(settings, "password_hash_workers", 0)
+    monkeypatch.setattr(password, "pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__rounds=4))
+    old_hash = user.hashed_password
+
+    response = client.post("/api/v1/auth/login", data={"username": user.email, "password": "secret"})
+    assert response.status_code == 200
+
+    db.refresh(user)
+    assert user.hashed_password != old_hash
+    assert user.hashed_password.startswith("$2b$04$")
+    assert password.verify_password("secret", user.hashed_password)
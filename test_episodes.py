@@ -0,0 +1,130 @@
+import asyncio
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from api.models import Episode, ProcessingJob, Transcript
+from api.services import TranscriptChunk, build_transcript_digest, persist_generated_content
+from api.workflows.content_processing_workflow import get_enabled_generators
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+
+def test_episode_crud_on_async_session(client, db, auth_headers, dispatched_episodes):
+    response = client.post(
+        "/api/v1/episodes/upload",
+        params={"title": "Async Episode", "filename": "episode.mp3"},
+        content=b"audio",
+        headers={**auth_headers, "Content-Type": "audio/mpeg"}
+    )
+    assert response.status_code == 200
+    episode_id = response.json()["id"]
+    assert dispatched_episodes == [episode_id]
+    assert db.query(ProcessingJob).filter(ProcessingJob.episode_id == episode_id).count() == 1
+
+    episodes = client.get("/api/v1/episodes/", headers=auth_headers).json()
+    assert [episode["id"] for episode in episodes["items"]] == [episode_id]
+
+    response = client.put(f"/api/v1/episodes/{episode_id}", json={"title": "Renamed"}, headers=auth_headers)
+    assert response.json()["title"] == "Renamed"
+    assert client.get(f"/api/v1/episodes/{episode_id}", headers=auth_headers).json()["title"] == "Renamed"
+
+    assert client.get("/api/v1/episodes/999", headers=auth_headers).status_code == 404
+
+    assert client.delete(f"/api/v1/episodes/{episode_id}", headers=auth_headers).status_code == 200
+    assert client.get(f"/api/v1/episodes/{episode_id}", headers=auth_headers).status_code == 404
+
+
+def test_episode_list_keyset_pagination(client, db, user, auth_headers):
+    # Every row shares the same created_at second, so ordering falls back to id
+    episodes = [
+        Episode(user_id=user.id, title=f"Episode {i}", audio_url=f"uploads/{i}.mp3", status="completed" if i % 2 else "uploaded")
+        for i in range(7)
+    ]
+    db.add_all(episodes)
+    db.commit()
+    expected = [episode.id for episode in sorted(episodes, key=lambda e: (e.created_at, e.id), reverse=True)]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/v1/episodes/", params=params, headers=auth_headers).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+    assert set(page["items"][0]) == {"id", "title", "status", "duration", "file_format", "created_at", "processed_at"}
+
+    completed = client.get("/api/v1/episodes/", params={"status": "completed"}, headers=auth_headers).json()
+    assert [item["title"] for item in completed["items"]] == ["Episode 5", "Episode 3", "Episode 1"]
+
+    assert client.get("/api/v1/episodes/", params={"cursor": "not-a-cursor"}, headers=auth_headers).status_code == 400
+
+
+def test_episode_list_cursor_survives_deleting_its_episode(client, db, user, auth_headers):
+    db.add_all([Episode(user_id=user.id, title=f"Episode {i}", audio_url=f"uploads/{i}.mp3") for i in range(5)])
+    db.commit()
+
+    first = client.get("/api/v1/episodes/", params={"limit": 2}, headers=auth_headers).json()
+    db.delete(db.get(Episode, first["items"][-1]["id"]))
+    db.commit()
+
+    rest = client.get("/api/v1/episodes/", params={"cursor": first["next_cursor"]}, headers=auth_headers).json()
+    assert [item["title"] for item in rest["items"]] == ["Episode 2", "Episode 1", "Episode 0"]
+
+
+def test_episode_bundle_loads_content_in_fixed_queries(client, db, user, auth_headers):
+    episode = Episode(user_id=user.id, title="Bundled", audio_url="uploads/b.mp3")
+    db.add(episode)
+    db.commit()
+    db.add_all([
+        Transcript(episode_id=episode.id, text="the full transcript " * 100, word_count=300),
+        ProcessingJob(episode_id=episode.id, job_type="all", status="completed", progress=100)
+    ])
+    db.commit()
+    digest = asyncio.run(build_transcript_digest([TranscriptChunk([{"start": 0.0, "end": 5.0, "text": "transcript", "speaker": None}], 1)]))
+    results = {
+        content_type: {"status": "completed", "content": asyncio.run(generator(episode, digest))}
+        for content_type, generator in get_enabled_generators(episode).items()
+    }
+    persist_generated_content(db, episode, results)
+    client.get("/api/v1/auth/me", headers=auth_headers)  # caches the principal
+    episode_id = episode.id
+
+    with count_queries() as statements:
+        bundle = client.get(f"/api/v1/episodes/{episode_id}/bundle", headers=auth_headers).json()
+    assert len(statements) == 7  # the episode plus one per section
+    assert bundle["transcript"]["text"].startswith("the full transcript")
+    assert len(bundle["social_threads"]) == 3
+    assert [job["status"] for job in bundle["processing_jobs"]] == ["completed"]
+    assert bundle["blog_posts"][0]["slug"]
+
+    with count_queries() as statements:
+        slim = client.get(
+            f"/api/v1/episodes/{episode_id}/bundle",
+            params={"include": "transcript,newsletters", "transcript_text": False},
+            headers=auth_headers
+        ).json()
+    assert len(statements) == 3
+    assert not any("transcripts.text" in statement for statement in statements)
+    assert slim["transcript"]["text"] is None
+    assert slim["transcript"]["word_count"] == 300
+    assert slim["blog_posts"] is None
+    assert len(slim["newsletters"]) == 1
+
+    response = client.get(f"/api/v1/episodes/{episode_id}/bundle", params={"include": "comments"}, headers=auth_headers)
+    assert response.status_code == 400
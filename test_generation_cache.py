@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from api.models import Episode
+from api.services import SqliteGenerationCache, TranscriptChunk, build_transcript_digest, content_generation_service, generation_cache_key
+from api.services.content_generation_service import ContentGenerationService, cached_generation
+from config import settings
+
+
+def test_generation_is_served_from_the_cache(client, auth_headers, generation_cache, monkeypatch):
+    monkeypatch.setattr(settings, "openai_api_key", "openai-key")
+    calls = []
+
+    class SlowService(ContentGenerationService):
+        @cached_generation("blog_post")
+        async def generate_blog_post(self, episode, digest, draft=None):
+            calls.append(digest)
+            await asyncio.sleep(0.2)
+            return {"title": episode.title, "content": digest}
+
+    service = SlowService()
+    episode = Episode(title="Cached Episode")
+
+    async def generate(transcript):
+        started = time.perf_counter()
+        content = await service.generate_blog_post(episode, transcript)
+        return content, time.perf_counter() - started
+
+    first, _ = asyncio.run(generate("Hello   world"))
+    again, elapsed = asyncio.run(generate("Hello   world"))
+    assert again == first and calls == ["Hello   world"]
+    assert elapsed < 0.1
+
+    # A different transcript or model (or primary provider) is a different request
+    asyncio.run(generate("Goodbye"))
+    monkeypatch.setattr(settings, "openai_model", "another-model")
+    asyncio.run(generate("Hello   world"))
+    monkeypatch.setattr(settings, "openai_api_key", None)
+    monkeypatch.setattr(settings, "anthropic_api_key", "anthropic-key")
+    asyncio.run(generate("Hello   world"))
+    assert len(calls) == 4
+
+    assert client.get("/metrics/generation-cache").status_code == 401
+    response = client.get("/metrics/generation-cache", headers=auth_headers)
+    assert response.json() == {"hits": 1, "misses": 4, "hit_rate": 0.2, "entries": 4}
+
+
+def test_cache_key_ignores_prompt_formatting():
+    key = generation_cache_key("Write  a\nblog post", "model", {"temperature": 0.7}, "transcript")
+    assert key == generation_cache_key("Write a blog post ", "model", {"temperature": 0.7}, "transcript")
+    assert key != generation_cache_key("Write a blog post", "model", {"temperature": 0.2}, "transcript")
+
+
+def test_entries_expire_and_least_recently_used_are_evicted(tmp_path, monkeypatch):
+    cache = SqliteGenerationCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60, max_entries=2)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    assert cache.get("a") == {"n": 1}
+    cache.set("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1} and cache.get("c") == {"n": 3}
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert cache.get("a") is None
+    assert cache.metrics()["misses"] == 2
+
+
+def test_default_service_methods_are_cached(generation_cache):
+    episode = Episode(title="Show")
+    digest = asyncio.run(build_transcript_digest([TranscriptChunk([{"start": 0.0, "end": 5.0, "text": "transcript", "speaker": None}], 1)]))
+    first = asyncio.run(content_generation_service.generate_show_notes(episode, digest))
+    assert asyncio.run(content_generation_service.generate_show_notes(episode, digest)) == first
+    assert generation_cache.metrics()["hits"] == 1
@@ -0,0 +1,277 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api.models import Episode
+from api.services import DraftWriter, LLMProviderError, TranscriptChunk, build_transcript_digest, content_generation_service, get_llm_gateway
+from api.services.content_generation_service import DraftFieldReader
+from api.services.llm_gateway import OpenAIProvider, TokenBucket
+from config import settings
+
+
+class FakeProvider:
+    """
+    Local stand-in for the OpenAI and Anthropic APIs. Each path answers with
+    the scripted (status, headers, delay) replies in turn, then with 200s
+    that echo the prompt (or send the path's text in replies).
+    """
+
+    def __init__(self):
+        self.scripts = {}
+        self.replies = {}
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.delays = {}
+        self.lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+                with fake.lock:
+                    fake.requests.append(self.path)
+                    fake.active += 1
+                    fake.max_active = max(fake.max_active, fake.active)
+                    script = fake.scripts.get(self.path) or []
+                    status, headers, delay = script.pop(0) if script else (200, {}, fake.delays.get(self.path, 0))
+                time.sleep(delay)
+                with fake.lock:
+                    fake.active -= 1
+                if status == 200 and body.get("stream"):
+                    self.send_stream(body)
+                    return
+                if status == 200 and self.path == "/v1/messages":
+                    text = fake.replies.get(self.path) or f"anthropic: {body['messages'][0]['content']}"
+                    reply = {"content": [{"type": "text", "text": text}],
+                             "usage": {"input_tokens": 5, "output_tokens": 3}}
+                elif status == 200:
+                    text = fake.replies.get(self.path) or f"openai: {body['messages'][0]['content']}"
+                    reply = {"choices": [{"message": {"content": text}}],
+                             "usage": {"prompt_tokens": 5, "completion_tokens": 3}}
+                else:
+                    reply = {"error": {"message": f"status {status}"}}
+                data = json.dumps(reply).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def send_stream(self, body):
+                words = (fake.replies.get(self.path) or f"{self.path.split('/')[-1]}: {body['messages'][0]['content']}").split(" ")
+                pieces = [word + " " for word in words[:-1]] + words[-1:]
+                if self.path == "/v1/messages":
+                    events = [{"type": "message_start", "message": {"usage": {"input_tokens": 5}}}]
+                    events += [{"type": "content_block_delta", "delta": {"type": "text_delta", "text": piece}} for piece in pieces]
+                    events += [{"type": "message_delta", "usage": {"output_tokens": 3}}]
+                else:
+                    events = [{"choices": [{"delta": {"content": piece}}]} for piece in pieces]
+                    events += [{"choices": [], "usage": {"prompt_tokens": 5, "completion_tokens": 3}}]
+                self.send_response(200)
+                self.send_header("content-type", "text/event-stream")
+                self.end_headers()
+                for event in events:
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+                    self.wfile.flush()
+                if self.path != "/v1/messages":
+                    self.wfile.write(b"data: [DONE]\n\n")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    fake = FakeProvider()
+    monkeypatch.setattr(settings, "openai_api_key", "openai-key")
+    monkeypatch.setattr(settings, "anthropic_api_key", "anthropic-key")
+    monkeypatch.setattr(settings, "openai_base_url", fake.url)
+    monkeypatch.setattr(settings, "anthropic_base_url", fake.url)
+    monkeypatch.setattr(settings, "llm_backoff_base_seconds", 0.01)
+    monkeypatch.setattr(settings, "llm_max_retries", 2)
+    yield fake
+    fake.server.shutdown()
+    fake.server.server_close()
+
+
+async def complete(prompt="hello"):
+    return await get_llm_gateway().complete(prompt, max_tokens=10)
+
+
+def test_rate_limited_request_waits_for_retry_after(fake_provider):
+    fake_provider.scripts["/chat/completions"] = [(429, {"retry-after": "0.3"}, 0)]
+
+    started = time.perf_counter()
+    response = asyncio.run(complete())
+    assert time.perf_counter() - started >= 0.3
+    assert (response.provider, response.text) == ("openai", "openai: hello")
+    assert (response.input_tokens, response.output_tokens) == (5, 3)
+    assert fake_provider.requests == ["/chat/completions", "/chat/completions"]
+
+
+def test_failing_provider_fails_over_to_the_next(fake_provider):
+    fake_provider.scripts["/chat/completions"] = [(503, {}, 0)] * 3
+    assert asyncio.run(complete()).provider == "anthropic"
+    assert fake_provider.requests == ["/chat/completions"] * 3 + ["/v1/messages"]
+
+    # Client errors are not retried, and with no provider left they surface
+    fake_provider.requests.clear()
+    fake_provider.scripts["/chat/completions"] = [(400, {}, 0)]
+    fake_provider.scripts["/v1/messages"] = [(401, {}, 0)]
+    with pytest.raises(LLMProviderError) as error:
+        asyncio.run(complete())
+    assert (error.value.provider, error.value.status_code) == ("anthropic", 401)
+    assert fake_provider.requests == ["/chat/completions", "/v1/messages"]
+
+
+def test_failed_attempts_give_their_tokens_back(fake_provider, monkeypatch):
+    monkeypatch.setattr(settings, "llm_openai_tokens_per_minute", 60)
+    fake_provider.scripts["/chat/completions"] = [(503, {}, 0)] * 3
+
+    async def run():
+        await complete()
+        return get_llm_gateway().providers[0].tokens
+
+    tokens = asyncio.run(run())
+    assert tokens.level == tokens.capacity
+
+
+def test_unparseable_reply_keeps_its_token_estimate(fake_provider, monkeypatch):
+    monkeypatch.setattr(settings, "llm_openai_tokens_per_minute", 60)
+    fake_provider.replies["/chat/completions"] = "ignored"
+
+    def unparseable(self, data):
+        raise KeyError("choices")
+
+    monkeypatch.setattr(OpenAIProvider, "parse_response", unparseable)
+
+    async def run():
+        with pytest.raises(KeyError):
+            await complete()
+        return get_llm_gateway().providers[0].tokens
+
+    tokens = asyncio.run(run())
+    assert tokens.level < tokens.capacity - 10
+
+
+def test_slow_primary_is_hedged_to_the_second_provider(fake_provider, monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedge_requests", True)
+    monkeypatch.setattr(settings, "llm_hedge_after_ms", 100)
+    fake_provider.delays["/chat/completions"] = 1.0
+
+    started = time.perf_counter()
+    response = asyncio.run(complete())
+    assert time.perf_counter() - started < 0.8
+    assert response.provider == "anthropic"
+
+
+def test_hedge_target_is_not_sent_the_request_twice(fake_provider, monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedge_requests", True)
+    monkeypatch.setattr(settings, "llm_hedge_after_ms", 100)
+    fake_provider.scripts["/chat/completions"] = [(503, {}, 0.3)] * 3
+    fake_provider.scripts["/v1/messages"] = [(503, {}, 0)] * 3
+
+    with pytest.raises(LLMProviderError):
+        asyncio.run(complete())
+    assert fake_provider.requests.count("/chat/completions") == 3
+    assert fake_provider.requests.count("/v1/messages") == 3
+
+
+def test_concurrency_is_capped_per_provider(fake_provider, monkeypatch):
+    monkeypatch.setattr(settings, "llm_openai_max_concurrency", 2)
+    fake_provider.delays["/chat/completions"] = 0.1
+
+    async def burst():
+        return await asyncio.gather(*(complete(f"prompt {index}") for index in range(6)))
+
+    responses = asyncio.run(burst())
+    assert [response.text for response in responses] == [f"openai: prompt {index}" for index in range(6)]
+    assert fake_provider.max_active == 2
+
+
+def test_completion_streams_and_fails_over_before_the_first_token(fake_provider):
+    fake_provider.scripts["/chat/completions"] = [(503, {}, 0)] * 3
+
+    async def collect():
+        return [piece async for piece in get_llm_gateway().stream("stream me", max_tokens=10)]
+
+    assert asyncio.run(collect()) == ["messages: ", "stream ", "me"]
+    assert fake_provider.requests == ["/chat/completions"] * 3 + ["/v1/messages"]
+
+    fake_provider.requests.clear()
+    assert "".join(asyncio.run(collect())) == "completions: stream me"
+    assert fake_provider.requests == ["/chat/completions"]
+
+
+def test_token_bucket_holds_requests_past_the_rate():
+    async def drain():
+        bucket = TokenBucket(per_minute=600)
+        await bucket.acquire(600)
+        started = time.perf_counter()
+        await bucket.acquire(2)
+        return time.perf_counter() - started
+
+    assert 0.15 <= asyncio.run(drain()) < 0.5
+
+
+def test_token_bucket_without_a_rate_is_unlimited():
+    async def drain():
+        bucket = TokenBucket(per_minute=0)
+        await bucket.acquire(10 ** 6)
+        bucket.refund(10)
+        await bucket.acquire(10 ** 6)
+
+    asyncio.run(asyncio.wait_for(drain(), timeout=1))
+
+
+def test_transcript_chunks_are_summarized_by_the_model(fake_provider):
+    fake_provider.replies["/chat/completions"] = '```json\n{"topic": "Shipping weekly", "summary": "The host explains the schedule."}\n```'
+    segments = [
+        {"start": 0.0, "end": 5.0, "text": "previous part", "speaker": "Host"},
+        {"start": 65.0, "end": 70.0, "text": "we ship every week", "speaker": "Host"}
+    ]
+
+    summary = asyncio.run(content_generation_service.summarize_transcript_chunk(segments, overlap_segments=1))
+
+    assert (summary["time"], summary["topic"], summary["summary"]) == ("01:05", "Shipping weekly", "The host explains the schedule.")
+    assert summary["speakers"] == {"Host": 4}
+    assert fake_provider.requests == ["/chat/completions"]
+
+
+def test_generator_streams_model_output_into_its_draft(fake_provider, db, user):
+    episode = Episode(user_id=user.id, title="Streamed Episode", audio_url="uploads/s.mp3")
+    db.add(episode)
+    db.commit()
+    fake_provider.replies["/chat/completions"] = '{"topic": "Topic", "summary": "Summary"}'
+    digest = asyncio.run(build_transcript_digest([TranscriptChunk([{"start": 0.0, "end": 5.0, "text": "transcript", "speaker": None}], 1)]))
+    blog_post = {"title": "Model Title", "content": "Streamed \"blog\" body, caf\u00e9 \U0001f3a7 and more", "word_count": 7}
+    fake_provider.replies["/chat/completions"] = "Here it is: " + json.dumps(blog_post)
+    fake_provider.requests.clear()
+    draft = DraftWriter(db, episode.id, "blog_post", flush_interval_ms=0)
+    appended = []
+    append = draft.append
+    draft.append = lambda text: appended.append(text) or append(text)
+
+    draft.start()
+    content = asyncio.run(content_generation_service.generate_blog_post(episode, digest, draft=draft))
+
+    assert content == blog_post
+    assert len(appended) > 1 and draft.text == blog_post["content"]
+    assert fake_provider.requests == ["/chat/completions"]
+
+
+def test_draft_field_reader_decodes_escapes_split_across_deltas():
+    reply = json.dumps({"title": "x", "content": "a \"quoted\" line\ncaf\u00e9 \U0001f3a7", "tail": "y"})
+    reader = DraftFieldReader("content")
+    assert "".join(reader.feed(char) for char in reply) == "a \"quoted\" line\ncaf\u00e9 \U0001f3a7"
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from api.models import ContentDraft, Episode, ProcessingJob
+from api.services import (
+    DraftWriter,
+    ProgressReporter,
+    TranscriptChunk,
+    build_transcript_digest,
+    content_generation_service,
+    get_draft_hub,
+    get_progress_hub,
+    update_processing_job_status
+)
+
+
+def add_episode_with_job(db, user):
+    episode = Episode(user_id=user.id, title="Live", audio_url="uploads/live.mp3")
+    db.add(episode)
+    db.commit()
+    job = ProcessingJob(episode_id=episode.id, job_type="all", status="pending", progress=0)
+    db.add(job)
+    db.commit()
+    return episode.id, job.id
+
+
+def wait_for_viewer(episode_id, timeout=5, hub=None):
+    deadline = time.monotonic() + timeout
+    while not (hub or get_progress_hub()).subscribers.get(episode_id):
+        assert time.monotonic() < deadline, "viewer never subscribed"
+        time.sleep(0.01)
+
+
+def test_sse_streams_snapshot_then_updates_until_done(client, db, user, auth_headers):
+    episode_id, job_id = add_episode_with_job(db, user)
+
+    def worker():
+        wait_for_viewer(episode_id)
+        update_processing_job_status(db, job_id, "processing", 40)
+        update_processing_job_status(db, job_id, "completed", 100)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    response = client.get(f"/api/v1/episodes/{episode_id}/progress/stream", headers=auth_headers)
+    thread.join()
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    assert [(event["status"], event["progress"]) for event in events] == [
+        ("pending", 0), ("processing", 40), ("completed", 100)
+    ]
+    assert not get_progress_hub().subscribers
+
+
+def test_websocket_streams_progress(client, db, user, auth_headers):
+    episode_id, job_id = add_episode_with_job(db, user)
+    token = auth_headers["Authorization"].split()[1]
+
+    with client.websocket_connect(f"/api/v1/episodes/{episode_id}/progress/ws?token={token}") as websocket:
+        assert websocket.receive_json()["status"] == "pending"
+        update_processing_job_status(db, job_id, "processing", 10)
+        assert websocket.receive_json()["progress"] == 10
+        update_processing_job_status(db, job_id, "failed", 0, "boom")
+        assert websocket.receive_json()["error_log"] == "boom"
+
+
+def test_draft_streams_while_the_blog_post_is_written(client, db, user, auth_headers):
+    episode_id, _ = add_episode_with_job(db, user)
+    episode = db.get(Episode, episode_id)
+    segment = {"start": 0.0, "end": 5.0, "text": "we talk about shipping a show every week", "speaker": "Host"}
+    digest = asyncio.run(build_transcript_digest([TranscriptChunk([segment], 10)]))
+    generated = {}
+
+    def worker():
+        wait_for_viewer(episode_id, hub=get_draft_hub())
+        draft = DraftWriter(db, episode_id, "blog_post", flush_interval_ms=0)
+        draft.start()
+        generated.update(asyncio.run(content_generation_service.generate_blog_post(episode, digest, draft=draft)))
+        draft.finish("completed")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    response = client.get(f"/api/v1/episodes/{episode_id}/drafts/blog_post/stream", headers=auth_headers)
+    thread.join()
+
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    assert len(events) > 2
+    assert events[-1]["status"] == "completed" and events[-1]["text"] == generated["content"]
+    assert all(generated["content"].startswith(event["text"]) for event in events)
+    db.expire_all()
+    assert db.query(ContentDraft).filter(ContentDraft.episode_id == episode_id).one().text == generated["content"]
+
+    # Once finished, the saved draft is all a new viewer gets
+    response = client.get(f"/api/v1/episodes/{episode_id}/drafts/blog_post/stream", headers=auth_headers)
+    assert [line for line in response.text.splitlines() if line.startswith("event: ")] == ["event: draft"]
+    assert client.get(f"/api/v1/episodes/{episode_id}/drafts/podcast/stream", headers=auth_headers).status_code == 404
+
+
+def test_progress_stream_requires_owner(client, db, user):
+    episode_id, _ = add_episode_with_job(db, user)
+    assert client.get(f"/api/v1/episodes/{episode_id}/progress/stream").status_code == 401
+
+
+def test_failed_snapshot_drops_the_subscription(client, db, user, auth_headers, monkeypatch):
+    from api.routers import progress
+
+    episode_id, _ = add_episode_with_job(db, user)
+
+    async def fail(*args):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(progress, "get_latest_processing_job_async", fail)
+    monkeypatch.setattr(progress, "get_content_draft_async", fail)
+    for path in ["progress/stream", "drafts/blog_post/stream"]:
+        with pytest.raises(RuntimeError):
+            client.get(f"/api/v1/episodes/{episode_id}/{path}", headers=auth_headers)
+    assert not get_progress_hub().subscribers
+    assert not get_draft_hub().subscribers
+
+
+def test_progress_reporter_coalesces_writes(db, user, progress_broker):
+    episode_id, job_id = add_episode_with_job(db, user)
+    reporter = ProgressReporter(db, db.get(ProcessingJob, job_id), flush_interval_ms=60_000)
+    published = []
+    progress_broker.publish = published.append
+    updates = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE processing_jobs"):
+            updates.append(parameters)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        reporter.report("processing", 10)
+        for progress in range(11, 40):
+            reporter.report("processing", progress)
+        db.expire_all()
+        job = db.get(ProcessingJob, job_id)
+        assert (job.progress, job.completed_at) == (10, None)
+        assert job.started_at is not None
+
+        reporter.report("completed", 100)
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert len(updates) == 2
+    assert [event["progress"] for event in published] == list(range(10, 40)) + [100]
+    db.expire_all()
+    job = db.get(ProcessingJob, job_id)
+    assert (job.status, job.progress) == ("completed", 100)
+    assert job.completed_at is not None
+
+
+def test_progress_reporter_announces_status_changes_after_commit(db, user, progress_broker, monkeypatch):
+    from api.services import processing_job_service
+
+    episode_id, job_id = add_episode_with_job(db, user)
+    reporter = ProgressReporter(db, db.get(ProcessingJob, job_id))
+    published = []
+    progress_broker.publish = published.append
+
+    def fail(*args):
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(processing_job_service, "write_processing_job_status", fail)
+    with pytest.raises(RuntimeError):
+        reporter.report("completed", 100)
+    assert published == []
@@ -0,0 +1,63 @@
+from api.services import MemoryEpisodeScheduler
+from config import settings
+
+
+def test_fair_share_favours_paying_tiers_without_starving_free(monkeypatch):
+    monkeypatch.setattr(settings, "scheduler_max_in_flight", 2)
+    scheduler = MemoryEpisodeScheduler()
+    started = []
+    for episode_id in range(100, 120):
+        started += scheduler.submit(episode_id, user_id=1, tier="agency")
+    for episode_id in range(200, 205):
+        started += scheduler.submit(episode_id, user_id=2, tier="free")
+    assert started == [100, 101]
+
+    # Each completion frees one slot; record who gets it
+    for _ in range(18):
+        started += scheduler.complete(started[-2])
+    agency = [episode_id for episode_id in started if episode_id < 200]
+    free = [episode_id for episode_id in started if episode_id >= 200]
+    assert agency == sorted(agency) and free == sorted(free)
+    assert 2 <= len(free) <= 4
+    assert 200 in started[:10]
+
+    metrics = scheduler.metrics()
+    assert metrics["in_flight"] == 2
+    assert metrics["tiers"]["free"]["queued"] == 5 - len(free)
+    assert metrics["tiers"]["agency"]["dispatched_total"] == len(agency)
+
+
+def test_per_user_cap_holds_back_a_tenant(monkeypatch):
+    monkeypatch.setattr(settings, "scheduler_max_in_flight", 10)
+    scheduler = MemoryEpisodeScheduler()
+    assert scheduler.submit(1, user_id=1, tier="free") == [1]
+    assert scheduler.submit(2, user_id=1, tier="free") == []
+    assert scheduler.submit(3, user_id=2, tier="starter") == [3]
+    assert scheduler.metrics()["tiers"]["free"]["queued"] == 1
+
+    assert scheduler.complete(1) == [2]
+    assert scheduler.complete(1) == []
+
+
+def test_lost_episode_slot_is_reclaimed_after_its_lease(monkeypatch):
+    monkeypatch.setattr(settings, "scheduler_max_in_flight", 1)
+    scheduler = MemoryEpisodeScheduler()
+    assert scheduler.submit(1, user_id=1, tier="agency") == [1]
+    assert scheduler.submit(2, user_id=2, tier="agency") == []
+
+    monkeypatch.setattr(settings, "scheduler_lease_seconds", -1)
+    assert scheduler.submit(3, user_id=3, tier="agency") == [2]
+
+
+def test_scheduler_metrics_endpoint(client, db, auth_headers, dispatched_episodes, episode_scheduler):
+    response = client.post(
+        "/api/v1/episodes/upload?title=Queued&filename=queued.mp3",
+        content=b"audio",
+        headers={**auth_headers, "Content-Type": "audio/mpeg"}
+    )
+    assert response.status_code == 200
+    assert dispatched_episodes == [response.json()["id"]]
+    assert client.get("/metrics/scheduler").status_code == 401
+    metrics = client.get("/metrics/scheduler", headers=auth_headers).json()
+    assert metrics["in_flight"] == 1
+    assert metrics["tiers"]["free"]["running"] == 1
@@ -0,0 +1,87 @@
+from sqlalchemy.orm import Session
+
+from api.models import Episode, User
+from api.services import index_document
+from api.services.search_service import HEADLINE_START, HEADLINE_STOP, highlight_snippet, mark_headline
+
+
+def add_episode(db, user, title):
+    episode = Episode(user_id=user.id, title=title, audio_url=f"uploads/{title}.mp3")
+    db.add(episode)
+    db.commit()
+    return episode
+
+
+def test_search_ranks_and_highlights(client, db, user, auth_headers):
+    remote = add_episode(db, user, "Remote work")
+    cooking = add_episode(db, user, "Cooking")
+    index_document(db, user.id, remote.id, "transcript", 1, remote.title,
+                   "We talk about remote work, async meetings and remote hiring for remote teams.")
+    index_document(db, user.id, cooking.id, "transcript", 2, cooking.title,
+                   "Sourdough starters, and one remote mention at the end.")
+    index_document(db, user.id, remote.id, "blog_post", 1, "Why remote work wins", "A blog post.")
+
+    response = client.get("/api/v1/search/", params={"q": "remote"}, headers=auth_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 3
+    assert [r["episode_title"] for r in body["results"]][-1] == "Cooking"
+    assert "<mark>remote</mark>" in body["results"][0]["snippet"]
+
+    page = client.get("/api/v1/search/", params={"q": "remote", "page": 2, "page_size": 2}, headers=auth_headers).json()
+    assert len(page["results"]) == 1
+
+    filtered = client.get("/api/v1/search/", params={"q": "remote", "source_type": "blog_post"}, headers=auth_headers).json()
+    assert [r["source_type"] for r in filtered["results"]] == ["blog_post"]
+
+
+def test_search_is_scoped_to_user_and_updates_incrementally(client, db, user, auth_headers):
+    other = User(email="other@example.com", hashed_password="x")
+    db.add(other)
+    db.commit()
+    mine = add_episode(db, user, "Mine")
+    theirs = add_episode(db, other, "Theirs")
+    index_document(db, other.id, theirs.id, "transcript", 2, theirs.title, "kubernetes deep dive")
+
+    assert client.get("/api/v1/search/", params={"q": "kubernetes"}, headers=auth_headers).json()["total"] == 0
+
+    index_document(db, user.id, mine.id, "transcript", 1, mine.title, "intro to kubernetes")
+    results = client.get("/api/v1/search/", params={"q": "kubernetes"}, headers=auth_headers).json()["results"]
+    assert [r["episode_id"] for r in results] == [mine.id]
+
+
+def test_rolled_back_documents_never_reach_the_index(client, db, user, auth_headers):
+    episode = add_episode(db, user, "Drafts")
+    client.get("/api/v1/search/", params={"q": "warmup"}, headers=auth_headers)
+
+    index_document(db, user.id, episode.id, "transcript", 1, episode.title, "zeppelin history", commit=False)
+    db.rollback()
+    assert client.get("/api/v1/search/", params={"q": "zeppelin"}, headers=auth_headers).json()["total"] == 0
+
+    index_document(db, user.id, episode.id, "transcript", 1, episode.title, "zeppelin history", commit=False)
+    db.commit()
+    assert client.get("/api/v1/search/", params={"q": "zeppelin"}, headers=auth_headers).json()["total"] == 1
+
+
+def test_snippets_escape_markup_without_breaking_entities():
+    body = "<p>Tom & Jerry said \"amp it up\" &amp; left</p>"
+    snippet = highlight_snippet(body, ["amp"])
+    assert snippet == (
+        "&lt;p&gt;Tom &amp; Jerry said &quot;<mark>amp</mark> it up&quot; "
+        "&amp;<mark>amp</mark>; left&lt;/p&gt;"
+    )
+    assert mark_headline(f"<b>{HEADLINE_START}Tom{HEADLINE_STOP}</b>") == "&lt;b&gt;<mark>Tom</mark>&lt;/b&gt;"
+
+
+def test_index_follows_writes_from_other_sessions_and_deletes(client, db, user, auth_headers):
+    episode = add_episode(db, user, "Elsewhere")
+    assert client.get("/api/v1/search/", params={"q": "quasar"}, headers=auth_headers).json()["total"] == 0
+
+    # A worker process writes through its own session
+    worker = Session(db.get_bind())
+    index_document(worker, user.id, episode.id, "transcript", 1, episode.title, "quasar astronomy")
+    worker.close()
+    assert client.get("/api/v1/search/", params={"q": "quasar"}, headers=auth_headers).json()["total"] == 1
+
+    assert client.delete(f"/api/v1/episodes/{episode.id}", headers=auth_headers).status_code == 200
+    assert client.get("/api/v1/search/", params={"q": "quasar"}, headers=auth_headers).json()["total"] == 0
@@ -0,0 +1,46 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from api.services.storage_service import FileTooLargeError, LocalFileWriter, LocalStorageBackend, save_upload_stream
+
+
+async def chunked(data: bytes, chunk_size: int = 4):
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+
+
+def test_save_upload_stream_writes_file_and_hash(tmp_path):
+    backend = LocalStorageBackend(str(tmp_path))
+    data = b"podcast audio bytes" * 10
+
+    stored = asyncio.run(save_upload_stream(chunked(data), "episode.mp3", max_size=1024, backend=backend))
+
+    assert stored.size == len(data)
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+    with open(stored.url, "rb") as f:
+        assert f.read() == data
+
+
+def test_save_upload_stream_rejects_oversized_upload(tmp_path):
+    backend = LocalStorageBackend(str(tmp_path))
+
+    with pytest.raises(FileTooLargeError):
+        asyncio.run(save_upload_stream(chunked(b"x" * 100), "episode.mp3", max_size=10, backend=backend))
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_save_upload_stream_discards_partial_file_when_commit_fails(tmp_path, monkeypatch):
+    backend = LocalStorageBackend(str(tmp_path))
+
+    async def failing_commit(self):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(LocalFileWriter, "commit", failing_commit)
+    with pytest.raises(OSError, match="disk full"):
+        asyncio.run(save_upload_stream(chunked(b"x" * 100), "episode.mp3", max_size=1024, backend=backend))
+
+    assert os.listdir(tmp_path) == []
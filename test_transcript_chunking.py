@@ -0,0 +1,49 @@
+from api.models import Episode, Transcript
+from api.services import bulk_insert_segments, chunk_transcript, chunk_transcript_segments, count_tokens
+
+
+def make_segments(speakers):
+    return [
+        {"start": index * 5.0, "end": index * 5.0 + 5, "text": f"line {index}", "speaker": speaker}
+        for index, speaker in enumerate(speakers)
+    ]
+
+
+def test_chunks_end_at_a_speaker_change_and_overlap():
+    segments = make_segments(["A", "A", "A", "B", "B", "B", "B", "A", "A", "A"])
+    chunks = chunk_transcript_segments(segments, [10] * 10, max_tokens=50, overlap_tokens=10)
+
+    # The budget fits five segments; the first chunk stops where B starts
+    assert [len(chunk.segments) for chunk in chunks] == [3, 5, 4]
+    assert chunks[1].segments[0] == segments[2] and chunks[1].overlap_segments == 1
+    assert [chunk.token_count - chunk.overlap_tokens for chunk in chunks] == [30, 40, 30]
+    assert all(chunk.token_count <= 50 for chunk in chunks)
+    assert (chunks[-1].start, chunks[-1].end) == (30.0, 50.0)
+
+
+def test_oversized_segment_gets_its_own_chunk():
+    segments = make_segments(["A", "A", "A"])
+    chunks = chunk_transcript_segments(segments, [5, 80, 5], max_tokens=50)
+    assert [[segment["text"] for segment in chunk.segments] for chunk in chunks] == [["line 0"], ["line 1"], ["line 2"]]
+
+
+def test_stored_transcript_is_encoded_once(db, user, encoding, monkeypatch):
+    episode = Episode(user_id=user.id, title="Chunked", audio_url="uploads/c.mp3")
+    db.add(episode)
+    db.commit()
+    transcript = Transcript(episode_id=episode.id, text="", word_count=0)
+    db.add(transcript)
+    db.commit()
+    segments = make_segments(["A", "B"] * 50)
+    bulk_insert_segments(db, transcript.id, segments)
+    db.commit()
+
+    batches = []
+    encode_ordinary_batch = encoding.encode_ordinary_batch
+    monkeypatch.setattr(encoding, "encode_ordinary_batch", lambda texts: batches.append(len(texts)) or encode_ordinary_batch(texts))
+
+    first = chunk_transcript(db, transcript.id, max_tokens=100, overlap_tokens=0)
+    again = chunk_transcript(db, transcript.id, max_tokens=200, overlap_tokens=20)
+    assert batches == [100]
+    assert sum(chunk.token_count for chunk in first) == sum(count_tokens(segment["text"]) for segment in segments)
+    assert len(again) < len(first)
@@ -0,0 +1,158 @@
+import asyncio
+import importlib
+import json
+
+import httpx
+import pytest
+
+from api.models import Episode
+from api.services import TranscriptWriter, get_segments_by_speaker, get_segments_in_range, iter_transcript_segments
+from api.services.transcription_chunking import plan_cut_points, transcribe_in_windows
+from api.services.transcription_providers import AssemblyAIProvider, LocalTranscriptionProvider, TranscriptionProviderError
+from api.services.transcription_service import TranscriptionService
+from api.workflows.transcript_stream import TranscriptStream
+from config import settings
+
+
+def make_script(duration=3600.0):
+    """
+    Two speakers taking turns every 30 seconds, one word every 0.5s with a
+    1.5s pause at every turn change
+    """
+    words, silences = [], []
+    t, turn = 0.0, 0
+    while t < duration:
+        speaker = "Host" if turn % 2 == 0 else "Guest"
+        turn_end = t + 30
+        while t < turn_end - 1.5:
+            words.append({"text": f"w{len(words)}", "start": t, "end": t + 0.4, "speaker": speaker})
+            t += 0.5
+        silences.append((t, t + 1.5))
+        t = turn_end
+        turn += 1
+    return words, silences
+
+
+def test_cut_points_snap_to_silences():
+    _, silences = make_script(3600)
+    cuts = plan_cut_points(3600, 600, silences)
+    midpoints = {(start + end) / 2 for start, end in silences}
+
+    assert cuts[0] == 0 and cuts[-1] == 3600
+    assert all(cut in midpoints for cut in cuts[1:-1])
+
+
+def test_chunked_transcription_stitches_windows():
+    words, silences = make_script(3600)
+    provider = LocalTranscriptionProvider(words, latency_seconds=0.1)
+
+    transcript = asyncio.run(transcribe_in_windows(
+        provider, "episode.wav", 3600, window_seconds=600, overlap_seconds=20, max_concurrency=6, silences=silences
+    ))
+
+    assert len(provider.calls) == 6
+    assert provider.max_active == 6  # all windows were in flight together
+    assert transcript["text"] == " ".join(word["text"] for word in words)
+    assert transcript["word_count"] == len(words)
+    assert transcript["speakers"] == ["Speaker 1", "Speaker 2"]
+
+    starts = [segment["start"] for segment in transcript["segments"]]
+    assert starts == sorted(starts)
+    true_speakers = {word["text"]: word["speaker"] for word in words}
+    label_for = {}
+    for segment in transcript["segments"]:
+        speaker = true_speakers[segment["text"].split()[0]]
+        assert label_for.setdefault(speaker, segment["speaker"]) == segment["speaker"]
+
+
+def test_short_audio_uses_single_request():
+    words, _ = make_script(120)
+    provider = LocalTranscriptionProvider(words)
+    service = TranscriptionService(provider=provider)
+
+    transcript = asyncio.run(service.transcribe_audio("remote://episode.mp3", duration=120))
+
+    assert provider.calls == [(0, None)]
+    assert transcript["speakers"] == ["Speaker 1", "Speaker 2"]
+    assert transcript["word_count"] == len(words)
+
+
+def test_remote_audio_is_probed_and_chunked_at_window_offsets(monkeypatch):
+    words, _ = make_script(3600)
+    provider = LocalTranscriptionProvider(words)
+    service = TranscriptionService(provider=provider)
+    probed = []
+    # The package exports the service instance under the module's name
+    module = importlib.import_module("api.services.transcription_service")
+    monkeypatch.setattr(module, "probe_duration", lambda url: probed.append(url) or 3600.0)
+    monkeypatch.setattr(settings, "transcription_window_seconds", 600)
+    monkeypatch.setattr(settings, "transcription_window_overlap_seconds", 20)
+
+    transcript = asyncio.run(service.transcribe_audio("https://cdn.example.com/episode.mp3"))
+
+    assert probed == ["https://cdn.example.com/episode.mp3"]
+    assert [start for start, _ in provider.calls] == [0.0, 590.0, 1190.0, 1790.0, 2390.0, 2990.0]
+    assert transcript["text"] == " ".join(word["text"] for word in words)
+
+
+def test_assemblyai_gives_up_on_a_job_that_never_finishes():
+    polls = []
+
+    def handler(request):
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": "stuck"})
+        polls.append(request.url.path)
+        return httpx.Response(200, json={"id": "stuck", "status": "queued"})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            provider = AssemblyAIProvider("key", poll_interval_seconds=0.01, client=client, poll_timeout_seconds=0.05)
+            await provider.transcribe_window("https://example.com/a.mp3", 0, None)
+
+    with pytest.raises(TranscriptionProviderError, match="not done"):
+        asyncio.run(run())
+    assert 2 <= len(polls) < 20
+
+
+def test_transcript_writer_appends_batches(db, user):
+    episode = Episode(user_id=user.id, title="Streamed", audio_url="uploads/a.mp3")
+    db.add(episode)
+    db.commit()
+    segments = [
+        {"start": i * 10.0, "end": i * 10.0 + 9, "text": f"segment number {i}", "speaker": f"Speaker {i % 2 + 1}"}
+        for i in range(5)
+    ]
+
+    writer = TranscriptWriter(db, episode.id, batch_size=2)
+    for segment in segments:
+        writer.add(segment)
+    transcript = writer.finish()
+
+    assert list(iter_transcript_segments(db, transcript.id, batch_size=2)) == segments
+    assert transcript.segments_json is None
+    assert json.loads(transcript.speakers_json) == ["Speaker 1", "Speaker 2"]
+    assert transcript.text == " ".join(segment["text"] for segment in segments)
+    assert transcript.word_count == 15
+
+    in_range = get_segments_in_range(db, transcript.id, 15, 30)
+    assert [segment["text"] for segment in in_range] == ["segment number 1", "segment number 2"]
+    by_speaker = get_segments_by_speaker(db, transcript.id, "Speaker 2")
+    assert [segment["start"] for segment in by_speaker] == [10.0, 30.0]
+
+
+def test_stream_subscribers_see_every_segment():
+    async def run():
+        stream = TranscriptStream()
+
+        async def collect():
+            return [segment["text"] async for segment in stream.subscribe()]
+
+        early = asyncio.create_task(collect())
+        for i in range(3):
+            await stream.publish({"text": str(i)})
+            await asyncio.sleep(0)
+        late = asyncio.create_task(collect())
+        await stream.close()
+        return await early, await late
+
+    assert asyncio.run(run()) == (["0", "1", "2"], ["0", "1", "2"])
@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+from config import settings
+
+
+def start_upload(client, auth_headers, total_size):
+    response = client.post(
+        "/api/v1/uploads/",
+        json={
+            "title": "Long Episode",
+            "filename": "episode.wav",
+            "content_type": "audio/wav",
+            "total_size": total_size
+        },
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_resumable_upload_out_of_order_with_retry(client, auth_headers, dispatched_episodes, monkeypatch):
+    monkeypatch.setattr(settings, "resumable_upload_part_size_bytes", 4)
+    data = b"0123456789"
+    upload = start_upload(client, auth_headers, len(data))
+    upload_id = upload["upload_id"]
+    assert upload["total_parts"] == 3
+
+    for part_number in [3, 1, 1]:
+        chunk = data[(part_number - 1) * 4:part_number * 4]
+        response = client.put(f"/api/v1/uploads/{upload_id}/parts/{part_number}", content=chunk, headers=auth_headers)
+        assert response.status_code == 200
+
+    status = client.get(f"/api/v1/uploads/{upload_id}", headers=auth_headers).json()
+    assert status["received_parts"] == [1, 3]
+    assert status["missing_parts"] == [2]
+
+    response = client.post(f"/api/v1/uploads/{upload_id}/complete", headers=auth_headers)
+    assert response.status_code == 400
+
+    client.put(f"/api/v1/uploads/{upload_id}/parts/2", content=data[4:8], headers=auth_headers)
+    response = client.post(f"/api/v1/uploads/{upload_id}/complete", headers=auth_headers)
+    assert response.status_code == 200
+    episode = response.json()
+    assert episode["file_size"] == len(data)
+    assert dispatched_episodes == [episode["id"]]
+    with open(episode["audio_url"], "rb") as f:
+        assert f.read() == data
+
+    # Completing again is idempotent
+    response = client.post(f"/api/v1/uploads/{upload_id}/complete", headers=auth_headers)
+    assert response.json()["id"] == episode["id"]
+    assert dispatched_episodes == [episode["id"]]
+
+
+def test_failed_completion_keeps_parts_for_retry(client, auth_headers, dispatched_episodes, monkeypatch):
+    from api.routers import uploads
+
+    monkeypatch.setattr(settings, "resumable_upload_part_size_bytes", 4)
+    data = b"0123456789"
+    upload_id = start_upload(client, auth_headers, len(data))["upload_id"]
+    for part_number in [1, 2, 3]:
+        chunk = data[(part_number - 1) * 4:part_number * 4]
+        client.put(f"/api/v1/uploads/{upload_id}/parts/{part_number}", content=chunk, headers=auth_headers)
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("database went away")
+
+    complete = uploads.complete_upload_session_async
+    monkeypatch.setattr(uploads, "complete_upload_session_async", fail)
+    with pytest.raises(RuntimeError):
+        client.post(f"/api/v1/uploads/{upload_id}/complete", headers=auth_headers)
+
+    status = client.get(f"/api/v1/uploads/{upload_id}", headers=auth_headers).json()
+    assert status["status"] == "active"
+    assert status["missing_parts"] == []
+
+    monkeypatch.setattr(uploads, "complete_upload_session_async", complete)
+    response = client.post(f"/api/v1/uploads/{upload_id}/complete", headers=auth_headers)
+    assert response.status_code == 200
+    with open(response.json()["audio_url"], "rb") as f:
+        assert f.read() == data
+    assert dispatched_episodes == [response.json()["id"]]
+
+
+def test_upload_part_with_wrong_size_is_rejected(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "resumable_upload_part_size_bytes", 4)
+    upload = start_upload(client, auth_headers, 10)
+
+    response = client.put(f"/api/v1/uploads/{upload['upload_id']}/parts/1", content=b"012", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_duplicate_upload_reuses_stored_file(client, auth_headers, storage):
+    data = b"same podcast audio"
+    episodes = []
+    for title in ["Original title", "Edited title"]:
+        response = client.post(
+            "/api/v1/episodes/upload",
+            params={"title": title, "filename": "episode.mp3"},
+            content=data,
+            headers={**auth_headers, "Content-Type": "audio/mpeg"}
+        )
+        assert response.status_code == 200
+        episodes.append(response.json())
+
+    assert episodes[0]["audio_url"] == episodes[1]["audio_url"]
+    assert episodes[0]["content_hash"] == episodes[1]["content_hash"]
+    assert len(os.listdir(storage.root)) == 1
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+
+import httpx
+
+from api.services import close_http_clients, get_http_client
+from api.services.transcription_providers import AssemblyAIProvider
+from api.workers.runtime import WorkerLoop
+
+
+def test_worker_loop_and_http_clients_outlive_tasks():
+    worker_loop = WorkerLoop()
+
+    async def task():
+        return asyncio.get_running_loop(), get_http_client("transcription"), get_http_client("llm")
+
+    first_loop, transcription_client, llm_client = worker_loop.run(task())
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(worker_loop.run(task()))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert transcription_client is not llm_client
+    assert all(result == (first_loop, transcription_client, llm_client) for result in results)
+
+    worker_loop.shutdown()
+    assert transcription_client.is_closed and llm_client.is_closed
+    assert first_loop.is_closed()
+
+
+def test_http_clients_are_not_shared_across_loops():
+    async def client():
+        return get_http_client("transcription")
+
+    async def client_and_close():
+        shared = get_http_client("transcription")
+        await close_http_clients()
+        return shared
+
+    first = asyncio.run(client())
+    second = asyncio.run(client_and_close())
+    assert first is not second
+    assert second.is_closed
+
+
+def test_assemblyai_provider_reuses_the_shared_client(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": "t1"})
+        return httpx.Response(200, json={"status": "completed", "words": [
+            {"text": "hello", "start": 0, "end": 500, "speaker": "A", "confidence": 0.9}
+        ]})
+
+    async def transcribe_twice():
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr("api.services.transcription_providers.get_http_client", lambda name: shared)
+        provider = AssemblyAIProvider("key", poll_interval_seconds=0)
+        results = [await provider.transcribe_window("https://audio", 0, None) for _ in range(2)]
+        assert not shared.is_closed
+        await shared.aclose()
+        return results
+
+    results = asyncio.run(transcribe_twice())
+    assert results[0]["words"][0]["text"] == "hello"
+    assert requests == ["/v2/transcript", "/v2/transcript/t1"] * 2
@@ -0,0 +1,283 @@
+import asyncio
+import json
+import time
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from api.models import AudioObject, BlogPost, Episode, Newsletter, ProcessingJob, SearchDocument, ShowNotes, SocialThread, Transcript, WorkflowCheckpoint
+from api.services import (
+    DatabaseCheckpointStore,
+    TranscriptChunk,
+    build_transcript_digest,
+    chunk_transcript_segments,
+    content_generation_service,
+    iter_transcript_segments,
+    persist_generated_content,
+    transcription_service
+)
+from api.workers import tasks
+from api.workers.celery_app import celery_app
+from api.workflows import Stage, StageFailedError, Workflow, process_episode_content
+from api.workflows.content_processing_workflow import get_enabled_generators
+from config import settings
+
+
+GENERATORS = ["generate_blog_post", "generate_social_media_content", "generate_newsletter_content", "generate_show_notes"]
+
+
+def make_digest():
+    return asyncio.run(build_transcript_digest([TranscriptChunk([{"start": 0.0, "end": 5.0, "text": "transcript", "speaker": "A"}], 1)]))
+
+
+def add_pending_episode(db, user, title):
+    episode = Episode(user_id=user.id, title=title, audio_url="uploads/test.mp3")
+    db.add(episode)
+    db.commit()
+    db.add(ProcessingJob(episode_id=episode.id, job_type="all", status="pending"))
+    db.commit()
+    return episode
+
+
+def test_generators_run_concurrently(db, user, monkeypatch):
+    running = {"now": 0, "peak": 0}
+
+    def overlapping(generator):
+        async def run(episode, digest, draft=None):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.05)
+            running["now"] -= 1
+            return await generator(episode, digest, draft=draft)
+        return run
+
+    for name in GENERATORS:
+        monkeypatch.setattr(content_generation_service, name, overlapping(getattr(content_generation_service, name)))
+    episode = add_pending_episode(db, user, "Concurrent Episode")
+
+    result = asyncio.run(process_episode_content(db, episode.id))
+
+    assert running["peak"] == 4
+    assert set(result["formats"].values()) == {"completed"}
+
+
+def test_generator_failures_are_isolated(db, user, monkeypatch):
+    async def broken_generator(episode, digest, draft=None):
+        raise RuntimeError("provider error")
+
+    async def hanging_generator(episode, digest, draft=None):
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(content_generation_service, "generate_newsletter_content", broken_generator)
+    monkeypatch.setattr(content_generation_service, "generate_show_notes", hanging_generator)
+    monkeypatch.setattr(settings, "content_generation_timeout_seconds", 0.1)
+    episode = add_pending_episode(db, user, "Partly Failing Episode")
+
+    result = asyncio.run(process_episode_content(db, episode.id))
+
+    assert result["formats"] == {"blog_post": "completed", "social_media": "completed", "newsletter": "failed", "show_notes": "failed"}
+    job = db.query(ProcessingJob).filter(ProcessingJob.episode_id == episode.id).one()
+    assert json.loads(job.error_log) == {"newsletter": "provider error", "show_notes": "Timed out after 0.1s"}
+    assert db.query(BlogPost).filter(BlogPost.episode_id == episode.id).count() == 1
+    assert db.query(Newsletter).filter(Newsletter.episode_id == episode.id).count() == 0
+
+
+def test_transcript_is_digested_once_in_parallel_chunks(monkeypatch):
+    summarized = []
+    original_summarize = content_generation_service.summarize_transcript_chunk
+
+    async def slow_summarize(segments, overlap_segments):
+        summarized.append(len(segments))
+        await asyncio.sleep(0.1)
+        return await original_summarize(segments, overlap_segments)
+
+    monkeypatch.setattr(content_generation_service, "summarize_transcript_chunk", slow_summarize)
+    line = "we talked about how small teams can ship podcasts every single week without burning out"
+    segments = [
+        {"start": index * 10.0, "end": index * 10.0 + 10, "text": line, "speaker": "Guest" if index // 5 % 2 else "Host"}
+        for index in range(40)
+    ]
+    chunks = chunk_transcript_segments(segments, [20] * 40, max_tokens=100)
+
+    started = time.perf_counter()
+    digest = asyncio.run(build_transcript_digest(chunks, max_concurrency=10))
+    elapsed = time.perf_counter() - started
+
+    assert summarized == [5] * 8 and elapsed < 0.5
+    assert [topic["time"] for topic in digest["topics"]][:2] == ["00:00", "00:50"]
+    assert digest["speakers"] == [{"speaker": "Host", "words": 20 * 15}, {"speaker": "Guest", "words": 20 * 15}]
+    assert len(digest["quotes"]) == 10
+    assert digest["token_count"] == 40 * 20
+
+
+def test_duplicate_audio_skips_transcription(db, user, monkeypatch):
+    calls = []
+    original_stream_segments = transcription_service.stream_segments
+
+    def counting_stream_segments(audio_url, **kwargs):
+        calls.append(audio_url)
+        return original_stream_segments(audio_url, **kwargs)
+
+    monkeypatch.setattr(transcription_service, "stream_segments", counting_stream_segments)
+    db.add(AudioObject(content_hash="abc", storage_key="a.mp3", audio_url="uploads/a.mp3", file_size=1))
+    db.commit()
+
+    for title in ["First upload", "Re-upload"]:
+        episode = Episode(user_id=user.id, title=title, audio_url="uploads/a.mp3", content_hash="abc")
+        db.add(episode)
+        db.commit()
+        db.add(ProcessingJob(episode_id=episode.id, job_type="all", status="pending"))
+        db.commit()
+        asyncio.run(process_episode_content(db, episode.id))
+
+    assert calls == ["uploads/a.mp3"]
+    transcripts = db.query(Transcript).all()
+    assert len(transcripts) == 2
+    assert transcripts[0].text == transcripts[1].text
+    assert list(iter_transcript_segments(db, transcripts[0].id)) == list(iter_transcript_segments(db, transcripts[1].id))
+
+
+def test_persisting_generated_content_is_idempotent(db, user):
+    episode = Episode(user_id=user.id, title="Persisted Episode", audio_url="uploads/p.mp3")
+    db.add(episode)
+    db.commit()
+    digest = make_digest()
+    results = {
+        content_type: {"status": "completed", "content": asyncio.run(generator(episode, digest))}
+        for content_type, generator in get_enabled_generators(episode).items()
+    }
+
+    persist_generated_content(db, episode, results)
+    results["blog_post"]["content"]["title"] = "Retried Title"
+    persist_generated_content(db, episode, results)
+
+    blog_posts = db.query(BlogPost).filter(BlogPost.episode_id == episode.id).all()
+    assert [(post.title, post.slug) for post in blog_posts] == [("Retried Title", "retried-title")]
+    platforms = sorted(thread.platform for thread in db.query(SocialThread).filter(SocialThread.episode_id == episode.id))
+    assert platforms == ["instagram", "linkedin", "twitter"]
+    assert db.query(Newsletter).filter(Newsletter.episode_id == episode.id).count() == 1
+    assert db.query(ShowNotes).filter(ShowNotes.episode_id == episode.id).count() == 1
+    assert db.query(SearchDocument).filter(SearchDocument.episode_id == episode.id).count() == 6
+
+    persist_generated_content(db, episode, results, variant="b")
+    assert db.query(BlogPost).filter(BlogPost.episode_id == episode.id).count() == 2
+
+
+def test_workflow_runs_independent_stages_in_parallel_and_resumes(db, user):
+    episode = Episode(user_id=user.id, title="DAG Episode", audio_url="uploads/dag.mp3")
+    db.add(episode)
+    db.commit()
+    calls = []
+    attempts = {"report": 0}
+
+    def stage(name, seconds=0.0):
+        async def run(inputs):
+            calls.append(name)
+            await asyncio.sleep(seconds)
+            return {"name": name, "inputs": sorted(inputs)}
+        return run
+
+    async def report(inputs):
+        attempts["report"] += 1
+        if attempts["report"] == 1:
+            raise RuntimeError("transient")
+        return [inputs["left"]["name"], inputs["right"]["name"]]
+
+    workflow = Workflow([
+        Stage("source", stage("source")),
+        Stage("left", stage("left", 0.2), depends_on=("source",)),
+        Stage("right", stage("right", 0.2), depends_on=("source",)),
+        Stage("report", report, depends_on=("left", "right")),
+    ])
+
+    started = time.perf_counter()
+    with pytest.raises(StageFailedError, match="report"):
+        asyncio.run(workflow.run(DatabaseCheckpointStore(db, episode.id, "test")))
+    assert time.perf_counter() - started < 0.35
+    failed = db.query(WorkflowCheckpoint).filter(WorkflowCheckpoint.stage == "report").one()
+    assert (failed.status, failed.error, failed.attempts) == ("failed", "transient", 1)
+
+    outputs = asyncio.run(workflow.run(DatabaseCheckpointStore(db, episode.id, "test")))
+    assert sorted(calls) == ["left", "right", "source"]
+    assert outputs["report"] == ["left", "right"]
+    assert outputs["left"] == {"name": "left", "inputs": ["source"]}
+
+
+def test_workflow_rejects_cycles():
+    async def noop(inputs):
+        return None
+
+    with pytest.raises(ValueError, match="cycle"):
+        Workflow([Stage("a", noop, depends_on=("b",)), Stage("b", noop, depends_on=("a",))])
+
+
+def test_failed_episode_resumes_after_transcription(db, user, monkeypatch):
+    transcriptions = []
+    original_stream_segments = transcription_service.stream_segments
+
+    def counting_stream_segments(audio_url, **kwargs):
+        transcriptions.append(audio_url)
+        return original_stream_segments(audio_url, **kwargs)
+
+    async def unavailable(episode, digest, draft=None):
+        raise RuntimeError("provider unavailable")
+
+    monkeypatch.setattr(transcription_service, "stream_segments", counting_stream_segments)
+    for name in GENERATORS:
+        monkeypatch.setattr(content_generation_service, name, unavailable)
+
+    episode = Episode(user_id=user.id, title="Flaky Episode", audio_url="uploads/flaky.mp3")
+    db.add(episode)
+    db.commit()
+    db.add(ProcessingJob(episode_id=episode.id, job_type="all", status="pending"))
+    db.commit()
+
+    with pytest.raises(StageFailedError, match="All content generators failed"):
+        asyncio.run(process_episode_content(db, episode.id))
+    job = db.query(ProcessingJob).filter(ProcessingJob.episode_id == episode.id).one()
+    assert (job.status, job.progress) == ("failed", 90)
+    stages = {row.stage: row.status for row in db.query(WorkflowCheckpoint).filter(WorkflowCheckpoint.episode_id == episode.id)}
+    assert stages == {"probe": "completed", "transcribe": "completed", "analyze": "completed", "persist": "failed"}
+
+    for name in GENERATORS:
+        monkeypatch.delattr(content_generation_service, name)
+    result = asyncio.run(process_episode_content(db, episode.id))
+
+    assert transcriptions == ["uploads/flaky.mp3"]
+    assert set(result["formats"].values()) == {"completed"}
+    assert db.query(Transcript).filter(Transcript.episode_id == episode.id).count() == 1
+    assert db.query(BlogPost).filter(BlogPost.episode_id == episode.id).count() == 1
+    assert db.query(WorkflowCheckpoint).filter(WorkflowCheckpoint.episode_id == episode.id).count() == 0
+    db.expire_all()
+    assert (job.status, job.progress, episode.status) == ("completed", 100, "completed")
+
+
+def test_celery_pipeline_runs_one_task_per_stage_on_its_queue(db, user, monkeypatch, episode_scheduler):
+    routes = {
+        name: celery_app.amqp.router.route({}, f"api.workers.tasks.{name}")["queue"].name
+        for name in ["media_stage_task", "transcribe_stage_task", "generate_stage_task", "persist_stage_task"]
+    }
+    assert routes == {
+        "media_stage_task": "media",
+        "transcribe_stage_task": "transcribe",
+        "generate_stage_task": "generate",
+        "persist_stage_task": "generate"
+    }
+
+    monkeypatch.setattr(tasks, "SessionLocal", sessionmaker(bind=db.get_bind(), autoflush=False))
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    episode = Episode(user_id=user.id, title="Queued Episode", audio_url="uploads/queued.mp3", generate_social=False)
+    db.add(episode)
+    db.commit()
+    db.add(ProcessingJob(episode_id=episode.id, job_type="all", status="pending"))
+    db.commit()
+    stages = ["generate:blog_post", "generate:newsletter", "generate:show_notes"]
+    assert episode_scheduler.submit(episode.id, user.id, "free") == [episode.id]
+
+    tasks.build_episode_pipeline(episode.id, stages).apply().get()
+
+    db.expire_all()
+    assert episode.status == "completed"
+    assert episode_scheduler.metrics()["in_flight"] == 0
+    assert db.query(BlogPost).filter(BlogPost.episode_id == episode.id).count() == 1
+    assert db.query(WorkflowCheckpoint).filter(WorkflowCheckpoint.episode_id == episode.id).count() == 0